@@ -0,0 +1,79 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Compare loading the engine's binary order files with loading the compressed binaries (bin_format=2).
+
+A synthetic day of Data.generate_synthetic_orders is written in both formats. The engine's binary is added with
+Simulation_cpp.addOrderQueueFromBin, which reads it natively. The compressed binary is decoded in Python
+(_read_bin_v2), optionally filtered to the products of --hours hours of delivery, and added with
+Simulation_cpp.addOrderQueueFromArrays. Reports the time to decode and filter the orders in Python, the time of the
+engine call, the number of queued orders and the file size per format.
+
+Usage:
+    python benchmarks/bench_bin_formats.py --orders 1000000 --hours 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from bitepy import Data
+from bitepy._bitepy import Simulation_cpp
+from bitepy.data import _filter_orders, _order_arrays, _read_bin_v2, _write_bin_v2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000, help="orders in the synthetic day (on average)")
+    parser.add_argument("--hours", type=int, default=None, help="also load the compressed binary filtered to this many delivery hours")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best is reported")
+    args = parser.parse_args()
+
+    date = pd.Timestamp("2022-01-02")
+    df = Data().generate_synthetic_orders(date, orders_per_second=args.orders / 86_400, seed=0)
+    arrays = _order_arrays(df.rename_axis("id").reset_index())
+    first_start = int(arrays[3].min())
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        v1_path, v2_path = os.path.join(tmpdir, "v1.bin"), os.path.join(tmpdir, "v2.bin")
+        Simulation_cpp().writeOrderBinFromArrays(v1_path, *arrays)
+        _write_bin_v2(v2_path, arrays)
+
+        # filters None: the engine reads the file itself
+        modes = [("engine", v1_path, None), ("compressed", v2_path, (None, None, None))]
+        if args.hours is not None:
+            end = first_start + (args.hours - 1) * 3_600_000
+            modes.append((f"compressed, {args.hours} h", v2_path, (first_start, end, None)))
+
+        print(f"{'format':<20}{'decode [s]':>12}{'call [s]':>12}{'total [s]':>12}{'orders':>12}{'size [MB]':>12}")
+        for name, path, filters in modes:
+            decode_times, call_times = [], []
+            for _ in range(args.repeat):
+                sim = Simulation_cpp()
+                t0 = time.perf_counter()
+                decoded = arrays if filters is None else _filter_orders(_read_bin_v2(path), *filters)
+                t1 = time.perf_counter()
+                if filters is None:
+                    sim.addOrderQueueFromBin(path)
+                else:
+                    sim.addOrderQueueFromArrays(*decoded)
+                decode_times.append(t1 - t0)
+                call_times.append(time.perf_counter() - t1)
+            decode_time, call_time = min(decode_times), min(call_times)
+            size = os.path.getsize(path) / 1e6
+            print(f"{name:<20}{decode_time:>12.2f}{call_time:>12.2f}{decode_time + call_time:>12.2f}{len(decoded[0]):>12}{size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
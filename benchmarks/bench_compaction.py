@@ -0,0 +1,84 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Measure the effect of the lossy order book compaction of Data.create_bins_from_csv.
+
+The processed order book files in --data are converted to exact and to compacted binaries, and the same
+simulation is run on both. Reports the dropped orders, the run time and the reward deviation of the compacted run.
+
+The example_data day only holds a few orders, so use a larger set, e.g. synthetic days written with
+Data.write_synthetic_days(..., output_format="csv"). See docs/data.md for measured deviations.
+
+Usage:
+    python benchmarks/bench_compaction.py --data synthetic_data --price-band 50
+    python benchmarks/bench_compaction.py --data synthetic_data --max-depth 1000
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from bitepy import Data, Results, Simulation
+
+
+def simulate(bin_paths, start_date, end_date):
+    """Run the simulation over the given binaries, in order, and return the total reward and the run time."""
+    sim = Simulation(start_date, end_date, start_date)
+    t0 = time.perf_counter()
+    for i, path in enumerate(bin_paths):
+        sim.add_bin_to_orderqueue(path)
+        sim.run_one_day(i == len(bin_paths) - 1)
+    elapsed = time.perf_counter() - t0
+    return Results(sim.get_logs()).get_total_reward(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="example_data", help="directory of processed orderbook_YYYY-MM-DD files")
+    parser.add_argument("--price-band", type=float, default=None, help="drop orders this far behind the best price (€/MWh)")
+    parser.add_argument("--max-depth", type=float, default=None, help="drop orders behind this much better volume (MWh)")
+    parser.add_argument("--price-tick", type=float, default=None, help="round prices to this tick (€/MWh)")
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.data, "orderbook_*.csv.zip"))
+                   + glob.glob(os.path.join(args.data, "orderbook_*.parquet")))
+    if not files:
+        raise SystemExit(f"No processed order book files found in {args.data}")
+    days = [pd.Timestamp(os.path.basename(f).split("_")[-1].split(".")[0], tz="UTC") for f in files]
+    start_date, end_date = days[0], days[-1] + pd.Timedelta(hours=23)
+
+    data = Data()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        exact_path, compact_path = os.path.join(tmpdir, "exact"), os.path.join(tmpdir, "compact")
+        data.create_bins_from_csv(files, exact_path, verbose=False, carry_over=False)
+        report = data.create_bins_from_csv(files, compact_path, verbose=False, carry_over=False,
+                                           price_band=args.price_band, max_depth=args.max_depth,
+                                           price_tick=args.price_tick)
+        exact_reward, exact_time = simulate(sorted(glob.glob(os.path.join(exact_path, "*.bin"))), start_date, end_date)
+        compact_reward, compact_time = simulate(sorted(glob.glob(os.path.join(compact_path, "*.bin"))), start_date,
+                                                end_date)
+
+    orders, dropped = report["orders"].sum(), report["dropped"].sum()
+    deviation = compact_reward - exact_reward
+    relative = deviation / abs(exact_reward) * 100 if exact_reward else float("nan")
+    print(f"orders {orders}, dropped {dropped} ({dropped / max(orders, 1) * 100:.1f}%)")
+    print(f"{'run':<10}{'reward [€]':>14}{'time [s]':>12}")
+    print(f"{'exact':<10}{exact_reward:>14.2f}{exact_time:>12.2f}")
+    print(f"{'compact':<10}{compact_reward:>14.2f}{compact_time:>12.2f}")
+    print(f"reward deviation {deviation:.2f} € ({relative:.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Measure the ingestion throughput of the Data readers.
+
+Small synthetic raw fixtures are generated locally in the EPEX 2020, EPEX 2021 and NordPool formats. For every market,
+Data.parse_market_data and Data.create_bins_from_csv are run in a fresh process over two days. Reports the raw rows
+per second, the peak RSS and the time per stage: read (raw reader without lifecycle reconstruction), lifecycle
+(Data._reconstruct_lifecycle), window (merging the days, Data._day_window), write (saving the processed files) and
+bins (create_bins_from_csv). The results are printed, or written with --output, as JSON. With --baseline, the
+results of an earlier run (e.g. of another commit) are compared against.
+
+Usage:
+    python benchmarks/bench_ingestion.py --orders 20000 --output ingestion.json
+    python benchmarks/bench_ingestion.py --baseline ingestion.json
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from bitepy import Data
+
+MARKETS = {
+    "epex2020": ("EPEX", "2020-06-01"),
+    "epex2021": ("EPEX", "2021-06-01"),
+    "nordpool": ("NordPool", "2024-01-01"),
+}
+
+COLUMNS_2021 = ["OrderId", "InitialId", "ParentId", "Side", "Product", "DeliveryStart", "DeliveryEnd", "CreationTime",
+                "TransactionTime", "ValidityTime", "ActionCode", "Price", "Currency", "Quantity", "QuantityUnit",
+                "Volume", "VolumeUnit", "DeliveryArea", "UserDefinedBlock", "LinkedBasketId", "RevisionNo",
+                "ExecutionRestriction"]
+COLUMNS_2020 = {"OrderId": "Order ID", "InitialId": "Initial ID", "ParentId": "Parent ID", "Side": "Side",
+                "Product": "Product", "DeliveryStart": "Delivery Start", "DeliveryEnd": "Delivery End",
+                "CreationTime": "Entry time", "TransactionTime": "Transaction Time", "ValidityTime": "Validity time",
+                "ActionCode": "Action code", "Price": "Price", "Currency": "Currency", "Quantity": "Quantity",
+                "DeliveryArea": "Delivery area", "Market area": "Market area", "isOTC": "isOTC",
+                "UserDefinedBlock": "Is User Defined Block", "ExecutionRestriction": "Execution restriction",
+                "RevisionNo": "RevisionNo"}
+
+
+def iso(epoch_ms, unit="ms"):
+    """Format epoch milliseconds as ISO 8601 UTC strings."""
+    return pd.Series(np.datetime_as_string(epoch_ms.astype("datetime64[ms]"), unit=unit)).add("Z")
+
+
+def synthetic_messages(date, orders, seed):
+    """
+    Build the raw order messages of a day: every order is added, changed a few times and deleted with probability
+    0.5. About 2% of the orders are icebergs, 2% user defined blocks and 5% quarter-hour products, which the readers
+    drop. Returns one row per message, sorted by transaction time (epoch milliseconds).
+    """
+    rng = np.random.default_rng(seed)
+    day_ms = pd.Timestamp(date).value // 1_000_000
+    changes = rng.geometric(0.4, orders) - 1
+    deleted = rng.random(orders) < 0.5
+    length = 1 + changes + deleted
+    first = np.cumsum(length) - length
+    order = np.repeat(np.arange(orders), length)
+    position = np.arange(length.sum()) - first[order]
+
+    created = day_ms + rng.integers(0, 86_400_000 - 3_600_000, orders)
+    steps = rng.integers(1, 60_000, len(order))
+    transaction = created[order] + np.cumsum(steps) - np.cumsum(steps)[first][order] + steps[first][order]
+    walk = rng.normal(0, 1, len(order)).cumsum()
+    price = np.round(rng.normal(50, 20, orders)[order] + walk - walk[first][order], 2)
+    action = np.where(position == 0, "A", np.where(deleted[order] & (position == length[order] - 1), "D", "C"))
+    iceberg = rng.random(orders) < 0.02
+    action[(position == 0) & iceberg[order]] = "I"
+    start = (created // 3_600_000 + rng.integers(1, 30, orders)) * 3_600_000
+    df = pd.DataFrame({
+        "order": order,
+        "side": np.where(rng.random(orders) < 0.5, "BUY", "SELL")[order],
+        "product": np.where(rng.random(orders) < 0.95, "XBID_Hour_Power", "Intraday_Quarter_Hour_Power")[order],
+        "block": (rng.random(orders) < 0.02)[order],
+        "start": start[order],
+        "transaction": transaction,
+        "validity": (transaction + rng.integers(1, 7200, len(order)) * 1000) // 1000 * 1000,
+        "action": action,
+        "price": price,
+        "quantity": np.round(rng.integers(1, 100, orders) / 10, 1)[order],
+    })
+    return df.sort_values("transaction", kind="stable", ignore_index=True)
+
+
+def write_epex(root, date, orders, seed):
+    """Write a day of raw EPEX order messages as zipped CSV, in the format of its year. Returns the number of rows."""
+    ts = pd.Timestamp(date)
+    df = synthetic_messages(ts, orders, seed)
+    order_id = int(ts.strftime("%Y%m%d")) * 10**6 + df["order"]
+    raw = pd.DataFrame({
+        "OrderId": order_id, "InitialId": order_id, "ParentId": "", "Side": df["side"], "Product": df["product"],
+        "DeliveryStart": iso(df["start"].to_numpy(), "s"), "DeliveryEnd": iso(df["start"].to_numpy() + 3_600_000, "s"),
+        "CreationTime": iso(df["transaction"].to_numpy()), "TransactionTime": iso(df["transaction"].to_numpy()),
+        "ValidityTime": iso(df["validity"].to_numpy(), "s"), "ActionCode": df["action"], "Price": df["price"],
+        "Currency": "EUR", "Quantity": df["quantity"], "QuantityUnit": "MW", "Volume": df["quantity"],
+        "VolumeUnit": "MWH", "DeliveryArea": "10YDE", "UserDefinedBlock": np.where(df["block"], "Y", "N"),
+        "LinkedBasketId": "", "RevisionNo": 1, "ExecutionRestriction": "NON",
+    }, columns=COLUMNS_2021)
+
+    folder = os.path.join(root, ts.strftime("%Y"), ts.strftime("%m"))
+    os.makedirs(folder, exist_ok=True)
+    if ts.year == 2020:
+        name = f"Continuous_Orders_DE_{ts.strftime('%Y%m%d')}_{ts.strftime('%Y%m%d')}.csv"
+        raw = raw.assign(**{"Side": raw["Side"].str.capitalize(), "Market area": "DE", "isOTC": 0,
+                            "UserDefinedBlock": df["block"].astype(int)})
+        # the 2020 files end every line with the separator, which pandas reads as an empty column "Unnamed: 20"
+        text = raw[list(COLUMNS_2020)].rename(columns=COLUMNS_2020).to_csv(index=False, sep=";", lineterminator=";\n")
+    else:
+        name = f"Continuous_Orders-DE-{ts.strftime('%Y%m%d')}-{ts.strftime('%Y%m%d')}T000000000Z.csv"
+        text = "# EPEX Spot continuous orders\n" + raw.to_csv(index=False)
+    with zipfile.ZipFile(os.path.join(folder, name + ".zip"), "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(name, text)
+    return len(df)
+
+
+def write_nordpool(root, date, orders, seed):
+    """Write a day of raw NordPool order messages as hourly Parquet files. Returns the number of rows."""
+    ts = pd.Timestamp(date)
+    df = synthetic_messages(ts, orders, seed)
+    df = df.loc[df["transaction"] < ts.value // 1_000_000 + 86_400_000].reset_index(drop=True)
+    actions = df["action"].map({"A": "UserAdded", "C": "UserModified", "D": "UserDeleted", "I": "UserAdded"})
+    # some deletions are done by the system, and some orders are hibernated instead
+    actions = actions.mask((df["action"] == "D") & (df["order"] % 3 == 1), "SystemDeleted")
+    actions = actions.mask((df["action"] == "D") & (df["order"] % 3 == 2), "UserHibernated")
+    order_id = (int(ts.strftime("%Y%m%d")) * 10**6 + df["order"]).astype(str)
+    raw = pd.DataFrame({
+        "orderId": order_id + "A", "originalOrderId": order_id, "action": actions,
+        "createdTime": iso(df["transaction"].to_numpy()), "updatedTime": iso(df["transaction"].to_numpy()),
+        "expirationTime": iso(df["validity"].to_numpy()), "deliveryStart": iso(df["start"].to_numpy()),
+        "deliveryEnd": iso(df["start"].to_numpy() + 3_600_000), "price": df["price"].to_numpy(),
+        "volume": df["quantity"].to_numpy(),
+        "contractName": np.where(df["product"] == "XBID_Hour_Power", "PH", "QH")
+                        + "-" + iso(df["start"].to_numpy(), "h"),
+        "orderType": np.where(df["action"] == "I", "Iceberg", "Limit"),
+        "side": df["side"].str.lower().to_numpy(),
+    })
+
+    folder = os.path.join(root, ts.strftime("%Y%m%d"))
+    os.makedirs(folder, exist_ok=True)
+    for hour, group in raw.groupby(df["transaction"].to_numpy() // 3_600_000 % 24):
+        group.to_parquet(os.path.join(folder, f"NordPool_{ts.strftime('%Y%m%d')}_{hour:02d}.parquet"), index=False)
+    return len(raw)
+
+
+def timed(method, timings, stage):
+    """Wrap a bound method to add its run time to timings[stage]."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timings[stage] += time.perf_counter() - t0
+    return wrapper
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_market(name, orders, seed, bin_format, days=2):
+    """Generate the fixtures of a market and run the ingestion pipeline over them (in a fresh process)."""
+    market_type, first_day = MARKETS[name]
+    dates = pd.date_range(first_day, periods=days, freq="D")
+    data = Data()
+    timings = dict.fromkeys(["read", "lifecycle", "window", "write", "bins"], 0.0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        raw_path, processed_path, bin_path = (os.path.join(tmpdir, sub, "") for sub in ("raw", "processed", "bins"))
+        writer = write_nordpool if market_type == "NordPool" else write_epex
+        rows = sum(writer(raw_path, date, orders, seed + i) for i, date in enumerate(dates))
+
+        data._read_day = timed(data._read_day, timings, "read")
+        data._reconstruct_lifecycle = timed(data._reconstruct_lifecycle, timings, "lifecycle")
+        data._day_window = timed(data._day_window, timings, "window")
+        data._save_day = timed(data._save_day, timings, "write")
+        # keep the messages of the pipeline out of the JSON on stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            t0 = time.perf_counter()
+            data.parse_market_data(str(dates[0].date()), str(dates[-1].date()), raw_path.rstrip("/"),
+                                   processed_path, market_type, verbose=False, overwrite=True)
+            parse_time = time.perf_counter() - t0
+
+            files = sorted(os.path.join(processed_path, f) for f in os.listdir(processed_path)
+                           if f.endswith(".csv.zip"))
+            t0 = time.perf_counter()
+            report = data.create_bins_from_csv(files, bin_path, verbose=False, overwrite=True, bin_format=bin_format)
+            timings["bins"] = time.perf_counter() - t0
+
+    # the lifecycle is reconstructed within the readers, and the window is merged within _save_day
+    timings["read"] -= timings["lifecycle"]
+    timings["write"] -= timings["window"]
+    return {
+        "market": market_type,
+        "days": days,
+        "raw_rows": int(rows),
+        "orders": int(report["orders"].sum()),
+        "parse_seconds": round(parse_time, 4),
+        "stage_seconds": {stage: round(seconds, 4) for stage, seconds in timings.items()},
+        "read_rows_per_second": round(rows / max(timings["read"] + timings["lifecycle"], 1e-9)),
+        "parse_rows_per_second": round(rows / max(parse_time, 1e-9)),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def environment():
+    """Versions and the git commit the benchmark is run on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import pyarrow
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "pandas": pd.__version__, "pyarrow": pyarrow_version, "machine": platform.machine()}
+
+
+def compare(results, baseline):
+    """Print the change of the stage times, throughput and peak RSS against a baseline run."""
+    print(f"\n{'market':<10}{'metric':<24}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, current in results["markets"].items():
+        previous = baseline.get("markets", {}).get(name)
+        if previous is None:
+            continue
+        metrics = [(f"{stage} [s]", previous["stage_seconds"].get(stage), seconds)
+                   for stage, seconds in current["stage_seconds"].items()]
+        metrics += [("parse [rows/s]", previous.get("parse_rows_per_second"), current["parse_rows_per_second"]),
+                    ("peak RSS [MB]", previous.get("peak_rss_mb"), current["peak_rss_mb"])]
+        for metric, before, after in metrics:
+            if before is None:
+                continue
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{name:<10}{metric:<24}{before:>12.4g}{after:>12.4g}{change:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=20_000, help="orders per day in the raw fixtures")
+    parser.add_argument("--markets", nargs="+", choices=list(MARKETS), default=list(MARKETS), help="markets to run")
+    parser.add_argument("--bin-format", type=int, choices=[1, 2], default=1, help="format of the binary files")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the raw fixtures")
+    parser.add_argument("--output", default=None, help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "orders_per_day": args.orders, "markets": {}}
+    context = multiprocessing.get_context("spawn")
+    for name in args.markets:
+        # every market runs in its own process, so the peak RSS is its own
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results["markets"][name] = pool.submit(run_market, name, args.orders, args.seed, args.bin_format).result()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Compare queueing orders from Python lists of timestamp strings with queueing them from NumPy arrays.
+
+A synthetic day of Data.generate_synthetic_orders is queued in a fresh engine, once as the lists of formatted strings
+that Simulation.add_df_to_orderqueue passed to Simulation_cpp.addOrderQueueFromPandas before, and once as the arrays
+of Simulation_cpp.addOrderQueueFromArrays. Reports the time to prepare the arguments in Python and the time of the
+engine call per path. Both paths end in the same engine entry point, which parses the timestamps as strings, so the
+difference is the Python-side formatting and the conversion of the lists, not the engine's parse.
+
+Usage:
+    python benchmarks/bench_order_arrays.py --orders 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bitepy import Data
+from bitepy._bitepy import Simulation_cpp
+from bitepy.data import _order_arrays
+
+
+def order_lists(df):
+    """The arguments of addOrderQueueFromPandas, formatted as by add_df_to_orderqueue before the array bindings."""
+    df = df.copy()
+    for col in ["start", "transaction", "validity"]:
+        df[col] = df[col].dt.tz_convert("UTC").dt.tz_localize(None)
+    df["start"] = df["start"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    df["transaction"] = df["transaction"].dt.strftime("%Y-%m-%dT%H:%M:%S.%f").str[:-3] + "Z"
+    df["validity"] = (df["validity"].dt.strftime("%Y-%m-%dT%H:%M:%S.%f").str[:-3] + "Z").fillna("<NA>")
+    return (
+        df["id"].to_numpy(dtype=np.int64).tolist(),
+        df["initial"].to_numpy(dtype=np.int64).tolist(),
+        df["side"].astype(str).tolist(),
+        df["start"].astype(str).tolist(),
+        df["transaction"].astype(str).tolist(),
+        df["validity"].astype(str).tolist(),
+        df["price"].to_numpy(dtype=np.float64).tolist(),
+        df["quantity"].to_numpy(dtype=np.float64).tolist(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000, help="orders in the synthetic day (on average)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best is reported")
+    args = parser.parse_args()
+
+    date = pd.Timestamp("2022-01-02")
+    df = Data().generate_synthetic_orders(date, orders_per_second=args.orders / 86_400, seed=0)
+    df = df.rename_axis("id").reset_index()
+    for col in ["start", "transaction", "validity"]:
+        df[col] = pd.to_datetime(df[col], unit="ms", utc=True)
+
+    paths = [("lists", order_lists, "addOrderQueueFromPandas"), ("arrays", _order_arrays, "addOrderQueueFromArrays")]
+    print(f"{len(df)} orders")
+    print(f"{'path':<10}{'prepare [s]':>14}{'call [s]':>12}{'total [s]':>12}")
+    for name, prepare, method in paths:
+        prepare_times, call_times = [], []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            arguments = prepare(df)
+            t1 = time.perf_counter()
+            getattr(Simulation_cpp(), method)(*arguments)
+            prepare_times.append(t1 - t0)
+            call_times.append(time.perf_counter() - t1)
+        prepare_time, call_time = min(prepare_times), min(call_times)
+        print(f"{name:<10}{prepare_time:>14.2f}{call_time:>12.2f}{prepare_time + call_time:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Compare the zipped CSV and Parquet processed order book formats.
+
+A synthetic day of Data.generate_synthetic_orders is written with Data._save_day in both formats, and loaded again
+with the loaders used by Data.create_bins_from_csv. Reports write time, load time and file size per format.
+
+Usage:
+    python benchmarks/bench_processed_formats.py --orders 2000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from bitepy import Data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000, help="orders in the synthetic day (on average)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best is reported")
+    args = parser.parse_args()
+
+    data = Data()
+    date = pd.Timestamp("2022-01-02")
+    df = data.generate_synthetic_orders(date, orders_per_second=args.orders / 86_400, seed=0)
+
+    print(f"{'format':<10}{'write [s]':>12}{'load [s]':>12}{'size [MB]':>12}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        savepath = os.path.join(tmpdir, "")
+        for output_format in ["csv", "parquet"]:
+            write_times, load_times = [], []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                path = data._save_day(df, pd.DataFrame(), date.date(), savepath, output_format)
+                write_times.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                data._load_orderbook(path)
+                load_times.append(time.perf_counter() - t0)
+            size = os.path.getsize(path) / 1e6
+            print(f"{output_format:<10}{min(write_times):>12.2f}{min(load_times):>12.2f}{size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,17 @@
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>          // for automatic conversion of STL containers
-// #include <pybind11/numpy.h>        // if you need NumPy arrays
+#include <pybind11/numpy.h>        // for NumPy array arguments via the buffer protocol
 #include <pybind11/chrono.h>       // if you need chrono conversions
 
+#include <algorithm>
+#include <chrono>
+#include <iterator>
+#include <limits>
+#include <stdexcept>
+#include <tuple>
+#include <type_traits>
+
 #include "Simulation.h"
 
 namespace py = pybind11;
@@ -20,6 +28,194 @@ namespace py = pybind11;
 using simParams = SimulationParameters;
 using sim = Simulation;
 
+// Contiguous NumPy arrays; arrays of the matching dtype are accessed in place, without a copy.
+using I64Array = py::array_t<int64_t, py::array::c_style>;
+using I8Array = py::array_t<int8_t, py::array::c_style>;
+using F64Array = py::array_t<double, py::array::c_style>;
+
+namespace {
+
+// Decayed parameter types of a Simulation member function, so that the array bindings fill exactly the containers
+// expected by the engine's list-based entry points.
+template <typename T> struct MemberArgs;
+template <typename C, typename R, typename... A> struct MemberArgs<R (C::*)(A...)> {
+    using type = std::tuple<std::decay_t<A>...>;
+};
+template <auto Method, std::size_t I>
+using ArgT = std::tuple_element_t<I, typename MemberArgs<decltype(Method)>::type>;
+
+// Side codes of the array bindings
+constexpr int8_t SIDE_BUY = 0;
+constexpr int8_t SIDE_SELL = 1;
+
+void checkLength(const py::array& arr, py::ssize_t n, const char* name) {
+    if (arr.ndim() != 1 || arr.shape(0) != n) {
+        throw std::invalid_argument(std::string(name) + " must be a 1D array with one entry per order");
+    }
+}
+
+// Format UTC milliseconds since epoch as in the processed CSV files, "YYYY-MM-DDTHH:MM:SS.mmmZ" (withMillis) or
+// "YYYY-MM-DDTHH:MM:SSZ". The int64 min/max sentinels (no expiry) become "<NA>", as read from empty CSV fields.
+std::string formatEpochMs(int64_t ms, bool withMillis) {
+    if (ms == std::numeric_limits<int64_t>::max() || ms == std::numeric_limits<int64_t>::min()) {
+        return "<NA>";
+    }
+    constexpr int64_t msPerDay = 86400000;
+    int64_t days = ms / msPerDay;
+    int64_t msOfDay = ms % msPerDay;
+    if (msOfDay < 0) {
+        msOfDay += msPerDay;
+        days -= 1;
+    }
+    // civil_from_days, see http://howardhinnant.github.io/date_algorithms.html
+    days += 719468;
+    const int64_t era = (days >= 0 ? days : days - 146096) / 146097;
+    const int64_t doe = days - era * 146097;
+    const int64_t yoe = (doe - doe / 1460 + doe / 36524 - doe / 146096) / 365;
+    const int64_t doy = doe - (365 * yoe + yoe / 4 - yoe / 100);
+    const int64_t mp = (5 * doy + 2) / 153;
+    const int64_t day = doy - (153 * mp + 2) / 5 + 1;
+    const int64_t month = mp < 10 ? mp + 3 : mp - 9;
+    const int64_t year = yoe + era * 400 + (month <= 2);
+
+    char buf[25] = "0000-00-00T00:00:00.000Z";
+    auto put = [&buf](int pos, int64_t value, int digits) {
+        for (int i = digits - 1; i >= 0; --i, value /= 10) buf[pos + i] = static_cast<char>('0' + value % 10);
+    };
+    put(0, year, 4);
+    put(5, month, 2);
+    put(8, day, 2);
+    put(11, msOfDay / 3600000, 2);
+    put(14, msOfDay / 60000 % 60, 2);
+    put(17, msOfDay / 1000 % 60, 2);
+    if (!withMillis) {
+        buf[19] = 'Z';
+        return std::string(buf, 20);
+    }
+    put(20, msOfDay % 1000, 3);
+    return std::string(buf, 24);
+}
+
+template <typename Vec, typename T>
+Vec toVector(const py::array_t<T, py::array::c_style>& arr) {
+    const T* data = arr.data();
+    return Vec(data, data + arr.shape(0));
+}
+
+// Timestamp strings for the engine's list-based entry points, which parse them again; there is no entry point that
+// takes epoch milliseconds.
+template <typename Vec>
+Vec toTimestamps(const I64Array& arr, bool withMillis) {
+    const int64_t* data = arr.data();
+    Vec out;
+    out.reserve(arr.shape(0));
+    for (py::ssize_t i = 0; i < arr.shape(0); ++i) out.emplace_back(formatEpochMs(data[i], withMillis));
+    return out;
+}
+
+template <typename Vec>
+Vec toSides(const I8Array& arr, const char* buy, const char* sell) {
+    const int8_t* data = arr.data();
+    Vec out;
+    out.reserve(arr.shape(0));
+    for (py::ssize_t i = 0; i < arr.shape(0); ++i) {
+        if (data[i] != SIDE_BUY && data[i] != SIDE_SELL) throw std::invalid_argument("sides must be 0 (buy) or 1 (sell)");
+        out.emplace_back(data[i] == SIDE_BUY ? buy : sell);
+    }
+    return out;
+}
+
+// Convert the order arrays into the arguments of the list-based order entry point Method (whose first argument is
+// the ids, at position Offset) and call it.
+template <auto Method, std::size_t Offset, typename... Prefix>
+void callWithOrderArrays(sim& self, const I64Array& ids, const I64Array& initials, const I8Array& sides,
+                         const I64Array& starts, const I64Array& transactions, const I64Array& validities,
+                         const F64Array& prices, const F64Array& quantities, Prefix&&... prefix) {
+    const py::ssize_t n = ids.ndim() == 1 ? ids.shape(0) : -1;
+    checkLength(ids, n, "ids");
+    checkLength(initials, n, "initials");
+    checkLength(sides, n, "sides");
+    checkLength(starts, n, "starts");
+    checkLength(transactions, n, "transactions");
+    checkLength(validities, n, "validities");
+    checkLength(prices, n, "prices");
+    checkLength(quantities, n, "quantities");
+
+    auto idVec = toVector<ArgT<Method, Offset>>(ids);
+    auto initialVec = toVector<ArgT<Method, Offset + 1>>(initials);
+    auto sideVec = toSides<ArgT<Method, Offset + 2>>(sides, "BUY", "SELL");
+    auto startVec = toTimestamps<ArgT<Method, Offset + 3>>(starts, false);
+    auto transactionVec = toTimestamps<ArgT<Method, Offset + 4>>(transactions, true);
+    auto validityVec = toTimestamps<ArgT<Method, Offset + 5>>(validities, true);
+    auto priceVec = toVector<ArgT<Method, Offset + 6>>(prices);
+    auto quantityVec = toVector<ArgT<Method, Offset + 7>>(quantities);
+    (self.*Method)(prefix..., idVec, initialVec, sideVec, startVec, transactionVec, validityVec, priceVec, quantityVec);
+}
+
+// Convert a timestamp of the engine's log records to milliseconds since epoch (UTC). The records hold epoch
+// milliseconds, time points are converted as well.
+template <typename T>
+int64_t toEpochMs(const T& t) {
+    if constexpr (std::is_arithmetic_v<T>) {
+        return static_cast<int64_t>(t);
+    } else {
+        return std::chrono::duration_cast<std::chrono::milliseconds>(t.time_since_epoch()).count();
+    }
+}
+
+// Fill a NumPy array with one field of the log records from index first on, for the columnar log bindings.
+template <typename T, typename Records, typename Field>
+py::array_t<T> logColumn(const Records& records, std::size_t first, Field field) {
+    first = std::min(first, static_cast<std::size_t>(records.size()));
+    py::array_t<T> out(static_cast<py::ssize_t>(records.size() - first));
+    auto view = out.template mutable_unchecked<1>();
+    py::ssize_t i = 0;
+    for (auto it = std::next(records.begin(), first); it != records.end(); ++it) view(i++) = static_cast<T>(field(*it));
+    return out;
+}
+
+template <typename Record>
+int8_t sideCode(const Record& record) {
+    return record.type == LimitOrder::Type::Buy ? SIDE_BUY : SIDE_SELL;
+}
+
+// Erase the first count records of a log of the engine.
+template <typename Records>
+void eraseFront(const Records& records, std::size_t count) {
+    // records refers to the engine's own log (see clearLogsBefore)
+    auto& log = const_cast<Records&>(records);
+    log.erase(log.begin(), std::next(log.begin(), std::min(count, static_cast<std::size_t>(log.size()))));
+}
+
+// Drop the log records before offsets (one per table, in the order of getLogsColumnar) from the engine. The engine
+// has no entry point for this, so the records are erased through its log getters, which must return references to
+// its logs; the engine only appends to them. Returns false, and drops nothing, if a getter returns a copy.
+template <typename Sim>
+bool clearLogsBefore(Sim& self, const std::vector<std::size_t>& offsets) {
+    if (offsets.size() != 7) throw std::invalid_argument("offsets must have one entry per log table");
+    constexpr bool references = std::is_lvalue_reference_v<decltype(self.getDecisionData())>
+        && std::is_lvalue_reference_v<decltype(self.getPriceData())>
+        && std::is_lvalue_reference_v<decltype(self.getAccOrders())>
+        && std::is_lvalue_reference_v<decltype(self.getExOrders())>
+        && std::is_lvalue_reference_v<decltype(self.getForeOrders())>
+        && std::is_lvalue_reference_v<decltype(self.getRemOrders())>
+        && std::is_lvalue_reference_v<decltype(self.getBalOrders())>;
+    if constexpr (!references) {
+        return false;
+    } else {
+        eraseFront(self.getDecisionData(), offsets[0]);
+        eraseFront(self.getPriceData(), offsets[1]);
+        eraseFront(self.getAccOrders(), offsets[2]);
+        eraseFront(self.getExOrders(), offsets[3]);
+        eraseFront(self.getForeOrders(), offsets[4]);
+        eraseFront(self.getRemOrders(), offsets[5]);
+        eraseFront(self.getBalOrders(), offsets[6]);
+        return true;
+    }
+}
+
+} // namespace
+
 PYBIND11_MODULE(_bitepy, m) {
     m.doc() = "pybind11 wrapper for the Simulation C++ code";
     // Params class
@@ -184,6 +380,30 @@ PYBIND11_MODULE(_bitepy, m) {
         .def("writeOrderBinFromPandas", &sim::writeOrderBinFromPandas)
         .def("writeOrderBinFromCSV", &sim::writeOrderBinFromCSV)
 
+        // Array variants of the order entry points: timestamps as int64 UTC ms since epoch (int64 max for no
+        // expiry), sides as int8 (0 = buy, 1 = sell), prices and quantities as float64. The engine's entry points
+        // still take ISO 8601 strings, so the timestamps are formatted here and parsed again by the engine; the
+        // arrays save the per-value Python formatting and the conversion of Python lists, not the engine's parse
+        // (see benchmarks/bench_order_arrays.py)
+        .def("addOrderQueueFromArrays", [](sim &self, const I64Array& ids, const I64Array& initials, const I8Array& sides,
+                const I64Array& starts, const I64Array& transactions, const I64Array& validities,
+                const F64Array& prices, const F64Array& quantities) {
+            callWithOrderArrays<&sim::addOrderQueueFromPandas, 0>(
+                self, ids, initials, sides, starts, transactions, validities, prices, quantities);
+        }, py::arg("ids"), py::arg("initials"), py::arg("sides"), py::arg("starts"), py::arg("transactions"),
+        py::arg("validities"), py::arg("prices"), py::arg("quantities"),
+        "Add orders to the order queue from NumPy arrays.")
+
+        .def("writeOrderBinFromArrays", [](sim &self, const std::string& path, const I64Array& ids, const I64Array& initials,
+                const I8Array& sides, const I64Array& starts, const I64Array& transactions, const I64Array& validities,
+                const F64Array& prices, const F64Array& quantities) {
+            ArgT<&sim::writeOrderBinFromPandas, 0> binPath = path;
+            callWithOrderArrays<&sim::writeOrderBinFromPandas, 1>(
+                self, ids, initials, sides, starts, transactions, validities, prices, quantities, binPath);
+        }, py::arg("path"), py::arg("ids"), py::arg("initials"), py::arg("sides"), py::arg("starts"),
+        py::arg("transactions"), py::arg("validities"), py::arg("prices"), py::arg("quantities"),
+        "Write orders given as NumPy arrays to an order binary file.")
+
         // Limit order submission functionality
         .def("submitLimitOrdersAndGetMatches", [](Simulation &self, 
                 const std::vector<std::string>& transaction_times,
@@ -195,6 +415,26 @@ PYBIND11_MODULE(_bitepy, m) {
             // Return empty list since this method no longer returns matches directly
             return py::list();
         }, py::arg("transaction_times"), py::arg("prices"), py::arg("volumes"), py::arg("sides"), py::arg("delivery_times"))
+
+        .def("submitLimitOrdersFromArrays", [](Simulation &self,
+                const I64Array& transaction_times,
+                const F64Array& prices,
+                const F64Array& volumes,
+                const I8Array& sides,
+                const I64Array& delivery_times) {
+            const py::ssize_t n = transaction_times.ndim() == 1 ? transaction_times.shape(0) : -1;
+            checkLength(transaction_times, n, "transaction_times");
+            checkLength(prices, n, "prices");
+            checkLength(volumes, n, "volumes");
+            checkLength(sides, n, "sides");
+            checkLength(delivery_times, n, "delivery_times");
+            self.submitLimitOrdersAndGetMatches(toTimestamps<std::vector<std::string>>(transaction_times, true),
+                                                toVector<std::vector<double>>(prices),
+                                                toVector<std::vector<double>>(volumes),
+                                                toSides<std::vector<std::string>>(sides, "Buy", "Sell"),
+                                                toTimestamps<std::vector<std::string>>(delivery_times, false));
+        }, py::arg("transaction_times"), py::arg("prices"), py::arg("volumes"), py::arg("sides"), py::arg("delivery_times"),
+        "Queue own limit orders given as NumPy arrays (times as int64 UTC ms since epoch, sides as int8, 0 = buy, 1 = sell).")
         
         .def("getLimitOrderMatches", [](Simulation &self) {
             auto matches = self.getLimitOrderMatches();
@@ -272,6 +512,74 @@ PYBIND11_MODULE(_bitepy, m) {
         }, py::arg("max_action"),
         "Get the current state of all limit order books with all order attributes")
 
+        .def("getLimitOrderBookStateArrays", [](Simulation &self, double maxAction) {
+            // The state of getLimitOrderBookState as flat NumPy arrays, one entry per order: the sell and then the
+            // buy orders of every product, in queue order. "products" holds the delivery times (ms since epoch) and
+            // "product" the index of the product of every order in it. Times are int64 milliseconds since epoch
+            // (cancels of orders without expiry are int64 max), sides int8 codes (0 = buy, 1 = sell), and
+            // "cumulative_volume" the volume of the side of the product up to and including the order.
+            auto lobState = self.getLimitOrderBookState(maxAction);
+            py::ssize_t n = 0;
+            for (const auto& deliveryPair : lobState) n += deliveryPair.second.sell.ids.size() + deliveryPair.second.buy.ids.size();
+
+            py::array_t<int64_t> products(static_cast<py::ssize_t>(lobState.size()));
+            py::array_t<int64_t> product(n), ids(n), initialIds(n), starts(n), cancels(n);
+            py::array_t<int8_t> sides(n);
+            py::array_t<double> prices(n), volumes(n), cumulativeVolumes(n);
+            py::array_t<bool> forecasts(n);
+            int64_t* productsOut = products.mutable_data();
+            int64_t* productOut = product.mutable_data();
+            int64_t* idsOut = ids.mutable_data();
+            int64_t* initialIdsOut = initialIds.mutable_data();
+            int64_t* startsOut = starts.mutable_data();
+            int64_t* cancelsOut = cancels.mutable_data();
+            int8_t* sidesOut = sides.mutable_data();
+            double* pricesOut = prices.mutable_data();
+            double* volumesOut = volumes.mutable_data();
+            double* cumulativeOut = cumulativeVolumes.mutable_data();
+            bool* forecastsOut = forecasts.mutable_data();
+
+            py::ssize_t row = 0;
+            int64_t index = 0;
+            auto fill = [&](const auto& orders, int8_t side) {
+                double cumulative = 0.0;
+                for (std::size_t i = 0; i < orders.ids.size(); ++i, ++row) {
+                    cumulative += orders.volumes[i];
+                    productOut[row] = index;
+                    sidesOut[row] = side;
+                    idsOut[row] = static_cast<int64_t>(orders.ids[i]);
+                    initialIdsOut[row] = static_cast<int64_t>(orders.initialIds[i]);
+                    startsOut[row] = toEpochMs(orders.starts[i]);
+                    cancelsOut[row] = toEpochMs(orders.cancels[i]);
+                    pricesOut[row] = orders.prices[i];
+                    volumesOut[row] = orders.volumes[i];
+                    cumulativeOut[row] = cumulative;
+                    forecastsOut[row] = static_cast<bool>(orders.forecasts[i]);
+                }
+            };
+            for (const auto& deliveryPair : lobState) {
+                productsOut[index] = static_cast<int64_t>(deliveryPair.first);
+                fill(deliveryPair.second.sell, SIDE_SELL);
+                fill(deliveryPair.second.buy, SIDE_BUY);
+                ++index;
+            }
+
+            py::dict result;
+            result["products"] = products;
+            result["product"] = product;
+            result["side"] = sides;
+            result["order_id"] = ids;
+            result["initial_id"] = initialIds;
+            result["start"] = starts;
+            result["cancel"] = cancels;
+            result["price"] = prices;
+            result["volume"] = volumes;
+            result["is_forecast"] = forecasts;
+            result["cumulative_volume"] = cumulativeVolumes;
+            return result;
+        }, py::arg("max_action"),
+        "Get the current state of all limit order books as flat NumPy arrays, with cumulative volumes per product and side")
+
 
         .def("getLogs", [](sim &self) {
             // C++ -> Python
@@ -400,6 +708,97 @@ PYBIND11_MODULE(_bitepy, m) {
             return py::make_tuple(decisionRec, priceRec, accOrderList, execOrderList, foreOrderList, removedOrdersList, balOrderList);
         })
 
+        .def("getLogsColumnar", [](sim &self, const std::vector<std::size_t>& offsets) {
+            // C++ -> Python, one NumPy array per field: timestamps as int64 milliseconds since epoch (UTC) and
+            // order types as int8 side codes, in the units of getLogs. With offsets (one per table, in the order
+            // of the returned tables), only the records from these offsets on are returned.
+            if (!offsets.empty() && offsets.size() != 7) throw std::invalid_argument("offsets must have one entry per log table");
+            auto from = [&offsets](std::size_t table) { return offsets.empty() ? std::size_t{0} : offsets[table]; };
+            const auto& decisions = self.getDecisionData();
+            py::dict decisionRec;
+            decisionRec["hour"] = logColumn<int64_t>(decisions, from(0), [](const auto& r) { return toEpochMs(r.hour); });
+            decisionRec["storage"] = logColumn<double>(decisions, from(0), [](const auto& r) { return r.storage; });
+            decisionRec["position"] = logColumn<double>(decisions, from(0), [](const auto& r) { return r.position; });
+            decisionRec["full_reward"] = logColumn<double>(decisions, from(0), [](const auto& r) { return r.fullReward; });
+            decisionRec["id_reward_no_deg"] = logColumn<double>(decisions, from(0), [](const auto& r) { return r.idRewardNoDeg; });
+            decisionRec["cycles"] = logColumn<double>(decisions, from(0), [](const auto& r) { return r.cycles; });
+
+            const auto& prices = self.getPriceData();
+            py::dict priceRec;
+            priceRec["hour"] = logColumn<int64_t>(prices, from(1), [](const auto& r) { return toEpochMs(r.hour); });
+            priceRec["low"] = logColumn<double>(prices, from(1), [](const auto& r) { return r.low; });
+            priceRec["high"] = logColumn<double>(prices, from(1), [](const auto& r) { return r.high; });
+            priceRec["last"] = logColumn<double>(prices, from(1), [](const auto& r) { return r.last; });
+            priceRec["wavg"] = logColumn<double>(prices, from(1), [](const auto& r) { return r.wavg; });
+            priceRec["id3"] = logColumn<double>(prices, from(1), [](const auto& r) { return r.id3; });
+            priceRec["id1"] = logColumn<double>(prices, from(1), [](const auto& r) { return r.id1; });
+            priceRec["volume"] = logColumn<double>(prices, from(1), [](const auto& r) { return r.volume; });
+
+            const auto& accepted = self.getAccOrders();
+            py::dict accOrders;
+            accOrders["dp_run"] = logColumn<int64_t>(accepted, from(2), [](const auto& r) { return r._dpRun; });
+            accOrders["time"] = logColumn<int64_t>(accepted, from(2), [](const auto& r) { return toEpochMs(r.time); });
+            accOrders["id"] = logColumn<int64_t>(accepted, from(2), [](const auto& r) { return r.id; });
+            accOrders["initial_id"] = logColumn<int64_t>(accepted, from(2), [](const auto& r) { return r.initialId; });
+            accOrders["start"] = logColumn<int64_t>(accepted, from(2), [](const auto& r) { return toEpochMs(r.start); });
+            accOrders["cancel"] = logColumn<int64_t>(accepted, from(2), [](const auto& r) { return toEpochMs(r.cancel); });
+            accOrders["delivery"] = logColumn<int64_t>(accepted, from(2), [](const auto& r) { return toEpochMs(r.delivery); });
+            accOrders["type"] = logColumn<int8_t>(accepted, from(2), [](const auto& r) { return sideCode(r); });
+            accOrders["price"] = logColumn<double>(accepted, from(2), [](const auto& r) { return r.price / 100.0; });
+            accOrders["volume"] = logColumn<double>(accepted, from(2), [](const auto& r) { return r.volume / 10.0; });
+            accOrders["partial"] = logColumn<bool>(accepted, from(2), [](const auto& r) { return r.partial; });
+            accOrders["partial_volume"] = logColumn<double>(accepted, from(2), [](const auto& r) { return r.partialVolume / 10.0; });
+
+            // executed and killed (removed) market orders share their fields
+            auto marketOrders = [](const auto& records, std::size_t first) {
+                py::dict out;
+                out["dp_run"] = logColumn<int64_t>(records, first, [](const auto& r) { return r.dpRun; });
+                out["time"] = logColumn<int64_t>(records, first, [](const auto& r) { return toEpochMs(r.time); });
+                out["last_solve_time"] = logColumn<int64_t>(records, first, [](const auto& r) { return toEpochMs(r.lastSolveTime); });
+                out["hour"] = logColumn<int64_t>(records, first, [](const auto& r) { return toEpochMs(r.hour); });
+                out["reward"] = logColumn<double>(records, first, [](const auto& r) { return r.reward / 1000.0; });
+                out["reward_incl_deg_costs"] = logColumn<double>(records, first, [](const auto& r) { return r.rewardInclDegCosts / 1000.0; });
+                out["volume"] = logColumn<double>(records, first, [](const auto& r) { return r.volume / 10.0; });
+                out["type"] = logColumn<int8_t>(records, first, [](const auto& r) { return sideCode(r); });
+                out["final_pos"] = logColumn<double>(records, first, [](const auto& r) { return r.finalPos / 10.0; });
+                out["final_stor"] = logColumn<double>(records, first, [](const auto& r) { return r.finalStor / 10.0; });
+                return out;
+            };
+
+            const auto& forecast = self.getForeOrders();
+            py::dict foreOrders;
+            foreOrders["dp_run"] = logColumn<int64_t>(forecast, from(4), [](const auto& r) { return r.dpRun; });
+            foreOrders["time"] = logColumn<int64_t>(forecast, from(4), [](const auto& r) { return toEpochMs(r.time); });
+            foreOrders["last_solve_time"] = logColumn<int64_t>(forecast, from(4), [](const auto& r) { return toEpochMs(r.lastSolveTime); });
+            foreOrders["hour"] = logColumn<int64_t>(forecast, from(4), [](const auto& r) { return toEpochMs(r.hour); });
+            foreOrders["cancel"] = logColumn<int64_t>(forecast, from(4), [](const auto& r) { return toEpochMs(r.cancel); });
+            foreOrders["type"] = logColumn<int8_t>(forecast, from(4), [](const auto& r) { return sideCode(r); });
+            foreOrders["price"] = logColumn<double>(forecast, from(4), [](const auto& r) { return r.price / 100.0; });
+            foreOrders["volume"] = logColumn<double>(forecast, from(4), [](const auto& r) { return r.volume / 10.0; });
+
+            const auto& balancing = self.getBalOrders();
+            py::dict balOrders;
+            balOrders["dp_run"] = logColumn<int64_t>(balancing, from(6), [](const auto& r) { return r.dpRun; });
+            balOrders["time"] = logColumn<int64_t>(balancing, from(6), [](const auto& r) { return toEpochMs(r.time); });
+            balOrders["hour"] = logColumn<int64_t>(balancing, from(6), [](const auto& r) { return toEpochMs(r.hour); });
+            balOrders["volume"] = logColumn<double>(balancing, from(6), [](const auto& r) { return r.volume / 10.0; });
+
+            return py::make_tuple(decisionRec, priceRec, accOrders, marketOrders(self.getExOrders(), from(3)), foreOrders,
+                                  marketOrders(self.getRemOrders(), from(5)), balOrders);
+        }, py::arg("offsets") = std::vector<std::size_t>{})
+
+        .def("clearLogsBefore", [](sim &self, const std::vector<std::size_t>& offsets) {
+            return clearLogsBefore(self, offsets);
+        }, py::arg("offsets"),
+        "Drop the log records before offsets (one per table, in the order of getLogsColumnar) from the engine. Returns False if the engine's logs cannot be drained.")
+
+        .def("getLogSizes", [](sim &self) {
+            return std::vector<std::size_t>{self.getDecisionData().size(), self.getPriceData().size(),
+                                            self.getAccOrders().size(), self.getExOrders().size(),
+                                            self.getForeOrders().size(), self.getRemOrders().size(),
+                                            self.getBalOrders().size()};
+        }, "Number of records of every log table held by the engine, in the order of getLogsColumnar.")
+
         .def("getTransactions", [](Simulation &self) {
             // Get transaction records and return them to Python
             py::list transactionList;
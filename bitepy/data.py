@@ -12,9 +12,14 @@ import pandas as pd
 import numpy as np
 from zipfile import ZipFile
 import os
+import json
+import hashlib
+import heapq
 from tqdm import tqdm
 from pathlib import Path
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 try:
     from ._bitepy import Simulation_cpp
@@ -24,6 +29,790 @@ except ImportError as e:
     ) from e
 
 
+def _import_pyarrow():
+    """Import pyarrow, which is only required for the Parquet order book format and NordPool data."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "This feature requires pyarrow. Install it with 'pip install pyarrow' or 'pip install bitepy[arrow]'."
+        ) from e
+    return pa, pq
+
+
+# validity of orders without expiry in the int64 millisecond arrays passed to the C++ extension
+_NO_EXPIRY_MS = np.iinfo(np.int64).max
+
+# hourly products and order actions kept from the raw EPEX order files
+_EPEX_PRODUCTS = ["Intraday_Hour_Power", "XBID_Hour_Power"]
+_EPEX_ACTIONS = ["A", "D", "C", "I"]
+
+# NordPool order actions kept, and their standardized codes
+_NORDPOOL_ACTIONS = {
+    'UserAdded': 'A',
+    'UserModified': 'C',
+    'UserDeleted': 'D',
+    'SystemDeleted': 'D',
+    'UserHibernated': 'H',
+}
+
+
+def _epoch_ms(timestamps, missing=_NO_EXPIRY_MS):
+    """
+    Convert a column of timestamps to an int64 array of UTC milliseconds since epoch, as expected by the array
+    bindings of the C++ extension. Accepts integer milliseconds, datetimes (tz-aware ones are converted to UTC)
+    and timestamp strings in the CSV format. Missing values are set to missing.
+    """
+    if pd.api.types.is_integer_dtype(timestamps):
+        return timestamps.to_numpy(dtype=np.int64, na_value=missing)
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+    if pd.api.types.is_datetime64_dtype(timestamps):
+        dates = timestamps.to_numpy(dtype="datetime64[ms]")
+    else:
+        strings = timestamps.fillna("NaT").to_numpy(dtype=str)
+        dates = np.char.rstrip(strings, "Z").astype("datetime64[ms]")
+    ms = dates.view(np.int64).copy()
+    ms[np.isnat(dates)] = missing
+    return ms
+
+
+def _encode_order_ids(ids):
+    """
+    Encode order IDs (integers or strings, e.g. the alphanumeric NordPool IDs) as int64.
+
+    IDs of at most 18 digits without leading zeros keep their numeric value. All other IDs are mapped to 2**62 plus a
+    62 bit hash of their string. The encoding only depends on the ID itself, so the same ID gets the same int64
+    on every day and in every worker process, and order chains spanning midnight stay linked.
+    """
+    ids = pd.Series(ids)
+    if pd.api.types.is_integer_dtype(ids):
+        return ids.to_numpy(dtype=np.int64)
+    codes, uniques = pd.factorize(ids, use_na_sentinel=False)
+    uniques = np.asarray(pd.Index(uniques).astype(str), dtype=str)
+    lengths = np.char.str_len(uniques)
+    numeric = np.char.isdigit(uniques) & (lengths <= 18) & ((lengths == 1) | ~np.char.startswith(uniques, "0"))
+    encoded = np.empty(len(uniques), dtype=np.int64)
+    encoded[numeric] = uniques[numeric].astype(np.int64)
+    hashes = pd.util.hash_array(uniques[~numeric].astype(object), categorize=False)
+    encoded[~numeric] = ((hashes & np.uint64(2**62 - 1)) | np.uint64(2**62)).astype(np.int64)
+    return encoded[codes]
+
+
+def _side_codes(sides):
+    """
+    Encode a column of order sides ('BUY'/'SELL', case-insensitive) as int8 codes for the C++ extension,
+    0 for buy and 1 for sell.
+    """
+    sides = pd.Categorical(sides)
+    names = pd.Index(sides.categories).astype(str).str.upper()
+    if (sides.codes < 0).any() or not names.isin(["BUY", "SELL"]).all():
+        invalid = sorted(set(sides.categories[~names.isin(["BUY", "SELL"])].astype(str)))
+        raise ValueError(f"Error: Invalid side values {invalid}, must be 'BUY' or 'SELL'.")
+    return np.where(names == "BUY", 0, 1).astype(np.int8)[sides.codes]
+
+
+def _order_arrays(df):
+    """
+    Convert a frame of orders with the processed order book columns to the contiguous arrays expected by
+    Simulation_cpp.addOrderQueueFromArrays and writeOrderBinFromArrays.
+    """
+    return (
+        df["id"].to_numpy(dtype=np.int64),
+        df["initial"].to_numpy(dtype=np.int64),
+        _side_codes(df["side"]),
+        _epoch_ms(df["start"]),
+        _epoch_ms(df["transaction"]),
+        _epoch_ms(df["validity"]),
+        df["price"].to_numpy(dtype=np.float64),
+        df["quantity"].to_numpy(dtype=np.float64),
+    )
+
+
+# header of the compressed binary order files (format version 2), followed by blocks of orders
+_BIN_V2_MAGIC = b"BITEPYB2"
+_BIN_V2_HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("codec", "S8"), ("count", "<u8"), ("blocks", "<u8")])
+_BIN_V2_BLOCK = np.dtype([("count", "<u8"), ("raw_length", "<u8"), ("compressed_length", "<u8"), ("streams", "<u8", (8,))])
+
+
+def _zigzag(values):
+    """Map int64 values to uint64, small magnitudes to small numbers."""
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values):
+    return ((values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(np.int64))
+
+
+def _varint_encode(values):
+    """Encode a uint64 array as LEB128 varints (7 bits per byte, high bit set on all but the last byte)."""
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 10):
+        lengths += values >= np.uint64(1 << (7 * k))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    out = np.zeros(ends[-1] if len(ends) else 0, dtype=np.uint8)
+    for k in range(int(lengths.max()) if len(lengths) else 0):
+        more = lengths > k
+        chunk = (values[more] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        out[starts[more] + k] = chunk.astype(np.uint8) | np.where(lengths[more] > k + 1, 0x80, 0).astype(np.uint8)
+    return out.tobytes()
+
+
+def _varint_decode(buffer, count):
+    """Decode count LEB128 varints from buffer into a uint64 array."""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    ends = np.flatnonzero(data < 0x80)
+    if len(ends) != count:
+        raise ValueError(f"Error: Corrupt binary order file, expected {count} values but found {len(ends)}.")
+    starts = np.r_[0, ends[:-1] + 1]
+    lengths = ends - starts + 1
+    values = (data[starts] & 0x7F).astype(np.uint64)
+    for k in range(1, int(lengths.max()) if count else 0):
+        more = np.flatnonzero(lengths > k)
+        values[more] |= (data[starts[more] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+    return values
+
+
+def _filter_orders(arrays, start_ms=None, end_ms=None, valid_from_ms=None):
+    """
+    Filter the order arrays (as returned by _order_arrays) to the products with a delivery start in
+    [start_ms, end_ms], and to the orders still valid at valid_from_ms (orders without expiry always are).
+    Filters that are None are not applied.
+    """
+    ids, initials, sides, starts, transactions, validities, prices, quantities = arrays
+    keep = np.ones(len(ids), dtype=bool)
+    if start_ms is not None:
+        keep &= starts >= start_ms
+    if end_ms is not None:
+        keep &= starts <= end_ms
+    if valid_from_ms is not None:
+        keep &= validities > valid_from_ms
+    if keep.all():
+        return arrays
+    return tuple(column[keep] for column in arrays)
+
+
+def _resting_orders(arrays, time_ms):
+    """
+    Select the orders of the order arrays (as returned by _order_arrays) that can still rest in the book at time_ms:
+    valid after it, for products delivered after it.
+    """
+    keep = (arrays[5] > time_ms) & (arrays[3] > time_ms)
+    return tuple(column[keep] for column in arrays)
+
+
+def _touch_distance(sides, starts, transactions, validities, prices, quantities):
+    """
+    For every order, compute its distance to the touch when it is placed: the price difference to the best
+    order on its side of its product's book, and the volume of the orders on its side at strictly better prices.
+    Both are 0 for an order that improves or joins the best price.
+
+    Each product and side is replayed as a sweep over the placement and expiry events (expiries first at equal
+    times), keeping the best price in a heap and the volume per price level in a Fenwick tree.
+    """
+    gap = np.zeros(len(sides))
+    depth = np.zeros(len(sides))
+    # rank prices by how good they are for their side, lower is better
+    key = np.where(sides == 0, -prices, prices)
+    groups = np.lexsort((sides, starts))
+    bounds = np.flatnonzero(np.diff(starts[groups]) | np.diff(sides[groups])) + 1
+    for group in np.split(groups, bounds):
+        levels, rank = np.unique(key[group], return_inverse=True)
+        alive = validities[group] > transactions[group]
+        times = np.r_[transactions[group], validities[group][alive]]
+        placed = np.r_[np.ones(len(group), dtype=bool), np.zeros(alive.sum(), dtype=bool)]
+        orders = np.r_[np.arange(len(group)), np.flatnonzero(alive)]
+        events = np.lexsort((placed, times))
+
+        tree = [0.0] * (len(levels) + 1)
+        count = [0] * len(levels)
+        best = []
+        rank, volume, alive = rank.tolist(), quantities[group].tolist(), alive.tolist()
+        group_gap, group_depth = np.zeros(len(group)), np.zeros(len(group))
+        for is_placed, i in zip(placed[events].tolist(), orders[events].tolist()):
+            r = rank[i]
+            if is_placed:
+                while best and count[best[0]] == 0:
+                    heapq.heappop(best)
+                if best and best[0] < r:
+                    group_gap[i] = levels[r] - levels[best[0]]
+                    j, ahead = r, 0.0
+                    while j > 0:
+                        ahead += tree[j]
+                        j -= j & -j
+                    group_depth[i] = ahead
+                if not alive[i]:
+                    continue
+                count[r] += 1
+                heapq.heappush(best, r)
+                change = volume[i]
+            else:
+                count[r] -= 1
+                change = -volume[i]
+            j = r + 1
+            while j <= len(levels):
+                tree[j] += change
+                j += j & -j
+        gap[group] = group_gap
+        depth[group] = group_depth
+    return gap, depth
+
+
+def _compact_orders(arrays, price_band=None, max_depth=None, price_tick=None):
+    """
+    Lossy compaction of the order arrays (as returned by _order_arrays) for exploratory simulations. Drops the
+    orders placed more than price_band (€/MWh) behind the best price on their side of the book, or behind more
+    than max_depth (MWh) of better priced volume, and rounds prices to a coarser price_tick (€/MWh), buys down
+    and sells up. Returns the compacted arrays and the number of dropped orders.
+    """
+    ids, initials, sides, starts, transactions, validities, prices, quantities = arrays
+    keep = np.ones(len(ids), dtype=bool)
+    if price_band is not None or max_depth is not None:
+        gap, depth = _touch_distance(sides, starts, transactions, validities, prices, quantities)
+        if price_band is not None:
+            keep &= gap <= price_band
+        if max_depth is not None:
+            keep &= depth <= max_depth
+    if price_tick is not None:
+        ticks = np.where(sides == 0, np.floor(prices / price_tick + 1e-9), np.ceil(prices / price_tick - 1e-9))
+        prices = np.round(ticks * price_tick, 2)
+    arrays = (ids, initials, sides, starts, transactions, validities, prices, quantities)
+    return tuple(column[keep] for column in arrays), int((~keep).sum())
+
+
+def _orderbook_date(file_path):
+    """Return the day of a processed order book file, named orderbook_YYYY-MM-DD.<extension>."""
+    name = os.path.basename(file_path)
+    try:
+        return datetime.strptime(name.split("_")[-1].split(".")[0], "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Error: Invalid order book file name {name}, expected orderbook_YYYY-MM-DD.")
+
+
+def _carry_over_mask(day, starts):
+    """
+    Select the orders of a day's order book that are for products delivered from the next (Berlin) day on.
+    These are all the orders of the day that a simulation starting on the next day needs.
+    """
+    next_day = pd.Timestamp(day + pd.Timedelta(days=1)).tz_localize("Europe/Berlin")
+    return starts >= next_day.value // 1_000_000
+
+
+def _carry_path(bin_path):
+    """Return the path of the carry-over slice of a binary order file (orderbook_YYYY-MM-DD.carry.bin)."""
+    return os.path.splitext(bin_path)[0] + ".carry.bin"
+
+
+def _bin_version(file_path):
+    """Return the format version of a binary order file: 2 for the compressed format, else 1."""
+    with open(file_path, "rb") as f:
+        return 2 if f.read(len(_BIN_V2_MAGIC)) == _BIN_V2_MAGIC else 1
+
+
+def _empty_order_arrays():
+    """Return empty order arrays with the dtypes of _order_arrays."""
+    return tuple(np.empty(0, dtype=dtype) for dtype in [np.int64, np.int64, np.int8, np.int64, np.int64, np.int64,
+                                                        np.float64, np.float64])
+
+
+def _concat_order_arrays(parts):
+    """Concatenate order arrays (as returned by _order_arrays) column by column."""
+    parts = list(parts)
+    if not parts:
+        return _empty_order_arrays()
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def _encode_bin_v2_block(pa, arrays, codec):
+    """
+    Encode order arrays (as returned by _order_arrays) as one block of a compressed binary order file: the block
+    header, followed by the compressed streams (see _write_bin_v2).
+    """
+    ids, initials, sides, starts, transactions, validities, prices, quantities = arrays
+    cents = np.rint(np.asarray(prices) * 100).astype(np.int64)
+    tenths = np.rint(np.asarray(quantities) * 10).astype(np.int64)
+    expiry = validities != _NO_EXPIRY_MS
+    streams = [
+        _zigzag(np.diff(ids, prepend=0)),
+        _zigzag(initials - ids),
+        sides.astype(np.uint64),
+        _zigzag(np.diff(starts, prepend=0)),
+        _zigzag(np.diff(transactions, prepend=0)),
+        np.where(expiry, _zigzag(np.where(expiry, validities - transactions, 0)) + np.uint64(1), np.uint64(0)),
+        _zigzag(np.diff(cents, prepend=0)),
+        _zigzag(tenths),
+    ]
+    encoded = [_varint_encode(stream) for stream in streams]
+    raw = b"".join(encoded)
+    compressed = pa.compress(raw, codec=codec, asbytes=True)
+    header = np.array([(len(streams[0]), len(raw), len(compressed), [len(e) for e in encoded])], dtype=_BIN_V2_BLOCK)
+    return header.tobytes() + compressed
+
+
+def _decode_bin_v2_block(pa, content, position, codec):
+    """Decode the block at byte position of content. Returns its order arrays and the position after the block."""
+    block = np.frombuffer(content, dtype=_BIN_V2_BLOCK, count=1, offset=position)[0]
+    position += _BIN_V2_BLOCK.itemsize
+    count = int(block["count"])
+    if count == 0:
+        return _empty_order_arrays(), position + int(block["compressed_length"])
+    raw = pa.decompress(content[position:position + int(block["compressed_length"])],
+                        decompressed_size=int(block["raw_length"]), codec=codec, asbytes=True)
+    position += int(block["compressed_length"])
+    bounds = np.r_[0, np.cumsum(block["streams"].astype(np.int64))]
+    ids, initials, sides, starts, transactions, validities, cents, tenths = (
+        _varint_decode(raw[begin:end], count) for begin, end in zip(bounds[:-1], bounds[1:]))
+
+    ids = np.cumsum(_unzigzag(ids))
+    transactions = np.cumsum(_unzigzag(transactions))
+    expiry = validities != 0
+    return (
+        ids,
+        ids + _unzigzag(initials),
+        sides.astype(np.int8),
+        np.cumsum(_unzigzag(starts)),
+        transactions,
+        np.where(expiry, transactions + _unzigzag(validities - expiry.astype(np.uint64)), _NO_EXPIRY_MS),
+        np.cumsum(_unzigzag(cents)) / 100,
+        _unzigzag(tenths) / 10,
+    ), position
+
+
+def _write_bin_v2(file_path, arrays, codec="lz4", block_size=1 << 18):
+    """
+    Write the order arrays (as returned by _order_arrays) to a compressed binary order file (format version 2).
+
+    Orders are stored in blocks of block_size orders. Within a block, every column is a stream of varints:
+    ids, transaction times, delivery starts and prices (in cents) are delta-encoded, initial ids relative to the
+    id and validities relative to the transaction time, all zigzag-coded. Prices in cents and quantities in
+    tenths match the fixed point of the engine. Each block is compressed with codec (any codec supported by
+    pyarrow, e.g. 'lz4' or 'zstd'). The format saves disk space only: it is decoded in Python, and loads slower than
+    the engine's binaries, which the engine reads natively.
+    """
+    pa, _ = _import_pyarrow()
+    blocks = [_encode_bin_v2_block(pa, tuple(column[first:first + block_size] for column in arrays), codec)
+              for first in range(0, len(arrays[0]), block_size)]
+
+    header = np.array([(_BIN_V2_MAGIC, 2, codec.encode(), len(arrays[0]), len(blocks))], dtype=_BIN_V2_HEADER)
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.tobytes())
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp_path, file_path)
+
+
+def _read_bin_v2(file_path, offset=None):
+    """
+    Read a compressed binary order file (format version 2) into the order arrays of _order_arrays. With offset,
+    only the blocks from that byte offset on are read (see _Checkpoints).
+    """
+    pa, _ = _import_pyarrow()
+    with open(file_path, "rb") as f:
+        header = np.frombuffer(f.read(_BIN_V2_HEADER.itemsize), dtype=_BIN_V2_HEADER, count=1)[0]
+        if header["magic"] != _BIN_V2_MAGIC or header["version"] != 2:
+            raise ValueError(f"Error: {file_path} is not a binary order file of format version 2.")
+        if offset is not None:
+            f.seek(offset)
+        content = f.read()
+    codec = header["codec"].decode()
+    blocks = []
+    position = 0
+    while position < len(content):
+        arrays, position = _decode_bin_v2_block(pa, content, position, codec)
+        blocks.append(arrays)
+    if offset is None and sum(len(arrays[0]) for arrays in blocks) != header["count"]:
+        raise ValueError(f"Error: Corrupt binary order file {file_path}, expected {header['count']} orders.")
+    return _concat_order_arrays(blocks)
+
+
+def _bin_v2_blocks(file_path):
+    """Return the byte offsets and order counts of the blocks of a compressed binary order file."""
+    offsets, counts = [], []
+    with open(file_path, "rb") as f:
+        header = np.frombuffer(f.read(_BIN_V2_HEADER.itemsize), dtype=_BIN_V2_HEADER, count=1)[0]
+        position = _BIN_V2_HEADER.itemsize
+        for _ in range(int(header["blocks"])):
+            block = np.frombuffer(f.read(_BIN_V2_BLOCK.itemsize), dtype=_BIN_V2_BLOCK, count=1)[0]
+            offsets.append(position)
+            counts.append(int(block["count"]))
+            position += _BIN_V2_BLOCK.itemsize + int(block["compressed_length"])
+            f.seek(position)
+    return np.array(offsets, dtype=np.int64), np.array(counts, dtype=np.int64)
+
+
+class _Checkpoints:
+    """
+    Periodic order book checkpoints of a compressed binary order file, kept in a sidecar file next to it
+    (orderbook_YYYY-MM-DD.ckpt for orderbook_YYYY-MM-DD.bin).
+
+    For every checkpoint time, the sidecar stores the orders resting in the book at that time (transaction at or
+    before it, still valid after it, for a product not yet delivered) as one compressed block, and the byte offset of the block of the binary
+    holding the first later order. A replay to any time of the day then only decodes the checkpoint before it
+    and the tail of the binary (see Simulation.replay_to).
+    """
+
+    MAGIC = b"BITEPYCK"
+    VERSION = 1
+    HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("codec", "S8"), ("bin_size", "<u8"),
+                       ("checkpoints", "<u8")])
+    # time of the checkpoint, the block offset in the binary and the orders of that block at or before the time,
+    # and the byte position of the resting orders in the sidecar
+    INDEX = np.dtype([("time", "<i8"), ("offset", "<u8"), ("skip", "<u8"), ("position", "<u8")])
+
+    def __init__(self, bin_path):
+        self.bin_path = bin_path
+        self.path = self.sidecar(bin_path)
+        with open(self.path, "rb") as f:
+            self.content = f.read()
+        header = np.frombuffer(self.content, dtype=self.HEADER, count=1)[0]
+        if header["magic"] != self.MAGIC or header["version"] != self.VERSION:
+            raise ValueError(f"Error: {self.path} is not an order book checkpoint file.")
+        if header["bin_size"] != os.path.getsize(bin_path):
+            raise ValueError(f"Error: {self.path} does not match {os.path.basename(bin_path)}, rebuild the binary.")
+        self.codec = header["codec"].decode()
+        self.index = np.frombuffer(self.content, dtype=self.INDEX, count=int(header["checkpoints"]),
+                                   offset=self.HEADER.itemsize)
+
+    @staticmethod
+    def sidecar(bin_path):
+        """Return the path of the checkpoint file of a binary order file."""
+        return os.path.splitext(bin_path)[0] + ".ckpt"
+
+    @classmethod
+    def write(cls, bin_path, arrays, interval_ms, codec="lz4"):
+        """
+        Write the checkpoints of a compressed binary order file, holding the order arrays, every interval_ms
+        (aligned to multiples of interval_ms since epoch) within its transaction range.
+        """
+        pa, _ = _import_pyarrow()
+        transactions = arrays[4]
+        times = np.empty(0, dtype=np.int64)
+        if len(transactions):
+            times = np.arange(-(-transactions[0] // interval_ms) * interval_ms, transactions[-1] + 1, interval_ms)
+
+        offsets, counts = _bin_v2_blocks(bin_path)
+        firsts = np.cumsum(counts) - counts
+        index = np.zeros(len(times), dtype=cls.INDEX)
+        blocks = []
+        position = cls.HEADER.itemsize + len(times) * cls.INDEX.itemsize
+        for k, time in enumerate(times):
+            # the first order after the checkpoint, and the block holding it (past the end of the file if none)
+            first = np.searchsorted(transactions, time, side="right")
+            block = np.searchsorted(firsts, first, side="right") - 1
+            if first < len(transactions):
+                index[k] = (time, offsets[block], first - firsts[block], position)
+            else:
+                index[k] = (time, os.path.getsize(bin_path), 0, position)
+            resting = _resting_orders(tuple(column[:first] for column in arrays), time)
+            blocks.append(_encode_bin_v2_block(pa, resting, codec))
+            position += len(blocks[-1])
+
+        header = np.array([(cls.MAGIC, cls.VERSION, codec.encode(), os.path.getsize(bin_path), len(times))],
+                          dtype=cls.HEADER)
+        path = cls.sidecar(bin_path)
+        with open(path + ".tmp", "wb") as f:
+            f.write(header.tobytes())
+            f.write(index.tobytes())
+            for block in blocks:
+                f.write(block)
+        os.replace(path + ".tmp", path)
+
+    def seek(self, time_ms):
+        """
+        Return the orders of the binary needed to rebuild the book at time_ms: the time of the last checkpoint at
+        or before it (None if there is none), the orders resting at that checkpoint, and all later orders.
+        """
+        k = np.searchsorted(self.index["time"], time_ms, side="right") - 1
+        if k < 0:
+            return None, _empty_order_arrays(), _read_bin_v2(self.bin_path)
+        pa, _ = _import_pyarrow()
+        checkpoint = self.index[k]
+        resting, _ = _decode_bin_v2_block(pa, self.content, int(checkpoint["position"]), self.codec)
+        tail = _read_bin_v2(self.bin_path, int(checkpoint["offset"]))
+        return int(checkpoint["time"]), resting, tuple(column[int(checkpoint["skip"]):] for column in tail)
+
+
+class _Manifest:
+    """
+    Record of the files written into a directory, kept in a JSON sidecar in that directory.
+
+    For every output file, the manifest stores its size, mtime and SHA-256 checksum, together with the size and
+    mtime of each source file it was built from. An output is up to date if it still matches its recorded
+    checksum and its sources are unchanged. Entries are saved after every written file, so an interrupted
+    conversion resumes where it stopped.
+    """
+    FILENAME = "bitepy_manifest.json"
+    VERSION = 1
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, self.FILENAME)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == self.VERSION:
+                self.entries = manifest["entries"]
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def _checksum(path):
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _sources(self, source_paths):
+        return {os.path.abspath(p): self._stat(p) for p in source_paths}
+
+    def is_current(self, output_path, source_paths, options=None):
+        """
+        Check if output_path exists, is unmodified and was built from the unchanged source_paths (with the same
+        options, if any).
+        """
+        entry = self.entries.get(os.path.basename(output_path))
+        if entry is None or not os.path.exists(output_path):
+            return False
+        if entry["sources"] != self._sources(source_paths) or entry.get("options") != options:
+            return False
+        if self._stat(output_path) == entry["stat"]:
+            return True
+        return self._checksum(output_path) == entry["sha256"]
+
+    def record(self, output_path, source_paths, options=None):
+        """Record output_path as built from source_paths (with options, if any) and save the manifest."""
+        entry = {
+            "sources": self._sources(source_paths),
+            "stat": self._stat(output_path),
+            "sha256": self._checksum(output_path),
+        }
+        if options is not None:
+            entry["options"] = options
+        self.entries[os.path.basename(output_path)] = entry
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def _order_summary(arrays):
+    """Summarize the order arrays (as returned by _order_arrays) for the catalog of binary order files."""
+    starts, transactions = arrays[3], arrays[4]
+    products = np.unique(starts)
+    return {
+        "orders": int(len(transactions)),
+        "first_transaction": int(transactions.min()) if len(transactions) else None,
+        "last_transaction": int(transactions.max()) if len(transactions) else None,
+        "products": int(len(products)),
+        "first_product": int(products[0]) if len(products) else None,
+        "last_product": int(products[-1]) if len(products) else None,
+    }
+
+
+class _Catalog:
+    """
+    Catalog of the binary order files in a directory, kept in a JSON sidecar in that directory.
+
+    For every file, the catalog stores its format, size, mtime and SHA-256 checksum, and a summary of its orders
+    (see _order_summary). Summaries are recorded when Data.create_bins_from_csv writes the binaries, and
+    compressed binaries are decoded when they are scanned. Binaries in the engine's format that were written
+    elsewhere cannot be read in Python and are cataloged without a summary. A file that no longer matches the
+    checksum recorded when it was written is reported as modified.
+    """
+    FILENAME = "bitepy_catalog.json"
+    VERSION = 1
+    SUMMARY = ["orders", "first_transaction", "last_transaction", "products", "first_product", "last_product"]
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                catalog = json.load(f)
+            if catalog.get("version") == self.VERSION:
+                self.entries = catalog["entries"]
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def record(self, file_path, summary):
+        """Record a binary order file with the summary of the orders written to it, and save the catalog."""
+        self.entries[os.path.basename(file_path)] = {
+            "stat": _Manifest._stat(file_path),
+            "sha256": _Manifest._checksum(file_path),
+            "format": _bin_version(file_path),
+            "written": True,
+            "status": "ok",
+            **summary,
+        }
+        self.save()
+
+    def entry(self, file_path, checksum=True):
+        """
+        Return the catalog entry of a binary order file, scanning the file if it is new or has changed. Without
+        checksum, files are only compared by size and mtime and never read: a file written by
+        Data.create_bins_from_csv whose size or mtime changed is reported as 'changed', and new files are returned
+        without a summary and not added to the catalog.
+        """
+        name = os.path.basename(file_path)
+        if not os.path.exists(file_path):
+            return {"status": "missing"}
+        entry = self.entries.get(name)
+        stat = _Manifest._stat(file_path)
+        if entry is not None and entry["stat"] == stat:
+            return entry
+        if not checksum:
+            if entry is not None and entry["written"]:
+                return dict(entry, stat=stat, status="changed")
+            return {"stat": stat, "format": _bin_version(file_path), "written": False, "status": "ok"}
+        checksum = _Manifest._checksum(file_path)
+        if entry is not None and entry["written"]:
+            entry = dict(entry, stat=stat, status="ok" if checksum == entry["sha256"] else "modified")
+        else:
+            entry = {"stat": stat, "sha256": checksum, "format": _bin_version(file_path), "written": False,
+                     "status": "ok"}
+            if entry["format"] == 2:
+                try:
+                    entry.update(_order_summary(_read_bin_v2(file_path)))
+                except Exception as e:
+                    entry["status"] = f"unreadable ({e})"
+        self.entries[name] = entry
+        return entry
+
+    def scan(self, file_paths=None):
+        """
+        Scan the binary order files of the directory (or only file_paths), save the catalog, and return it as a
+        DataFrame with one row per file.
+        """
+        if file_paths is None:
+            file_paths = sorted(str(p) for p in Path(self.directory).glob("orderbook_*.bin"))
+            self.entries = {name: entry for name, entry in self.entries.items()
+                            if os.path.exists(os.path.join(self.directory, name))}
+        rows = []
+        for file_path in file_paths:
+            entry = self.entry(file_path)
+            name = os.path.basename(file_path)
+            rows.append({
+                "file": name,
+                "date": _orderbook_date(name),
+                "carry_over": name.endswith(".carry.bin"),
+                "format": entry.get("format"),
+                "size": entry["stat"][0] if "stat" in entry else None,
+                "sha256": entry.get("sha256"),
+                **{key: entry.get(key) for key in self.SUMMARY},
+                "status": entry["status"],
+            })
+        self.save()
+        catalog = pd.DataFrame(rows, columns=["file", "date", "carry_over", "format", "size", "sha256", *self.SUMMARY,
+                                              "status"])
+        for col in ["first_transaction", "last_transaction", "first_product", "last_product"]:
+            catalog[col] = pd.to_datetime(catalog[col], unit="ms", utc=True)
+        return catalog
+
+
+class _OrderStore:
+    """
+    Consolidated store of the processed orders of many days in a single file, for example one per year.
+
+    The file starts with a fixed header (magic, version and the position of the index), followed by the orders
+    as fixed-size little-endian records and the index. The orders of a day are grouped by delivery start, in
+    the order of the day within a group, and the index holds one entry per group with the day, the delivery start,
+    the byte offset of its first record and the number of records. Every record also holds its position in the
+    day as written (sequence), which restores the order of the day when groups are read back. The records are
+    memory-mapped, so reading a set of days and products only touches their groups.
+    """
+    MAGIC = b"BITEPYOS"
+    VERSION = 2
+    HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("index_offset", "<u8"), ("index_length", "<u8")])
+    RECORD = np.dtype([("id", "<i8"), ("initial", "<i8"), ("side", "i1"), ("start", "<i8"), ("transaction", "<i8"),
+                       ("validity", "<i8"), ("price", "<f8"), ("quantity", "<f8"), ("sequence", "<i8")])
+    ORDER_FIELDS = RECORD.names[:-1]
+    SEGMENT = np.dtype([("day", "<i8"), ("start", "<i8"), ("offset", "<u8"), ("count", "<u8")])
+
+    def __init__(self, path):
+        self.path = path
+        header = np.fromfile(path, dtype=self.HEADER, count=1)
+        if len(header) == 0 or header["magic"][0] != self.MAGIC:
+            raise ValueError(f"Error: {path} is not a bitepy order store.")
+        if header["version"][0] != self.VERSION:
+            raise ValueError(f"Error: Unsupported order store version {header['version'][0]} in {path}, rewrite it "
+                             f"with Data.create_order_store(overwrite=True).")
+        self.index = np.fromfile(path, dtype=self.SEGMENT, count=int(header["index_length"][0]),
+                                 offset=int(header["index_offset"][0]))
+        n_records = (int(header["index_offset"][0]) - self.HEADER.itemsize) // self.RECORD.itemsize
+        self.records = np.memmap(path, dtype=self.RECORD, mode="r", offset=self.HEADER.itemsize,
+                                 shape=(n_records,)) if n_records else np.empty(0, dtype=self.RECORD)
+
+    @classmethod
+    def write(cls, path, days):
+        """
+        Write the store to path from an iterable of (day, order arrays) pairs, with day a datetime64[D] and the
+        order arrays as returned by _order_arrays.
+        """
+        segments = []
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(np.zeros(1, dtype=cls.HEADER).tobytes())
+            for day, arrays in days:
+                records = np.empty(len(arrays[0]), dtype=cls.RECORD)
+                for name, values in zip(cls.ORDER_FIELDS, arrays):
+                    records[name] = values
+                records["sequence"] = np.arange(len(records))
+                records = records[np.argsort(records["start"], kind="stable")]
+                starts, first, counts = np.unique(records["start"], return_index=True, return_counts=True)
+                day_segments = np.empty(len(starts), dtype=cls.SEGMENT)
+                day_segments["day"] = np.datetime64(day, "D").astype(np.int64)
+                day_segments["start"] = starts
+                day_segments["offset"] = f.tell() + first * cls.RECORD.itemsize
+                day_segments["count"] = counts
+                segments.append(day_segments)
+                f.write(records.tobytes())
+            index = np.concatenate(segments) if segments else np.empty(0, dtype=cls.SEGMENT)
+            header = np.array([(cls.MAGIC, cls.VERSION, f.tell(), len(index))], dtype=cls.HEADER)
+            f.write(index.tobytes())
+            f.seek(0)
+            f.write(header.tobytes())
+        os.replace(tmp_path, path)
+
+    def days(self):
+        """Return the days in the store as a sorted datetime64[D] array."""
+        return np.unique(self.index["day"]).astype("datetime64[D]")
+
+    def read(self, day, start_ms=None, end_ms=None, valid_from_ms=None):
+        """
+        Read the orders of day (a datetime64[D]) in the order they were written, as the arrays returned by
+        _order_arrays.
+        With start_ms and/or end_ms, only the products with a delivery start in [start_ms, end_ms] are read. With
+        valid_from_ms, only the orders still valid at that time are returned.
+        """
+        index = self.index[self.index["day"] == np.datetime64(day, "D").astype(np.int64)]
+        if len(index) == 0:
+            raise ValueError(f"Error: Day {day} is not in the order store {self.path}.")
+        if start_ms is not None:
+            index = index[index["start"] >= start_ms]
+        if end_ms is not None:
+            index = index[index["start"] <= end_ms]
+        first = ((index["offset"] - self.HEADER.itemsize) // self.RECORD.itemsize).astype(np.int64)
+        groups = [self.records[p:p + n] for p, n in zip(first, index["count"].astype(np.int64))]
+        records = np.concatenate(groups) if groups else np.empty(0, dtype=self.RECORD)
+        if valid_from_ms is not None:
+            records = records[records["validity"] > valid_from_ms]
+        records = records[np.argsort(records["sequence"])]
+        return tuple(np.ascontiguousarray(records[name]) for name in self.ORDER_FIELDS)
+
+
 class Data:
     def __init__(self):
         """Initialize a Data instance."""
@@ -31,8 +820,25 @@ class Data:
 
     def _load_csv(self, file_path):
         """
-        Load a single zipped CSV file with specified dtypes.
+        Load a single zipped CSV file with specified dtypes. The pyarrow CSV reader, which parses the timestamps
+        natively, is used if pyarrow is installed.
         """
+        try:
+            pa, _ = _import_pyarrow()
+        except ImportError:
+            pa = None
+        if pa is not None:
+            from pyarrow import csv as pa_csv
+            with ZipFile(file_path) as archive:
+                raw = archive.read(archive.namelist()[0])
+            timestamp = pa.timestamp("ms", tz="UTC")
+            table = pa_csv.read_csv(pa.py_buffer(raw), convert_options=pa_csv.ConvertOptions(column_types={
+                "initial": pa.int64(), "side": pa.string(), "start": timestamp, "transaction": timestamp,
+                "validity": timestamp, "price": pa.float64(), "quantity": pa.float64(),
+            }))
+            df = table.rename_columns(["id"] + table.column_names[1:]).to_pandas()
+            return _order_arrays(df)
+
         df = pd.read_csv(
             file_path,
             compression="zip",
@@ -48,15 +854,206 @@ class Data:
             },
         )
         df.rename(columns={"Unnamed: 0": "id"}, inplace=True)
-        ids = df["id"].to_numpy(dtype=np.int64).tolist()
-        initials = df["initial"].to_numpy(dtype=np.int64).tolist()
-        sides = df["side"].to_numpy(dtype="str").tolist()
-        starts = df["start"].to_numpy(dtype="str").tolist()
-        transactions = df["transaction"].to_numpy(dtype="str").tolist()
-        validities = df["validity"].to_numpy(dtype="str").tolist()
-        prices = df["price"].to_numpy(dtype=np.float64).tolist()
-        quantities = df["quantity"].to_numpy(dtype=np.float64).tolist()
-        return ids, initials, sides, starts, transactions, validities, prices, quantities
+        return _order_arrays(df)
+
+    def _load_parquet(self, file_path):
+        """
+        Load a single Parquet order book file and return its columns in the same format as _load_csv.
+        """
+        pa, pq = _import_pyarrow()
+        df = pq.read_table(file_path).to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        # row groups are per delivery start, restore the row order of the file (files written before the sequence
+        # column was added are in transaction order)
+        order = df["sequence"] if "sequence" in df.columns else df["transaction"]
+        df = df.iloc[np.argsort(order.to_numpy(dtype=np.int64), kind="stable")]
+        return _order_arrays(df)
+
+    def _load_orderbook(self, file_path):
+        """
+        Load a processed order book file, either zipped CSV (.csv.zip) or Parquet (.parquet), as the arrays
+        expected by the C++ extension (see _order_arrays).
+        """
+        if str(file_path).endswith(".parquet"):
+            return self._load_parquet(file_path)
+        return self._load_csv(file_path)
+
+    def _to_epoch_ms(self, timestamps):
+        """
+        Convert a column of timestamps (datetimes, or UTC strings as written to the CSV files) to nullable int64
+        epoch milliseconds, the representation of timestamps in the processed order book frames.
+        """
+        ms = _epoch_ms(timestamps)
+        return pd.Series(ms, index=timestamps.index, dtype="Int64").mask(ms == _NO_EXPIRY_MS)
+
+    def _format_epoch_ms(self, epoch_ms, unit):
+        """
+        Format nullable epoch milliseconds as UTC timestamp strings in the CSV format, with second ('s') or
+        millisecond ('ms') precision.
+        """
+        missing = epoch_ms.isna().to_numpy()
+        ms = epoch_ms.to_numpy(dtype=np.int64, na_value=0).astype("datetime64[ms]")
+        formatted = pd.Series(np.char.add(np.datetime_as_string(ms, unit=unit), "Z"), index=epoch_ms.index,
+                              dtype="string")
+        formatted[missing] = pd.NA
+        return formatted
+
+    def _write_parquet(self, df, file_path):
+        """
+        Write a processed order book frame as Parquet with int64 epoch-millisecond timestamps, a dictionary
+        encoded side and one row group per delivery start. The sequence column holds the position of every order
+        in df, so the row order is restored exactly on loading, also for orders with the same transaction time.
+        Integer columns are delta encoded and all columns are zstd compressed.
+        """
+        pa, pq = _import_pyarrow()
+        sequence = np.argsort(df["start"].to_numpy(dtype=np.int64), kind="stable")
+        df = df.iloc[sequence]
+        table = pa.table({
+            "id": pa.array(df["id"].to_numpy(dtype=np.int64)),
+            "initial": pa.array(df["initial"].to_numpy(dtype=np.int64)),
+            "side": pa.array(df["side"].to_numpy(dtype="str")).dictionary_encode(),
+            "start": pa.array(df["start"], type=pa.int64()),
+            "transaction": pa.array(df["transaction"], type=pa.int64()),
+            "validity": pa.array(df["validity"], type=pa.int64()),
+            "price": pa.array(df["price"].to_numpy(dtype=np.float64)),
+            "quantity": pa.array(df["quantity"].to_numpy(dtype=np.float64)),
+            "sequence": pa.array(sequence.astype(np.int64)),
+        })
+        starts = df["start"].to_numpy(dtype=np.int64)
+        bounds = np.flatnonzero(np.diff(starts)) + 1
+        delta_columns = ["id", "initial", "start", "transaction", "validity", "sequence"]
+        with pq.ParquetWriter(file_path, table.schema, compression="zstd", use_dictionary=["side"],
+                              column_encoding={col: "DELTA_BINARY_PACKED" for col in delta_columns}) as writer:
+            for offset, length in zip(np.r_[0, bounds], np.diff(np.r_[0, bounds, len(df)])):
+                writer.write_table(table.slice(offset, length), row_group_size=max(length, 1))
+
+    def _reconstruct_lifecycle(self, df, terminal_actions=("D",), carry=False):
+        """
+        Resolve the message chain of every order into order versions with validity ends.
+
+        Every change message ('C') of an order that was added ('A') becomes a new order version, and the
+        version before it is valid until the change's transaction time. The last version of an order is valid
+        until its last terminal message (e.g. 'D'), if any. Terminal actions are applied in the given order,
+        so a later action overrides an earlier one. Change messages of orders without an add message are
+        kept as they are. Terminal messages are removed from the returned frame.
+
+        The frame is sorted once by (order, transaction), so this runs in O(n log n) instead of iterating
+        once per change in the longest modification chain. The row order and index of df are preserved.
+
+        With carry=True, df can be one chunk of a longer message stream in transaction order, and a tuple
+        (done, open) is returned. done holds the order versions that later messages can no longer change, and
+        open the last version of every added order (marked as 'A') with its terminal messages. Passing open
+        concatenated with the next chunk continues the stream, and the versions in the final open frame are
+        finished. This gives the same versions as a single call on the whole stream.
+        """
+        if df.empty:
+            done = df.loc[~df["action"].isin(terminal_actions)]
+            return (done, df) if carry else done
+
+        action = df["action"].to_numpy()
+        transaction = df["transaction"].to_numpy(dtype=np.int64)
+        validity = df["validity"].to_numpy(dtype=np.int64, na_value=_NO_EXPIRY_MS).copy()
+        codes, _ = pd.factorize(df["order"])
+
+        # stable sort by order, then transaction (ties keep file order)
+        perm = np.lexsort((transaction, codes))
+        s_codes = codes[perm]
+        s_action = action[perm]
+        s_transaction = transaction[perm]
+
+        has_add = np.zeros(codes.max() + 1, dtype=bool)
+        has_add[s_codes[s_action == "A"]] = True
+        is_version = ((s_action == "A") | (s_action == "C")) & has_add[s_codes]
+
+        # a change ends the version of the same order right before it
+        v_pos = np.flatnonzero(is_version)
+        v_codes = s_codes[v_pos]
+        same_next = v_codes[:-1] == v_codes[1:]
+        ended = same_next & (s_action[v_pos[1:]] == "C")
+        validity[perm[v_pos[:-1][ended]]] = s_transaction[v_pos[1:][ended]]
+
+        # a terminal message ends the last version of its order
+        last_pos = v_pos[np.append(~same_next, True)] if v_pos.size else v_pos
+        for terminal in terminal_actions:
+            t_pos = np.flatnonzero((s_action == terminal) & has_add[s_codes])
+            if t_pos.size == 0:
+                continue
+            end = np.full(has_add.shape[0], -1, dtype=np.int64)
+            end[s_codes[t_pos]] = t_pos  # last terminal message per order wins
+            last_end = end[s_codes[last_pos]]
+            found = last_end >= 0
+            validity[perm[last_pos[found]]] = s_transaction[last_end[found]]
+
+        validity = pd.Series(validity, index=df.index, dtype="Int64").mask(validity == _NO_EXPIRY_MS)
+        df = df.assign(validity=validity)
+        is_terminal = df["action"].isin(terminal_actions).to_numpy()
+        if not carry:
+            return df.loc[~is_terminal]
+
+        # keep the last versions and the terminal messages of added orders open for the next chunk
+        is_open = np.zeros(len(df), dtype=bool)
+        is_open[perm[last_pos]] = True
+        is_open[perm[np.flatnonzero(np.isin(s_action, terminal_actions) & has_add[s_codes])]] = True
+        last_version = np.zeros(len(df), dtype=bool)
+        last_version[perm[last_pos]] = True
+        open_df = df.loc[is_open]
+        open_df = open_df.assign(action=np.where(last_version[is_open], "A", open_df["action"].to_numpy()))
+        return df.loc[~is_open & ~is_terminal], open_df
+
+    def _read_epex_orders(self, csv_file, sep, skiprows, columns, timestamps, filters, chunksize=1_000_000):
+        """
+        Stream a raw EPEX order CSV and return the rows passing the filters as a frame.
+
+        Only the columns in columns (raw name -> new name) and the filter columns are parsed, and every chunk is
+        filtered ({raw name: allowed values}) before the next one is read, so the full file is never held in
+        memory. The timestamp columns (raw names, UTC) are returned as nullable int64 epoch milliseconds. Uses the
+        multithreaded pyarrow CSV reader if pyarrow is installed, and chunked pandas.read_csv otherwise.
+        """
+        parsed = list(dict.fromkeys([*columns, *filters]))
+        try:
+            pa, _ = _import_pyarrow()
+        except ImportError:
+            pa = None
+
+        if pa is not None:
+            from pyarrow import csv as pa_csv
+            from pyarrow import compute as pa_compute
+            timestamp = pa.timestamp("ms", tz="UTC")
+            reader = pa_csv.open_csv(
+                csv_file,
+                read_options=pa_csv.ReadOptions(skip_rows=skiprows, block_size=64 << 20),
+                parse_options=pa_csv.ParseOptions(delimiter=sep),
+                convert_options=pa_csv.ConvertOptions(include_columns=parsed,
+                                                      column_types={col: timestamp for col in timestamps}),
+            )
+            batches, rows, offset = [], [], 0
+            for batch in reader:
+                mask = None
+                for col, values in filters.items():
+                    keep = pa_compute.is_in(batch.column(col), value_set=pa.array(values, type=batch.schema.field(col).type))
+                    mask = keep if mask is None else pa_compute.and_(mask, keep)
+                batches.append(batch.filter(mask).select(list(columns)))
+                # keep the row numbers of the file as index, as pandas.read_csv does
+                rows.append(np.flatnonzero(mask.to_numpy(zero_copy_only=False)) + offset)
+                offset += batch.num_rows
+            schema = pa.schema([reader.schema.field(col) for col in columns])
+            table = pa.Table.from_batches(batches, schema=schema)
+            for col in timestamps:
+                index = table.schema.get_field_index(col)
+                table = table.set_column(index, col, table.column(col).cast(pa.timestamp("ms")))
+            df = table.to_pandas()
+            df.index = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        else:
+            chunks = []
+            for chunk in pd.read_csv(csv_file, sep=sep, skiprows=skiprows, usecols=parsed,
+                                     chunksize=chunksize):
+                for col, values in filters.items():
+                    chunk = chunk.loc[chunk[col].isin(values)]
+                chunks.append(chunk[list(columns)])
+            df = pd.concat(chunks)
+
+        for col in timestamps:
+            df[col] = self._to_epoch_ms(df[col])
+        return df.rename(columns=columns)
 
     def _read_id_table_2020(self, timestamp, datapath):
         year = timestamp.strftime("%Y")
@@ -70,82 +1067,38 @@ class Data:
 
         # Read data from the CSV inside the zip file
         zip_file = ZipFile(f"{datapath}/{year}/{month}/" + zip_file_name)
-        df = (pd.read_csv(zip_file.open(csv_file_name), sep=";", decimal=".")
-              .drop_duplicates(subset=["Order ID", "Initial ID", "Action code", "Validity time", "Price", "Quantity"])
-              .loc[lambda x: x["Is User Defined Block"] == 0]
-              .loc[lambda x: (x["Product"] == "Intraday_Hour_Power") | (x["Product"] == "XBID_Hour_Power")]
-              .loc[lambda x: (x["Action code"] == "A") | (x["Action code"] == "D") | (x["Action code"] == "C") | (x["Action code"] == "I")]
-              .drop(["Delivery area", "Execution restriction", "Market area", "Parent ID", "Delivery End",
-                     "Currency", "Product", "isOTC", "Is User Defined Block", "Unnamed: 20", "RevisionNo", "Entry time"],
-                    axis=1)
-              .rename({"Order ID": "order",
-                       "Initial ID": "initial",
-                       "Delivery Start": "start",
-                       "Side": "side",
-                       "Price": "price",
-                       "Volume": "volume",
-                       "Validity time": "validity",
-                       "Action code": "action",
-                       "Transaction Time": "transaction",
-                       "Quantity": "quantity"}, axis=1)
-              .assign(start=lambda x: pd.to_datetime(x.start, format="%Y-%m-%dT%H:%M:%SZ"))
-              .assign(validity=lambda x: pd.to_datetime(x.validity, format="%Y-%m-%dT%H:%M:%SZ"))
-              .assign(transaction=lambda x: pd.to_datetime(x.transaction, format="%Y-%m-%dT%H:%M:%S.%fZ"))
-              )
+        with zip_file.open(csv_file_name) as csv_file:
+            df = self._read_epex_orders(
+                csv_file, sep=";", skiprows=0,
+                columns={"Order ID": "order",
+                         "Initial ID": "initial",
+                         "Side": "side",
+                         "Delivery Start": "start",
+                         "Transaction Time": "transaction",
+                         "Validity time": "validity",
+                         "Action code": "action",
+                         "Price": "price",
+                         "Quantity": "quantity"},
+                timestamps=["Delivery Start", "Transaction Time", "Validity time"],
+                filters={"Is User Defined Block": [0],
+                         "Product": _EPEX_PRODUCTS,
+                         "Action code": _EPEX_ACTIONS},
+            )
+        df = df.drop_duplicates(subset=["order", "initial", "action", "validity", "price", "quantity"])
 
         # Remove iceberg orders
         iceberg_IDs = df.loc[df["action"] == "I", "initial"].unique()
         df = df.loc[~df["initial"].isin(iceberg_IDs)]
 
-        # Process change messages (action code 'C')
-        change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
-        not_added = change_messages[~(change_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-        change_messages = change_messages[~(change_messages["order"].isin(not_added["order"]))]
-        
-        change_exists = change_messages.shape[0] > 0
-        change_counter = 0
-        while change_exists:
-            indexer_messA_with_change = df[(df["order"].isin(change_messages["order"])) & (df["action"] == "A")] \
-                .sort_values("transaction").groupby("order").tail(1).index
-
-            df["df_index_copy"] = df.index
-            merged = pd.merge(change_messages, df.loc[indexer_messA_with_change], on='order')
-            df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
-
-            # Change the action code from "C" to "A" for processed messages
-            df.loc[df.index.isin(change_messages.index), "action"] = "A"
-            df.drop("df_index_copy", axis=1, inplace=True)
-
-            # Redo the procedure for remaining change messages
-            change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
-            not_added = change_messages[~(change_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-            change_messages = change_messages[~(change_messages["order"].isin(not_added["order"]))]
-            change_exists = change_messages.shape[0] > 0
-            change_counter += 1
-
-        # Process cancel messages (action code 'D')
-        cancel_messages = df[df["action"] == "D"]
-        not_added = cancel_messages[~(cancel_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-        cancel_messages = cancel_messages[~(cancel_messages["order"].isin(not_added["order"]))]
-        
-        indexer_messA_with_cancel = df[(df["order"].isin(cancel_messages["order"])) & (df["action"] == "A")] \
-            .sort_values("transaction").groupby("order").tail(1).index
-        df["df_index_copy"] = df.index
-        merged = pd.merge(cancel_messages, df.loc[indexer_messA_with_cancel], on='order')
-        df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
-
-        df = df.loc[lambda x: ~(x["action"] == "D")]
-        df = df.drop(["order", "action", "df_index_copy"], axis=1)
+        # Turn change and cancel messages into order versions with validity ends
+        df = self._reconstruct_lifecycle(df, terminal_actions=("D",))
+        df = df.drop(["order", "action"], axis=1)
 
         # Reorder and format columns
         newOrder = ["initial", "side", "start", "transaction", "validity", "price", "quantity"]
         df = df[newOrder]
         df['side'] = df['side'].str.upper()
 
-        df["start"] = df["start"].dt.tz_localize('UTC').dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        df["transaction"] = df["transaction"].dt.tz_localize('UTC').dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-        df["validity"] = df["validity"].dt.tz_localize('UTC').dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-        
         return df
 
     def _read_id_table_2021(self, timestamp, datapath):
@@ -160,83 +1113,96 @@ class Data:
 
         # Read data from the CSV inside the zip file
         zip_file = ZipFile(f"{datapath}/{year}/{month}/" + zip_file_name)
-        df = (pd.read_csv(zip_file.open(csv_file_name), sep=",", decimal=".", skiprows=1)
-              .drop_duplicates(subset=["OrderId", "InitialId", "ActionCode", "ValidityTime", "Price", "Quantity"])
-              .loc[lambda x: x["UserDefinedBlock"] == "N"]
-              .loc[lambda x: (x["Product"] == "Intraday_Hour_Power") | (x["Product"] == "XBID_Hour_Power")]
-              .loc[lambda x: (x["ActionCode"] == "A") | (x["ActionCode"] == "D") | (x["ActionCode"] == "C") | (x["ActionCode"] == "I")]
-              .drop(["LinkedBasketId", "DeliveryArea", "ParentId", "DeliveryEnd", "Currency", "Product",
-                     "UserDefinedBlock", "RevisionNo", "ExecutionRestriction", "CreationTime", "QuantityUnit",
-                     "Volume", "VolumeUnit"], axis=1)
-              .rename({"OrderId": "order",
-                       "InitialId": "initial",
-                       "DeliveryStart": "start",
-                       "Side": "side",
-                       "Price": "price",
-                       "Volume": "volume",
-                       "ValidityTime": "validity",
-                       "ActionCode": "action",
-                       "TransactionTime": "transaction",
-                       "Quantity": "quantity"}, axis=1)
-              .assign(start=lambda x: pd.to_datetime(x.start, format="%Y-%m-%dT%H:%M:%SZ"))
-              .assign(validity=lambda x: pd.to_datetime(x.validity, format="%Y-%m-%dT%H:%M:%SZ"))
-              .assign(transaction=lambda x: pd.to_datetime(x.transaction, format="%Y-%m-%dT%H:%M:%S.%fZ"))
-              )
+        with zip_file.open(csv_file_name) as csv_file:
+            df = self._read_epex_orders(
+                csv_file, sep=",", skiprows=1,
+                columns={"OrderId": "order",
+                         "InitialId": "initial",
+                         "Side": "side",
+                         "DeliveryStart": "start",
+                         "TransactionTime": "transaction",
+                         "ValidityTime": "validity",
+                         "ActionCode": "action",
+                         "Price": "price",
+                         "Quantity": "quantity"},
+                timestamps=["DeliveryStart", "TransactionTime", "ValidityTime"],
+                filters={"UserDefinedBlock": ["N"],
+                         "Product": _EPEX_PRODUCTS,
+                         "ActionCode": _EPEX_ACTIONS},
+            )
+        df = df.drop_duplicates(subset=["order", "initial", "action", "validity", "price", "quantity"])
         # Remove iceberg orders
         iceberg_IDs = df.loc[df["action"] == "I", "initial"].unique()
         df = df.loc[~df["initial"].isin(iceberg_IDs)]
 
-        # Process change messages (action code 'C')
-        change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
-        not_added = change_messages[~(change_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-        change_messages = change_messages[~(change_messages["order"].isin(not_added["order"]))]
-        
-        change_exists = change_messages.shape[0] > 0
-        change_counter = 0
-        while change_exists:
-            indexer_messA_with_change = df[(df["order"].isin(change_messages["order"])) & (df["action"] == "A")] \
-                .sort_values("transaction").groupby("order").tail(1).index
-
-            df["df_index_copy"] = df.index
-            merged = pd.merge(change_messages, df.loc[indexer_messA_with_change], on='order')
-            df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
-
-            # Change the action code from "C" to "A" so it can be processed in the next iteration
-            df.loc[df.index.isin(change_messages.index), "action"] = "A"
-            df.drop("df_index_copy", axis=1, inplace=True)
-
-            # Redo procedure for remaining change messages
-            change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
-            not_added = change_messages[~(change_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-            change_messages = change_messages[~(change_messages["order"].isin(not_added["order"]))]
-            change_exists = change_messages.shape[0] > 0
-            change_counter += 1
-
-        # Process cancel messages (action code 'D')
-        cancel_messages = df[df["action"] == "D"]
-        not_added = cancel_messages[~(cancel_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-        cancel_messages = cancel_messages[~(cancel_messages["order"].isin(not_added["order"]))]
-        
-        indexer_messA_with_cancel = df[(df["order"].isin(cancel_messages["order"])) & (df["action"] == "A")] \
-            .sort_values("transaction").groupby("order").tail(1).index
-        df["df_index_copy"] = df.index
-        merged = pd.merge(cancel_messages, df.loc[indexer_messA_with_cancel], on='order')
-        df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
-
-        df = df.loc[lambda x: ~(x["action"] == "D")]
-        df = df.drop(["order", "action", "df_index_copy"], axis=1)
-
-        df["start"] = df["start"].dt.tz_localize('UTC').dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        df["transaction"] = df["transaction"].dt.tz_localize('UTC').dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-        df["validity"] = df["validity"].dt.tz_localize('UTC').dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-        
+        # Turn change and cancel messages into order versions with validity ends
+        df = self._reconstruct_lifecycle(df, terminal_actions=("D",))
+        df = df.drop(["order", "action"], axis=1)
+
         return df
     
     
+    def _read_nordpool_hours(self, parquet_files, max_workers=4):
+        """
+        Read hourly NordPool parquet files in order, yielding one frame per file. Only the used columns are read,
+        and the product (PH contracts) and action filters are applied in Arrow. The frames are indexed by the
+        position of each message among all messages of the files before filtering, which becomes the id of the
+        processed orders as in the reader that loaded the whole day. Timestamps are parsed to UTC by Arrow where
+        possible. Up to max_workers files are read ahead in threads.
+        """
+        pa, _ = _import_pyarrow()
+        import pyarrow.compute as pa_compute
+        import pyarrow.dataset as ds
+
+        columns = ['orderId', 'originalOrderId', 'action', 'updatedTime', 'expirationTime', 'deliveryStart',
+                   'price', 'volume', 'side', 'orderType']
+        actions = pa.array(list(_NORDPOOL_ACTIONS))
+
+        def read(file):
+            # filtered after the scan, to keep the row positions of the file
+            table = ds.dataset(file, format="parquet").to_table(columns=columns + ['contractName'])
+            mask = pa_compute.and_(pa_compute.starts_with(table.column('contractName'), pattern='PH'),
+                                   pa_compute.is_in(table.column('action'), value_set=actions)).fill_null(False)
+            rows = np.flatnonzero(mask.to_numpy(zero_copy_only=False))
+            num_rows = table.num_rows
+            table = table.filter(mask).select(columns)
+            for col in ['updatedTime', 'expirationTime', 'deliveryStart']:
+                try:
+                    parsed = pa_compute.cast(table.column(col), pa.timestamp("ms", tz="UTC"))
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    continue  # left to pandas
+                table = table.set_column(table.schema.get_field_index(col), col, parsed)
+            for col in ['action', 'side', 'orderType']:
+                table = table.set_column(table.schema.get_field_index(col), col,
+                                         pa_compute.dictionary_encode(table.column(col)))
+            df = table.to_pandas(ignore_metadata=True)
+            df.index = rows
+            return df, num_rows
+
+        reads = deque()
+        offset = 0
+
+        def take():
+            # number the rows of the file after the rows of the files before
+            nonlocal offset
+            df, num_rows = reads.popleft().result()
+            df.index = df.index + offset
+            offset += num_rows
+            return df
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for file in parquet_files:
+                reads.append(pool.submit(read, file))
+                if len(reads) > max_workers:
+                    yield take()
+            while reads:
+                yield take()
+
     def _read_nordpool_table(self, date, marketdatapath):
         """Read and process NordPool parquet files for a specific date.
            Nordpool contains flags for full and partial execution of orders. We disregard this, as it will become apparent in our backtesting LOB traversal. After partial execution, orders are sometimes modified, deleted etc., this all stays relevant and is handled.
            We also currently still disregard FoK and IoC orders (treat them as 0 validity duration). They have all the same updateTime in their message-chain.
+           The hourly files are processed one at a time, carrying the open orders from hour to hour, so only one hour of messages is held in memory.
         """
         date_folder = date.strftime("%Y%m%d")
         folder_path = Path(marketdatapath) / date_folder
@@ -249,129 +1215,76 @@ class Data:
         if not parquet_files:
             raise FileNotFoundError(f"No parquet files found in folder: {folder_path}")
         
-        # Read and concatenate all hourly parquet files
-        dfs = []
-        for file in parquet_files:
-            df_temp = pd.read_parquet(file)
-            dfs.append(df_temp)
-        
-        df = pd.concat(dfs, ignore_index=True)
-        
-        # Convert timestamps (needed for subsequent filtering and processing)
-        df = (df
-            .assign(createdTime=lambda x: pd.to_datetime(x['createdTime'], format='ISO8601'))
-            .assign(updatedTime=lambda x: pd.to_datetime(x['updatedTime'], format='ISO8601'))
-            .assign(expirationTime=lambda x: pd.to_datetime(x['expirationTime'], format='ISO8601'))
-            .assign(deliveryStart=lambda x: pd.to_datetime(x['deliveryStart'], format='ISO8601'))
-            .assign(deliveryEnd=lambda x: pd.to_datetime(x['deliveryEnd'], format='ISO8601'))
-            )
-        
-        # Filter and prepare data
-        df = (df
-            .drop_duplicates(subset=['orderId', 'originalOrderId', 'action', 'expirationTime', 'price', 'volume'])
-            .loc[lambda x: x['contractName'].str.startswith('PH')]
-            .loc[lambda x: x['action'].isin(['UserAdded', 'UserModified', 'UserDeleted', 'SystemDeleted', 'UserHibernated'])]
-            )
-        
-        # Remove iceberg orders
-        iceberg_IDs = df.loc[df['orderType'] == 'Iceberg', 'originalOrderId'].unique()
-        df = df.loc[~df['originalOrderId'].isin(iceberg_IDs)]
-
-        # Replace letters with numbers in originalOrderId and orderId
-        unique_letters = sorted(df['originalOrderId'].astype(str).str.findall(r'[A-Za-z]').str.join('').unique())
-        # Create mapping of unique letters to numbers starting from 11
-        letter_to_num = {letter: str(i+11) for i, letter in enumerate(unique_letters)}
-        # Function to replace letters with numbers
-        def replace_letters(order_id):
-            order_id = str(order_id)
-            for letter, num in letter_to_num.items():
-                order_id = order_id.replace(letter, num)
-            return order_id
-
-        # Apply replacement to originalOrderId column
-        df['originalOrderId'] = df['originalOrderId'].apply(replace_letters)
-        df['orderId'] = df['orderId'].apply(replace_letters)
-        
-        # Rename columns to standardized format
-        df = df.rename(columns={
-            'orderId': 'order',
-            'originalOrderId': 'initial',
-            'deliveryStart': 'start',
-            'updatedTime': 'transaction',
-            'expirationTime': 'validity',
-            'volume': 'quantity',
-            'action': 'action_original'
-        })
-        
-        # Map NordPool actions to standardized codes
-        df['action'] = df['action_original'].map({
-            'UserAdded': 'A',
-            'UserModified': 'C',
-            'UserDeleted': 'D',
-            'SystemDeleted': 'D',
-            'UserHibernated': 'H'
-        })
-        
-        # Process change messages (modifications)
-        change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
-        not_added = change_messages[~(change_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-        change_messages = change_messages[~(change_messages["order"].isin(not_added["order"]))]
-        
-        change_exists = change_messages.shape[0] > 0
-        while change_exists:
-            indexer_messA_with_change = df[(df["order"].isin(change_messages["order"])) & (df["action"] == "A")] \
-                .sort_values("transaction").groupby("order").tail(1).index
-            df["df_index_copy"] = df.index
-            merged = pd.merge(change_messages, df.loc[indexer_messA_with_change], on='order')
-            df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
-            df.loc[df.index.isin(change_messages.index), "action"] = "A"
-            df.drop("df_index_copy", axis=1, inplace=True)
-            
-            change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
-            not_added = change_messages[~(change_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-            change_messages = change_messages[~(change_messages["order"].isin(not_added["order"]))]
-            change_exists = change_messages.shape[0] > 0
-        
-        # Process cancel messages (deletions)
-        cancel_messages = df[df["action"] == "D"]
-        not_added = cancel_messages[~(cancel_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-        cancel_messages = cancel_messages[~(cancel_messages["order"].isin(not_added["order"]))]
-        
-        indexer_messA_with_cancel = df[(df["order"].isin(cancel_messages["order"])) & (df["action"] == "A")] \
-            .sort_values("transaction").groupby("order").tail(1).index
-        df["df_index_copy"] = df.index
-        merged = pd.merge(cancel_messages, df.loc[indexer_messA_with_cancel], on='order')
-        df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
-        df.drop("df_index_copy", axis=1, inplace=True)
-        
-        df = df.loc[lambda x: ~(x["action"] == "D")]
-        
-        # Process hibernation messages
-        hibernated_messages = df[df["action"] == "H"]
-        not_added = hibernated_messages[~(hibernated_messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
-        hibernated_messages = hibernated_messages[~(hibernated_messages["order"].isin(not_added["order"]))]
-        
-        if not hibernated_messages.empty:
-            indexer_messA_with_hibernated = df[(df["order"].isin(hibernated_messages["order"])) & (df["action"] == "A")] \
-                .sort_values("transaction").groupby("order").tail(1).index
-            df["df_index_copy"] = df.index
-            merged = pd.merge(hibernated_messages, df.loc[indexer_messA_with_hibernated], on='order')
-            df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
-            df.drop("df_index_copy", axis=1, inplace=True)
-        
-        df = df.loc[lambda x: ~(x["action"] == "H")]
-        df = df.drop(["order", "action", "action_original"], axis=1, errors='ignore')
+        parts = []
+        open_orders = None
+        seen = np.empty(0, dtype=np.uint64)
+        iceberg_IDs = np.empty(0, dtype=np.int64)
+        for df in self._read_nordpool_hours(parquet_files):
+            # the index (the position of the message in the day's files) becomes the id of the processed orders
+            # Convert the used timestamps to epoch milliseconds (needed for subsequent filtering and processing)
+            for col in ['updatedTime', 'expirationTime', 'deliveryStart']:
+                if not isinstance(df[col].dtype, pd.DatetimeTZDtype):
+                    df[col] = pd.to_datetime(df[col], format='ISO8601')
+                df[col] = self._to_epoch_ms(df[col])
+
+            # Encode the alphanumeric originalOrderId and orderId as int64
+            df['originalOrderId'] = _encode_order_ids(df['originalOrderId'])
+            df['orderId'] = _encode_order_ids(df['orderId'])
+
+            # Drop duplicate messages, also against the previous hours (by a 64 bit hash of the message)
+            message = df[['orderId', 'originalOrderId', 'expirationTime', 'price', 'volume']].assign(
+                action=pd.Categorical(df['action'], categories=list(_NORDPOOL_ACTIONS)).codes)
+            keys = pd.util.hash_pandas_object(message, index=False).to_numpy()
+            order = np.argsort(keys, kind="stable")
+            duplicate = np.zeros(len(keys), dtype=bool)
+            duplicate[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+            if len(seen):
+                found = np.minimum(np.searchsorted(seen, keys[order]), len(seen) - 1)
+                duplicate[order] |= seen[found] == keys[order]
+            seen = np.sort(np.concatenate([seen, keys[~duplicate]]))
+
+            # Remove iceberg orders
+            iceberg_IDs = np.union1d(iceberg_IDs, df.loc[df['orderType'] == 'Iceberg', 'originalOrderId'].unique())
+            df = df.loc[~duplicate & ~df['originalOrderId'].isin(iceberg_IDs).to_numpy()]
+
+            # Rename columns to standardized format
+            df = df.rename(columns={
+                'orderId': 'order',
+                'originalOrderId': 'initial',
+                'deliveryStart': 'start',
+                'updatedTime': 'transaction',
+                'expirationTime': 'validity',
+                'volume': 'quantity',
+            })
+
+            # Map NordPool actions to standardized codes
+            df['action'] = df['action'].map(_NORDPOOL_ACTIONS)
+
+            # Turn modifications, deletions and hibernations into order versions with validity ends.
+            # A hibernation overrides a deletion of the same order. Only the open orders with messages in
+            # this hour need to be resolved again.
+            idle = None
+            if open_orders is not None:
+                touched = open_orders['order'].isin(df['order']).to_numpy()
+                idle = open_orders.loc[~touched]
+                df = pd.concat([open_orders.loc[touched], df])
+            done, open_orders = self._reconstruct_lifecycle(df, terminal_actions=("D", "H"), carry=True)
+            if idle is not None:
+                open_orders = pd.concat([idle, open_orders])
+            parts.append(done)
+
+        if open_orders is not None:
+            parts.append(open_orders.loc[~open_orders['action'].isin(["D", "H"])])
+        df = pd.concat(parts).sort_index()
+        # orders flagged as iceberg in a later hour
+        df = df.loc[~df['initial'].isin(iceberg_IDs)]
+        df = df.drop(["order", "action", "orderType"], axis=1)
 
         # Filter out orders where validity time is not after transaction time; Sometimes orders are added and deleted at the same time.
-        df = df[df['validity'] > df['transaction']]
-        
-        # Convert timestamps to string format
-        df["start"] = df["start"].dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        df["transaction"] = df["transaction"].dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-        df["validity"] = df["validity"].dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
+        df = df[(df['validity'] > df['transaction']).fillna(False)]
 
         # rename side to all uppercase
-        df['side'] = df['side'].str.upper()
+        df['side'] = df['side'].astype(str).str.upper()
         
         # Select and order final columns
         df = df[['initial', 'side', 'start', 'transaction', 'validity', 'price', 'quantity']]
@@ -379,14 +1292,120 @@ class Data:
         return df
 
 
+    def _read_day(self, date, marketdatapath, market_type):
+        """
+        Read and process the raw market data of a single day with the reader matching market_type.
+        The returned frame is sorted by transaction (stable, so ties keep the order of the reader).
+        """
+        if market_type == "EPEX":
+            if date.year == 2020:
+                df = self._read_id_table_2020(date, marketdatapath)
+            elif date.year >= 2021:
+                df = self._read_id_table_2021(date, marketdatapath)
+            else:
+                raise ValueError("Error: Year not >= 2020")
+        elif market_type == "NordPool":
+            df = self._read_nordpool_table(date, marketdatapath)
+        else:
+            raise ValueError(f"Unknown market_type: {market_type}")
+        return df.sort_values(by='transaction', kind='stable')
+
+    def _raw_day_files(self, date, marketdatapath, market_type):
+        """
+        Return the paths of the raw market data files read for a single day.
+        """
+        if market_type == "EPEX":
+            folder = f"{marketdatapath}/{date.strftime('%Y')}/{date.strftime('%m')}"
+            prefix = "Continuous_Orders_DE_" if date.year == 2020 else "Continuous_Orders-DE-"
+            datestr = prefix + date.strftime("%Y%m%d")
+            files = [f"{folder}/{i}" for i in sorted(os.listdir(folder)) if datestr in i]
+        elif market_type == "NordPool":
+            files = [str(f) for f in sorted((Path(marketdatapath) / date.strftime("%Y%m%d")).glob("NordPool_*.parquet"))]
+        else:
+            raise ValueError(f"Unknown market_type: {market_type}")
+        if not files:
+            raise FileNotFoundError(f"No raw {market_type} data found for {date.date()} in {marketdatapath}")
+        return files
+
+    def _day_window(self, df1, df2, start_ms, end_ms):
+        """
+        Select the orders with a transaction in [start_ms, end_ms) from two frames sorted by transaction, in
+        transaction order. Each frame is sliced by binary search and the two slices are merged, with ties
+        keeping the orders of df1 first (as a stable sort of both frames would).
+        """
+        parts = []
+        for df in (df1, df2):
+            if df.empty:
+                continue
+            lo, hi = np.searchsorted(df['transaction'].to_numpy(dtype=np.int64), [start_ms, end_ms])
+            parts.append(df.iloc[lo:hi])
+        if len(parts) < 2:
+            return parts[0] if parts else df1
+
+        a, b = parts
+        ta, tb = a['transaction'].to_numpy(dtype=np.int64), b['transaction'].to_numpy(dtype=np.int64)
+        # position of every row in the merged order
+        order = np.empty(len(a) + len(b), dtype=np.int64)
+        order[np.arange(len(a)) + np.searchsorted(tb, ta, side='left')] = np.arange(len(a))
+        order[np.arange(len(b)) + np.searchsorted(ta, tb, side='right')] = np.arange(len(a), len(a) + len(b))
+        return pd.concat([a, b]).iloc[order]
+
+    def _processed_day(self, df1, df2, save_date):
+        """
+        Merge the processed tables of a day and its following day (both sorted by transaction, see _read_day),
+        and return all orders with a transaction on save_date, as they are saved by _save_day.
+        """
+        # Select the orders with a transaction on save_date (timestamps are epoch milliseconds)
+        day_start = pd.Timestamp(save_date).value // 1_000_000
+        group = self._day_window(df1, df2, day_start, day_start + 86_400_000)
+
+        # round price to 2 decimals and quantity to 1 decimal
+        return group.assign(price=group['price'].round(2), quantity=group['quantity'].round(1))
+
+    def _save_day(self, df1, df2, save_date, savepath, output_format="csv"):
+        """
+        Save all orders with a transaction on save_date (see _processed_day) as a zipped CSV or Parquet file.
+        Returns the path of the written file.
+        """
+        group = self._processed_day(df1, df2, save_date)
+
+        if output_format == "parquet":
+            daily_filename = f"{savepath}orderbook_{save_date}.parquet"
+            self._write_parquet(group.rename_axis("id").reset_index(), daily_filename)
+            return daily_filename
+        # timestamps are only rendered as strings for the CSV files
+        group = group.assign(start=self._format_epoch_ms(group['start'], unit="s"),
+                             transaction=self._format_epoch_ms(group['transaction'], unit="ms"),
+                             validity=self._format_epoch_ms(group['validity'], unit="ms"))
+        daily_filename = f"{savepath}orderbook_{save_date}.csv"
+        compression_options = dict(method='zip', archive_name=Path(daily_filename).name)
+        group.fillna("").to_csv(f'{daily_filename}.zip', compression=compression_options)
+        return f'{daily_filename}.zip'
+
     def parse_market_data(self, start_date_str: str, end_date_str: str, marketdatapath: str, 
-                        savepath: str, market_type: str, verbose: bool = True):
+                        savepath: str, market_type: str, verbose: bool = True, workers: int = 1,
+                        overwrite: bool = False, output_format: str = "csv"):
         """
-        Parse market data between two dates and save processed zipped CSV files.
+        Parse market data between two dates and save processed zipped CSV (or Parquet) files.
         
         Processes raw order book data from EPEX or NordPool markets and converts them into 
         standardized sorted CSV files for each day in UTC time format. Handles order lifecycle 
         events (additions, modifications, cancellations) and reconstructs order validity periods.
+
+        With workers > 1, the raw days are read and the daily files are written in a pool of worker processes.
+        Each raw day is read once and handed to the two daily files it contributes to. The written files are
+        identical to the ones of the sequential run.
+
+        Every written file is recorded in a manifest (bitepy_manifest.json) in savepath, together with the sizes
+        and mtimes of the raw files it was built from and its checksum. Days whose file is recorded, unmodified,
+        and built from unchanged raw files are skipped, so an interrupted run resumes where it stopped and
+        reruns only rebuild days whose raw input changed.
+
+        With output_format="parquet", days are saved as orderbook_YYYY-MM-DD.parquet instead (requires pyarrow).
+        Timestamps are stored as int64 milliseconds since epoch (UTC, null for no expiry), the side is dictionary
+        encoded, and every delivery start gets its own row group. The files are smaller and much faster to write
+        and load than zipped CSV, and can be passed to create_bins_from_csv and, after pd.read_parquet, to
+        Simulation.add_df_to_orderqueue.
         
         Args:
             start_date_str (str): Start date in format "YYYY-MM-DD"
@@ -395,6 +1414,9 @@ class Data:
             savepath (str): Directory where processed CSV files will be saved
             market_type (str): "EPEX" or "NordPool"
             verbose (bool, optional): Print progress messages. Defaults to True.
+            workers (int, optional): Number of worker processes. Defaults to 1 (sequential).
+            overwrite (bool, optional): Rebuild all days, even if they are up to date. Defaults to False.
+            output_format (str, optional): "csv" (zipped CSV) or "parquet". Defaults to "csv".
         """
         
         if not os.path.exists(savepath):
@@ -407,100 +1429,544 @@ class Data:
             raise ValueError("Error: Start date is after end date.")
         if market_type == "EPEX" and start_date.year < 2020:
             raise ValueError("Error: Years before 2020 are not supported.")
+        if workers < 1:
+            raise ValueError("Error: workers must be >= 1.")
+        if output_format not in ("csv", "parquet"):
+            raise ValueError(f"Unknown output_format: {output_format}")
+        extension = ".csv.zip" if output_format == "csv" else ".parquet"
         
         dates = pd.date_range(start_date, end_date, freq="D")
+
+        # raw files each day's output is built from (the day itself and, within the range, the next day)
+        manifest = _Manifest(savepath)
+        raw_files = [self._raw_day_files(dt, marketdatapath, market_type) for dt in dates]
+        sources = [raw_files[i] + (raw_files[i + 1] if i + 1 < len(dates) else []) for i in range(len(dates))]
+        build = [overwrite or not manifest.is_current(f"{savepath}orderbook_{dt.date()}{extension}", sources[i])
+                 for i, dt in enumerate(dates)]
+        if verbose and not all(build):
+            print(f"Skipping {len(dates) - sum(build)} of {len(dates)} days that are up to date.")
+
+        if workers > 1:
+            self._parse_market_data_parallel(dates, build, sources, manifest, marketdatapath, savepath,
+                                             market_type, verbose, workers, output_format)
+            print("\nWriting CSV data completed.")
+            return
+
         df1 = pd.DataFrame()
         df2 = pd.DataFrame()
         
         with tqdm(total=len(dates), desc="Loading and saving CSV data", ncols=100, disable=not verbose) as pbar:
-            for dt1 in dates:
-                pbar.set_description(f"Currently loading and saving date {str(dt1.date())} ... ")
+            for i, dt1 in enumerate(dates):
                 df1 = df2
                 df2 = pd.DataFrame()
+                if not build[i]:
+                    pbar.update(1)
+                    continue
+                pbar.set_description(f"Currently loading and saving date {str(dt1.date())} ... ")
                 dt2 = dt1 + pd.Timedelta(days=1)
                 
                 # Read current day data
                 if df1.empty:
-                    if market_type == "EPEX":
-                        if dt1.year == 2020:
-                            df1 = self._read_id_table_2020(dt1, marketdatapath)
-                        elif dt1.year >= 2021:
-                            df1 = self._read_id_table_2021(dt1, marketdatapath)
-                        else:
-                            raise ValueError("Error: Year not >= 2020")
-                    elif market_type == "NordPool":
-                        df1 = self._read_nordpool_table(dt1, marketdatapath)
-                    else:
-                        raise ValueError(f"Unknown market_type: {market_type}")
+                    df1 = self._read_day(dt1, marketdatapath, market_type)
                 
                 # Read next day data (captures orders with transaction today, delivery tomorrow)
                 if dt2 <= end_date:
-                    if market_type == "EPEX":
-                        if dt2.year == 2020:
-                            df2 = self._read_id_table_2020(dt2, marketdatapath)
-                        elif dt2.year >= 2021:
-                            df2 = self._read_id_table_2021(dt2, marketdatapath)
-                        else:
-                            raise ValueError("Error: Year not >= 2020")
-                    elif market_type == "NordPool":
-                        df2 = self._read_nordpool_table(dt2, marketdatapath)
-                    else:
-                        raise ValueError(f"Unknown market_type: {market_type}")
-                
-                # Combine and filter by transaction date
-                df = pd.concat([df1, df2])
-                df = df.sort_values(by='transaction')
-                df['transaction_date'] = pd.to_datetime(df['transaction']).dt.date
-                grouped = df.groupby('transaction_date')
-
-                # round price to 2 decimals and quantity to 1 decimal
-                df['price'] = df['price'].round(2)
-                df['quantity'] = df['quantity'].round(1)
+                    df2 = self._read_day(dt2, marketdatapath, market_type)
                 
-                save_date = dt1.date()
-                group = grouped.get_group(save_date)
-                daily_filename = f"{savepath}orderbook_{save_date}.csv"
-                compression_options = dict(method='zip', archive_name=Path(daily_filename).name)
-                group.drop(columns='transaction_date').sort_values(by='transaction').fillna("").to_csv(
-                    f'{daily_filename}.zip', compression=compression_options)
+                manifest.record(self._save_day(df1, df2, dt1.date(), savepath, output_format), sources[i])
                 pbar.update(1)
         
         print("\nWriting CSV data completed.")
 
-    def create_bins_from_csv(self, csv_list: list, save_path: str, verbose: bool = True):
+    def stream_market_data(self, start_date_str: str, end_date_str: str, marketdatapath: str, market_type: str,
+                           savepath: str = None, output_format: str = "csv"):
         """
-        Convert zipped CSV files of pre-processed order book data into binary files.
+        Parse market data between two dates and yield the processed orders of every day in memory.
+
+        The raw days are read and reconstructed as in parse_market_data, and every day's orders are yielded as the
+        arrays expected by Simulation_cpp.addOrderQueueFromArrays (see Simulation.run_from_raw), without any
+        intermediate files. The orders are the same as the ones of the file parse_market_data writes for the day.
+        Each raw day is read once, only the current and the next raw day are held in memory.
+
+        Args:
+            start_date_str (str): Start date in format "YYYY-MM-DD"
+            end_date_str (str): End date in format "YYYY-MM-DD"
+            marketdatapath (str): Path to market data folder with yearly/monthly subfolders
+            market_type (str): "EPEX" or "NordPool"
+            savepath (str, optional): If given, the processed days are also saved there, as by parse_market_data. Defaults to None.
+            output_format (str, optional): "csv" (zipped CSV) or "parquet", the format of the saved days. Defaults to "csv".
+
+        Yields:
+            tuple: The day (pd.Timestamp) and a tuple of the order arrays (ids, initial ids, sides, delivery starts, transaction times, validity times, prices and quantities).
+        """
+        start_date = pd.Timestamp(start_date_str)
+        end_date = pd.Timestamp(end_date_str)
+        if start_date > end_date:
+            raise ValueError("Error: Start date is after end date.")
+        if market_type == "EPEX" and start_date.year < 2020:
+            raise ValueError("Error: Years before 2020 are not supported.")
+        if output_format not in ("csv", "parquet"):
+            raise ValueError(f"Unknown output_format: {output_format}")
+        if savepath is not None:
+            savepath = os.path.join(savepath, "")
+            if not os.path.exists(savepath):
+                os.makedirs(savepath)
+            manifest = _Manifest(savepath)
+
+        df2 = pd.DataFrame()
+        for dt1 in pd.date_range(start_date, end_date, freq="D"):
+            dt2 = dt1 + pd.Timedelta(days=1)
+            df1 = df2 if dt1 > start_date else self._read_day(dt1, marketdatapath, market_type)
+            # Read next day data (captures orders with transaction today, delivery tomorrow)
+            df2 = self._read_day(dt2, marketdatapath, market_type) if dt2 <= end_date else pd.DataFrame()
+
+            if savepath is not None:
+                sources = self._raw_day_files(dt1, marketdatapath, market_type)
+                if dt2 <= end_date:
+                    sources += self._raw_day_files(dt2, marketdatapath, market_type)
+                manifest.record(self._save_day(df1, df2, dt1.date(), savepath, output_format), sources)
+            group = self._processed_day(df1, df2, dt1.date())
+            del df1
+            yield dt1, _order_arrays(group.rename_axis("id").reset_index())
+
+    def _parse_market_data_parallel(self, dates, build, sources, manifest, marketdatapath, savepath, market_type,
+                                    verbose, workers, output_format):
+        """
+        Pipeline the daily reads and window writes of parse_market_data over a process pool.
+
+        Reads run at most `workers` windows ahead of the window being written, and a raw day is dropped from
+        memory as soon as all of its windows are submitted, so memory stays bounded on long date ranges.
+        """
+        windows = [i for i in range(len(dates)) if build[i]]
+        with ProcessPoolExecutor(max_workers=workers) as pool, \
+                tqdm(total=len(dates), desc=f"Loading and saving CSV data ({workers} workers)", ncols=100,
+                     disable=not verbose) as pbar:
+            pbar.update(len(dates) - len(windows))
+            reads = {}
+            writes = deque()
+            next_window = 0
+            for k, i in enumerate(windows):
+                while next_window < len(windows) and next_window <= k + workers:
+                    j = windows[next_window]
+                    for day in (j, j + 1):
+                        if day < len(dates) and day not in reads:
+                            reads[day] = pool.submit(self._read_day, dates[day], marketdatapath, market_type)
+                    next_window += 1
+
+                df1 = reads.pop(i).result()
+                df2 = reads[i + 1].result() if i + 1 < len(dates) else pd.DataFrame()
+                if i + 1 < len(dates) and not build[i + 1]:
+                    del reads[i + 1]
+                writes.append((pool.submit(self._save_day, df1, df2, dates[i].date(), savepath, output_format), sources[i]))
+                del df1, df2
+
+                while writes and (writes[0][0].done() or len(writes) > workers):
+                    future, source = writes.popleft()
+                    manifest.record(future.result(), source)
+                    pbar.update(1)
+
+            while writes:
+                future, source = writes.popleft()
+                manifest.record(future.result(), source)
+                pbar.update(1)
+
+    def _write_bin(self, csv_file_path, bin_file_path, _sim=None, bin_format=1, carry_file_path=None, filters=None,
+                   compaction=None, checkpoint_minutes=None):
+        """
+        Load a zipped CSV or Parquet file of pre-processed order book data and write it as a binary file. With
+        carry_file_path, the carry-over slice of the day (see _carry_over_mask) is written there as well. filters
+        are the (start_ms, end_ms, valid_from_ms) arguments of _filter_orders, and compaction the (price_band,
+        max_depth, price_tick) arguments of _compact_orders. With checkpoint_minutes (bin_format=2 only), the order
+        book checkpoints of the binary are written as well (see _Checkpoints). Returns the number of loaded orders,
+        the number of orders dropped by the filters and the compaction, and the catalog summaries of the written files.
+        """
+        arrays = self._load_orderbook(csv_file_path)
+        total = len(arrays[0])
+        if filters is not None:
+            arrays = _filter_orders(arrays, *filters)
+        if compaction is not None:
+            arrays, _ = _compact_orders(arrays, *compaction)
+        outputs = [(bin_file_path, arrays)]
+        if carry_file_path is not None:
+            carry = _carry_over_mask(_orderbook_date(csv_file_path), arrays[3])
+            outputs.append((carry_file_path, tuple(column[carry] for column in arrays)))
+
+        summaries = {file_path: _order_summary(columns) for file_path, columns in outputs}
+        if bin_format == 2:
+            for file_path, columns in outputs:
+                _write_bin_v2(file_path, columns)
+            if checkpoint_minutes is not None:
+                _Checkpoints.write(bin_file_path, arrays, int(checkpoint_minutes * 60_000))
+            elif os.path.exists(_Checkpoints.sidecar(bin_file_path)):
+                os.remove(_Checkpoints.sidecar(bin_file_path))  # stale checkpoints of an earlier build
+            return total, total - len(arrays[0]), summaries
+        if _sim is None:
+            _sim = Simulation_cpp()
+        for file_path, (ids, initials, sides, starts, transactions, validities, prices, quantities) in outputs:
+            _sim.writeOrderBinFromArrays(
+                file_path,
+                ids,
+                initials,
+                sides,
+                starts,
+                transactions,
+                validities,
+                prices,
+                quantities,
+            )
+        return total, total - len(arrays[0]), summaries
+
+    def create_bins_from_csv(self, csv_list: list, save_path: str, verbose: bool = True, workers: int = 1,
+                             overwrite: bool = False, bin_format: int = 1, carry_over: bool = True,
+                             delivery_start: pd.Timestamp = None, delivery_end: pd.Timestamp = None,
+                             valid_from: pd.Timestamp = None, price_band: float = None, max_depth: float = None,
+                             price_tick: float = None, checkpoint_minutes: float = None):
+        """
+        Convert zipped CSV (or Parquet) files of pre-processed order book data into binary files.
 
         This method sequentially loads each previously generated zipped CSV file, converts it to a binary format using the C++ simulation
         extension, and saves the binary file in the specified directory. Binary files allow for much (10x) quicker loading
-        of the data at runtime.
+        of the data at runtime. With workers > 1, the files are converted in a pool of worker processes.
+
+        As in parse_market_data, written binaries are recorded in a manifest in save_path, and binaries that are
+        up to date with their CSV file are skipped. The written binaries are also recorded in the catalog of save_path
+        (see catalog).
+
+        With bin_format=2, the binaries are written in the compressed format (requires pyarrow): timestamps, ids and
+        prices are delta-encoded as varints, with prices in cents and quantities in tenths as in the engine, and
+        compressed in blocks with lz4. They are several times smaller, and Simulation.add_bin_to_orderqueue detects
+        the format of a binary file automatically. They are decoded in Python and their timestamps parsed by the
+        engine, so they load slower than the engine's binaries, which the engine reads natively.
+
+        With carry_over, a carry-over slice orderbook_YYYY-MM-DD.carry.bin is written next to every binary. It holds
+        only the orders of the day for products delivered from the next (Berlin) day on, and Simulation.run loads
+        it instead of the full binary of the day before the simulation start.
+
+        The binaries can be restricted to the orders needed for a narrow simulation: delivery_start and delivery_end
+        keep only the products with a delivery start in [delivery_start, delivery_end], and valid_from drops orders
+        that expired before it (e.g. the trading start).
+
+        For fast exploratory runs, the binaries can be compacted (lossy): price_band drops orders placed more than
+        price_band €/MWh behind the best price on their side of their product's book, max_depth drops orders placed
+        behind more than max_depth MWh of better priced volume (orders the storage can never reach if max_depth
+        is at least inject_max + withdraw_max), and price_tick rounds prices to a coarser tick (buys down, sells
+        up). Dropped orders are reported per file. benchmarks/bench_compaction.py measures the reward deviation
+        against the exact binaries.
+
+        With checkpoint_minutes (requires bin_format=2), a sidecar orderbook_YYYY-MM-DD.ckpt with the orders resting in
+        the book every checkpoint_minutes is written next to every binary. Simulation.replay_to uses it to rebuild the
+        book at any time of the day from the last checkpoint, instead of replaying the day from midnight.
 
         Args:
-            csv_list (list): List of file paths to the zipped CSV files containing pre-processed order book data.
+            csv_list (list): List of file paths to the zipped CSV (.csv.zip) or Parquet (.parquet) files containing pre-processed order book data.
             save_path (str): Directory path where the binary files should be saved. The binary files will use the same base name as the CSV files.
             verbose (bool, optional): If True, print progress messages. Defaults to True.
+            workers (int, optional): Number of worker processes. Defaults to 1 (sequential).
+            overwrite (bool, optional): Rebuild all binaries, even if they are up to date. Defaults to False.
+            bin_format (int, optional): Binary format version, 1 (engine records) or 2 (compressed). Defaults to 1.
+            carry_over (bool, optional): Also write the carry-over slices. Defaults to True.
+            delivery_start (pd.Timestamp, optional): Earliest delivery start of the kept products. Must be timezone aware. Defaults to None (no filter).
+            delivery_end (pd.Timestamp, optional): Latest delivery start of the kept products. Must be timezone aware. Defaults to None (no filter).
+            valid_from (pd.Timestamp, optional): Drop orders that are no longer valid at this time. Must be timezone aware. Defaults to None (no filter).
+            price_band (float, optional): Drop orders placed more than this (€/MWh) behind the best price. Defaults to None (no compaction).
+            max_depth (float, optional): Drop orders placed behind more than this volume (MWh) at better prices. Defaults to None (no compaction).
+            price_tick (float, optional): Round prices to this tick (€/MWh). Defaults to None (no rounding).
+            checkpoint_minutes (float, optional): Interval of the order book checkpoints in minutes. Defaults to None (no checkpoints).
+
+        Returns:
+            pd.DataFrame: The number of orders and of dropped orders (by the filters and compaction) of every written binary.
         """
+        if workers < 1:
+            raise ValueError("Error: workers must be >= 1.")
+        if bin_format not in [1, 2]:
+            raise ValueError("Error: bin_format must be 1 or 2.")
+        filters = []
+        for timestamp in [delivery_start, delivery_end, valid_from]:
+            if timestamp is not None and timestamp.tzinfo is None:
+                raise ValueError("Error: delivery_start, delivery_end and valid_from must be timezone aware.")
+            filters.append(None if timestamp is None else timestamp.value // 1_000_000)
+        filters = filters if any(f is not None for f in filters) else None
+        compaction = [price_band, max_depth, price_tick]
+        for value in compaction:
+            if value is not None and value <= 0:
+                raise ValueError("Error: price_band, max_depth and price_tick must be positive.")
+        compaction = compaction if any(c is not None for c in compaction) else None
+        if checkpoint_minutes is not None and (bin_format != 2 or checkpoint_minutes <= 0):
+            raise ValueError("Error: checkpoint_minutes must be positive and requires bin_format=2.")
+        options = None if filters is None and compaction is None else {"filters": filters, "compaction": compaction}
+        if checkpoint_minutes is not None:
+            options = {**(options or {}), "checkpoints": checkpoint_minutes}
         if not os.path.exists(save_path):
             os.makedirs(save_path)
 
-        _sim = Simulation_cpp()
+        manifest = _Manifest(save_path)
+        catalog = _Catalog(save_path)
+        jobs = []
+        for csv_file_path in csv_list:
+            filename = os.path.basename(csv_file_path)
+            bin_file_path = os.path.join(save_path, filename.replace(".csv.zip", ".bin").replace(".parquet", ".bin"))
+            carry_file_path = _carry_path(bin_file_path) if carry_over else None
+            outputs = [bin_file_path] + ([carry_file_path] if carry_over else [])
+            if (overwrite or not all(manifest.is_current(path, [csv_file_path], options) for path in outputs)
+                    or _bin_version(bin_file_path) != bin_format
+                    or (checkpoint_minutes is not None and not os.path.exists(_Checkpoints.sidecar(bin_file_path)))):
+                jobs.append((csv_file_path, bin_file_path, carry_file_path))
+        if verbose and len(jobs) < len(csv_list):
+            print(f"Skipping {len(csv_list) - len(jobs)} of {len(csv_list)} binaries that are up to date.")
+
+        report = []
         with tqdm(total=len(csv_list), desc="Writing Binaries", ncols=100, disable=not verbose) as pbar:
-            for csv_file_path in csv_list:
-                filename = os.path.basename(csv_file_path)
-                bin_file_path = os.path.join(save_path, filename.replace(".csv.zip", ".bin"))
-                pbar.set_description(f"Currently saving binary {bin_file_path.split('/')[-1]} ... ")
-                ids, initials, sides, starts, transactions, validities, prices, quantities = self._load_csv(csv_file_path)
-                _sim.writeOrderBinFromPandas(
-                    bin_file_path,
-                    ids,
-                    initials,
-                    sides,
-                    starts,
-                    transactions,
-                    validities,
-                    prices,
-                    quantities,
-                )
-                pbar.update(1)
+            pbar.update(len(csv_list) - len(jobs))
+            if workers > 1:
+                pbar.set_description(f"Writing Binaries ({workers} workers)")
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = {pool.submit(self._write_bin, csv_file_path, bin_file_path, None, bin_format,
+                                           carry_file_path, filters, compaction, checkpoint_minutes):
+                                   (csv_file_path, bin_file_path, carry_file_path)
+                               for csv_file_path, bin_file_path, carry_file_path in jobs}
+                    for future in as_completed(futures):
+                        csv_file_path, bin_file_path, carry_file_path = futures[future]
+                        total, dropped, summaries = future.result()
+                        report.append((bin_file_path, total, dropped))
+                        for path, summary in summaries.items():
+                            manifest.record(path, [csv_file_path], options)
+                            catalog.record(path, summary)
+                        pbar.update(1)
+            else:
+                _sim = Simulation_cpp()
+                for csv_file_path, bin_file_path, carry_file_path in jobs:
+                    pbar.set_description(f"Currently saving binary {bin_file_path.split('/')[-1]} ... ")
+                    total, dropped, summaries = self._write_bin(csv_file_path, bin_file_path, _sim, bin_format,
+                                                                carry_file_path, filters, compaction,
+                                                                checkpoint_minutes)
+                    report.append((bin_file_path, total, dropped))
+                    for path, summary in summaries.items():
+                        manifest.record(path, [csv_file_path], options)
+                        catalog.record(path, summary)
+                    pbar.update(1)
+
+        report = pd.DataFrame(report, columns=["file", "orders", "dropped"]).sort_values("file", ignore_index=True)
+        if verbose and compaction is not None:
+            print(f"Dropped {report['dropped'].sum()} of {report['orders'].sum()} orders.")
+        print("\nWriting Binaries completed.")
+        return report
+
+    def create_order_store(self, file_list: list, save_path: str, verbose: bool = True, overwrite: bool = False):
+        """
+        Consolidate zipped CSV (or Parquet) files of pre-processed order book data into one order store per year.
+
+        The files must be named as written by parse_market_data (orderbook_YYYY-MM-DD.csv.zip or .parquet). The
+        days of each year are written to a single file orderbook_YYYY.store in save_path, with an index of the byte
+        offsets of every day and delivery hour. Simulation.run reads the stores by memory mapping, and only loads
+        the days and products of the simulation period.
+
+        As in create_bins_from_csv, written stores are recorded in a manifest in save_path, and stores that are up to
+        date with their files are skipped.
+
+        Args:
+            file_list (list): List of file paths to the zipped CSV (.csv.zip) or Parquet (.parquet) files containing pre-processed order book data.
+            save_path (str): Directory path where the order stores should be saved.
+            verbose (bool, optional): If True, print progress messages. Defaults to True.
+            overwrite (bool, optional): Rebuild all stores, even if they are up to date. Defaults to False.
+
+        Returns:
+            list: The paths of the order stores.
+        """
+        years = {}
+        for file_path in file_list:
+            day = _orderbook_date(file_path)
+            years.setdefault(day.year, []).append((day, file_path))
+        if not os.path.exists(save_path):
+            os.makedirs(save_path)
+
+        manifest = _Manifest(save_path)
+        store_paths = []
+        with tqdm(total=len(file_list), desc="Writing Order Stores", ncols=100, disable=not verbose) as pbar:
+            for year, files in sorted(years.items()):
+                files.sort()
+                store_path = os.path.join(save_path, f"orderbook_{year}.store")
+                store_paths.append(store_path)
+                sources = [file_path for _, file_path in files]
+                if not overwrite and manifest.is_current(store_path, sources):
+                    pbar.update(len(files))
+                    continue
+
+                def days():
+                    for day, file_path in files:
+                        pbar.set_description(f"Currently storing {os.path.basename(file_path)} ... ")
+                        yield np.datetime64(day, "D"), self._load_orderbook(file_path)
+                        pbar.update(1)
+
+                _OrderStore.write(store_path, days())
+                manifest.record(store_path, sources)
+
+        if verbose: print("\nWriting Order Stores completed.")
+        return store_paths
+
+    def catalog(self, bin_path: str):
+        """
+        Scan a directory of binary order files and return its catalog.
+
+        The catalog is cached in a sidecar file in bin_path, and only new or changed files are scanned again. Files
+        written by create_bins_from_csv are recorded with a summary of their orders when they are written, and
+        compressed binaries (bin_format=2) are summarized when scanned. Binaries in the engine's format that were
+        written elsewhere are listed without a summary. Simulation.run checks its data files against the catalog
+        before it starts (see Simulation.preflight).
+
+        Args:
+            bin_path (str): The directory containing the binary order files.
+
+        Returns:
+            pd.DataFrame: One row per file, with its date, whether it is a carry-over slice, binary format, size, SHA-256 checksum, number of orders, first and last transaction time, number of delivery products, first and last delivery start, and status ('ok', 'modified' if it changed since it was written, or 'unreadable').
+        """
+        return _Catalog(bin_path).scan()
+
+    def generate_synthetic_orders(self, date, orders_per_second: float = 5.0, products: int = 24,
+                                  product_minutes: int = 60, trading_hours: float = 24.0,
+                                  gate_closure_minutes: float = 5.0, activity_hours: float = 3.0,
+                                  price_level: float = 80.0, price_volatility: float = 5.0, spread: float = 1.0,
+                                  price_depth: float = 5.0, aggressive_ratio: float = 0.05,
+                                  quantity_median: float = 2.0, cancel_ratio: float = 0.7,
+                                  validity_median: float = 60.0, validity_sigma: float = 1.5, seed=None):
+        """
+        Generate a synthetic day of order flow in the processed order book format, for load and stress tests.
+
+        The orders are spread over the products delivered every product_minutes from the start of the (UTC) day on.
+        Each product is traded from trading_hours until gate_closure_minutes before its delivery start, and its order
+        rate grows exponentially towards gate closure (time constant activity_hours). Prices follow a random walk per
+        product around price_level: buy orders are placed below and sell orders above the mid price, a share
+        aggressive_ratio of the orders crosses it. A share cancel_ratio of the orders is cancelled after a lognormal
+        lifetime, the others stay valid (no expiry).
+
+        Args:
+            date (str or pd.Timestamp): The (UTC) day of the order transactions.
+            orders_per_second (float, optional): Average number of orders per second over the day. Defaults to 5.0.
+            products (int, optional): Number of delivery products. Defaults to 24.
+            product_minutes (int, optional): Delivery length of a product in minutes. Defaults to 60.
+            trading_hours (float, optional): Hours before the delivery start at which trading opens. Defaults to 24.0.
+            gate_closure_minutes (float, optional): Minutes before the delivery start at which trading closes. Defaults to 5.0.
+            activity_hours (float, optional): Time constant of the order rate towards gate closure in hours. Defaults to 3.0.
+            price_level (float, optional): Initial mid price of all products in €/MWh. Defaults to 80.0.
+            price_volatility (float, optional): Volatility of the mid prices in €/MWh per square root hour. Defaults to 5.0.
+            spread (float, optional): Bid-ask spread around the mid price in €/MWh. Defaults to 1.0.
+            price_depth (float, optional): Mean distance of the orders behind the spread in €/MWh. Defaults to 5.0.
+            aggressive_ratio (float, optional): Share of the orders priced across the mid price. Defaults to 0.05.
+            quantity_median (float, optional): Median order quantity in MWh. Defaults to 2.0.
+            cancel_ratio (float, optional): Share of the orders that are cancelled. Defaults to 0.7.
+            validity_median (float, optional): Median lifetime of the cancelled orders in seconds. Defaults to 60.0.
+            validity_sigma (float, optional): Log standard deviation of the lifetimes. Defaults to 1.5.
+            seed (optional): Seed of the random generator (see numpy.random.default_rng). Defaults to None.
+
+        Returns:
+            pd.DataFrame: The orders sorted by transaction time, indexed by id, with the columns of the processed order book files (timestamps as epoch milliseconds).
+        """
+        if orders_per_second <= 0 or products < 1 or product_minutes <= 0:
+            raise ValueError("Error: orders_per_second, products and product_minutes must be positive.")
+        if not 0 <= cancel_ratio <= 1 or not 0 <= aggressive_ratio <= 1:
+            raise ValueError("Error: cancel_ratio and aggressive_ratio must be between 0 and 1.")
+        rng = np.random.default_rng(seed)
+        day = pd.Timestamp(date)
+        day = day.tz_convert("UTC") if day.tzinfo is not None else day.tz_localize("UTC")
+        day_ms = day.normalize().value // 1_000_000
+        tau = activity_hours * 3_600_000
+
+        # trading window of every product within the day, and its expected share of the orders
+        starts = day_ms + np.arange(1, products + 1, dtype=np.int64) * int(product_minutes * 60_000)
+        opens = np.maximum(starts - int(trading_hours * 3_600_000), day_ms)
+        closes = np.minimum(starts - int(gate_closure_minutes * 60_000), day_ms + 86_400_000)
+        tradable = closes > opens
+        if not tradable.any():
+            raise ValueError("Error: No product can be traded within the day.")
+        starts, opens, closes = starts[tradable], opens[tradable], closes[tradable]
+        low, high = np.exp(-(starts - opens) / tau), np.exp(-(starts - closes) / tau)
+        counts = rng.multinomial(rng.poisson(orders_per_second * 86_400), (high - low) / (high - low).sum())
+
+        # transaction times by inverse sampling of the exponentially growing order rate, and a random walk of the
+        # mid price per product (filled in place, to generate days of tens of millions of orders)
+        n = counts.sum()
+        product = np.repeat(np.arange(len(starts), dtype=np.int32), counts)
+        transaction, price = np.empty(n, dtype=np.int64), np.empty(n)
+        for i, (first, last) in enumerate(zip(np.cumsum(counts) - counts, np.cumsum(counts))):
+            t = np.sort(starts[i] + tau * np.log(low[i] + rng.random(last - first) * (high[i] - low[i])))
+            transaction[first:last] = t
+            steps = rng.standard_normal(last - first) * price_volatility * np.sqrt(np.diff(t, prepend=t[:1]) / 3_600_000)
+            price[first:last] = price_level + np.cumsum(steps)
+        order = np.argsort(transaction, kind="stable")
+        transaction, price, start = transaction[order], price[order], starts[product[order]]
+        del order, product
+
+        # orders are placed behind the spread on their side, aggressive ones across the mid price
+        buy = rng.random(n) < 0.5
+        offset = spread / 2 + rng.exponential(price_depth, n)
+        aggressive = rng.random(n) < aggressive_ratio
+        offset[aggressive] = rng.exponential(spread, aggressive.sum())
+        price += np.where(buy == aggressive, 1, -1) * offset
+        del offset, aggressive
+        quantity = np.maximum(np.round(rng.lognormal(np.log(quantity_median), 1.0, n), 1), 0.1)
+        validity = transaction + np.maximum(np.ceil(rng.lognormal(np.log(validity_median * 1000), validity_sigma, n)), 1).astype(np.int64)
+
+        # ids are unique across days (at most 10**9 orders per day)
+        ids = day_ms // 86_400_000 * 10**9 + np.arange(n, dtype=np.int64)
+        no_mask = np.zeros(n, dtype=bool)
+        return pd.DataFrame({
+            "initial": ids,
+            "side": pd.Categorical.from_codes((~buy).astype(np.int8), ["BUY", "SELL"]),
+            "start": pd.arrays.IntegerArray(start, no_mask),
+            "transaction": pd.arrays.IntegerArray(transaction, no_mask),
+            "validity": pd.arrays.IntegerArray(validity, rng.random(n) >= cancel_ratio),
+            "price": np.round(price, 2, out=price),
+            "quantity": quantity,
+        }, index=pd.Index(ids, name="id"), copy=False)
+
+    def write_synthetic_days(self, start_date_str: str, end_date_str: str, savepath: str, output_format: str = "csv",
+                             bin_format: int = 1, verbose: bool = True, seed=None, **kwargs):
+        """
+        Generate synthetic days of order flow (see generate_synthetic_orders) and save one file per day.
+
+        With output_format="csv" or "parquet", the days are saved as the processed files of parse_market_data
+        (orderbook_YYYY-MM-DD.csv.zip or .parquet). With output_format="bin", they are directly written as binary
+        order files (orderbook_YYYY-MM-DD.bin, bin_format as in create_bins_from_csv) and recorded in the catalog
+        of savepath. Every day is generated from its own seed derived from seed, so a rerun writes identical files.
+
+        Args:
+            start_date_str (str): Start date in format "YYYY-MM-DD"
+            end_date_str (str): End date in format "YYYY-MM-DD"
+            savepath (str): Directory where the files will be saved
+            output_format (str, optional): "csv" (zipped CSV), "parquet" or "bin". Defaults to "csv".
+            bin_format (int, optional): Format of the binary files, 1 or 2. Defaults to 1.
+            verbose (bool, optional): Print progress messages. Defaults to True.
+            seed (int, optional): Seed of the random generator. Defaults to None.
+            **kwargs: Order flow parameters passed to generate_synthetic_orders.
+
+        Returns:
+            list: The paths of the written files.
+        """
+        if output_format not in ("csv", "parquet", "bin"):
+            raise ValueError(f"Unknown output_format: {output_format}")
+        if bin_format not in (1, 2):
+            raise ValueError(f"Error: Unknown bin_format {bin_format}, must be 1 or 2.")
+        dates = pd.date_range(pd.Timestamp(start_date_str), pd.Timestamp(end_date_str), freq="D")
+        if len(dates) == 0:
+            raise ValueError("Error: Start date is after end date.")
+        savepath = os.path.join(savepath, "")
+        if not os.path.exists(savepath):
+            os.makedirs(savepath)
+
+        catalog = _Catalog(savepath) if output_format == "bin" else None
+        paths = []
+        for i, date in enumerate(tqdm(dates, desc="Writing Synthetic Days", ncols=100, disable=not verbose)):
+            df = self.generate_synthetic_orders(date, seed=None if seed is None else [seed, i], **kwargs)
+            if output_format != "bin":
+                paths.append(self._save_day(df, pd.DataFrame(), date.date(), savepath, output_format))
+                continue
+            file_path = f"{savepath}orderbook_{date.date()}.bin"
+            arrays = _order_arrays(df.reset_index())
+            if bin_format == 2:
+                _write_bin_v2(file_path, arrays)
+            else:
+                Simulation_cpp().writeOrderBinFromArrays(file_path, *arrays)
+            catalog.record(file_path, _order_summary(arrays))
+            paths.append(file_path)
 
-        print("\nWriting Binaries completed.")
\ No newline at end of file
+        if verbose: print("\nWriting Synthetic Days completed.")
+        return paths
@@ -8,21 +8,55 @@
 # Licensed under MIT License, see https://opensource.org/license/mit
 ######################################################################
 
+import glob
+import os
+from collections.abc import Mapping
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from . import heatmap as hm
 
+
+class _LogDir(Mapping):
+    """
+    The log tables written to the log_dir of a Simulation, as a read-only dictionary. A table is only read from its
+    Parquet parts when it is first accessed, and kept afterwards. Tables without records are empty DataFrames.
+    """
+
+    def __init__(self, log_dir: str):
+        if not os.path.isdir(log_dir):
+            raise FileNotFoundError(f"Log directory {log_dir} not found.")
+        self.log_dir = log_dir
+        self.names = sorted(name for name in os.listdir(log_dir) if os.path.isdir(os.path.join(log_dir, name)))
+        self.tables = {}
+
+    def __getitem__(self, name):
+        if name not in self.tables:
+            parts = sorted(glob.glob(os.path.join(self.log_dir, name, "part-*.parquet")))
+            if not parts and name not in self.names:
+                raise KeyError(name)
+            self.tables[name] = (pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+                                 if parts else pd.DataFrame())
+        return self.tables[name]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+
 class Results:
-    def __init__(self, logs: dict):
+    def __init__(self, logs):
         """
         Initialize a Simulation instance.
 
         Args:
-            logs (dict): A dictionary containing the get_logs() output of the simulation class.
+            logs (dict or str): A dictionary containing the get_logs() output of the simulation class, or the log_dir of a simulation, whose tables are then loaded lazily when first used.
         """
         
-        self.logs = logs
+        self.logs = _LogDir(logs) if isinstance(logs, (str, os.PathLike)) else logs
 
     def get_total_reward(self):
         return np.round(self.logs["decision_record"]['full_reward'].sum(),2)
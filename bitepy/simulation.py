@@ -12,6 +12,7 @@ import pandas as pd
 import numpy as np
 import pytz
 import os
+import glob
 from datetime import timedelta
 from tqdm import tqdm
 import sys
@@ -23,6 +24,39 @@ except ImportError as e:
         "Failed to import _bitepy module. Ensure that the C++ extension is correctly built and installed."
     ) from e
 
+from .data import (_bin_version, _carry_over_mask, _carry_path, _concat_order_arrays, _epoch_ms, _filter_orders,
+                   _import_pyarrow, _order_arrays, _read_bin_v2, _resting_orders, _side_codes, _Catalog, _Checkpoints,
+                   _OrderStore, Data)
+
+# log fields holding timestamps (milliseconds since epoch, UTC) in the columnar logs of the engine
+_LOG_TIMESTAMPS = {"hour", "time", "start", "cancel", "delivery", "last_solve_time"}
+# log tables of the engine, in the order of Simulation_cpp.getLogsColumnar
+_LOG_TABLES = ("decision_record", "price_record", "accepted_orders", "executed_orders", "forecast_orders",
+               "killed_orders", "balancing_orders")
+# file name of the Parquet parts of a log table in the log_dir of a simulation
+_LOG_PART = "part-{}.parquet"
+
+
+def _log_frame(columns):
+    """
+    Build a log table from the columnar logs of the engine (Simulation_cpp.getLogsColumnar): timestamps become
+    datetime64[ms, UTC] and the side codes of the type column a 'Buy'/'Sell' categorical, without parsing strings.
+    Sentinel timestamps (e.g., the max int64 cancel time of orders without expiry) become NaT.
+    """
+    frame = {}
+    for name, values in columns.items():
+        values = np.asarray(values)
+        if name in _LOG_TIMESTAMPS:
+            # sentinels that overflow pandas timestamps become NaT (int64 min), as in get_limit_order_book_state
+            values = np.where(values > pd.Timestamp.max.value // 1_000_000, np.iinfo(np.int64).min, values)
+            frame[name] = pd.DatetimeIndex(values.astype("datetime64[ms]")).tz_localize("UTC")
+        elif name == "type":
+            frame[name] = pd.Categorical.from_codes(values, ["Buy", "Sell"])
+        else:
+            frame[name] = values
+    return pd.DataFrame(frame)
+
+
 class Simulation:
     def __init__(self, start_date: pd.Timestamp, end_date: pd.Timestamp,
                  trading_start_date: pd.Timestamp=None,
@@ -41,7 +75,8 @@ class Simulation:
                  log_transactions=False,
                  only_traverse_lob=False,
                  cycle_limit: float = None,
-                 min_hot_queue_size: int = -1,):
+                 min_hot_queue_size: int = -1,
+                 log_dir: str = None,):
                 #  forecast_horizon_start=10*60,
                 #  forecast_horizon_end=75):
         """
@@ -67,6 +102,7 @@ class Simulation:
             only_traverse_lob: Whether to only traverse the LOB and not call any DP solves. (bool, default: False)
             cycle_limit: The limit on the number of cycles per Berlin-time day. Setting it comes at a cost in terms of solve time. (float, > 0). Default is None, where no cycle limit is enforced.
             min_hot_queue_size: The minimum number of orders to keep in the hot cache for each order queue. (int, > 0, or -1 to disable and use only volume-based caching, default: -1)
+            log_dir (str, optional): If given, the new log records (and transactions, with log_transactions) are written to Parquet files in this directory after every simulated day, one subdirectory per log table, instead of being returned by run (see run_one_day). The records written are dropped from the engine after the next day (if get_new_logs is used, once it returned them too), so get_logs only returns the records of the last day. Load the full logs with Results(log_dir). Requires pyarrow. Default is None.
         """
         # forecast_horizon_start (int, optional): The start of the forecast horizon (min). Default is 600.
         # forecast_horizon_end (int, optional): The end of the forecast horizon (min). Default is 75.
@@ -108,6 +144,10 @@ class Simulation:
                 raise ValueError("cycle_limit must be > 0 if provided")
         if min_hot_queue_size <= 0 and min_hot_queue_size != -1:
             raise ValueError("min_hot_queue_size must be > 0 or -1 (to disable)")
+        if log_dir is not None:
+            _import_pyarrow()
+            if glob.glob(os.path.join(log_dir, "*", _LOG_PART.format("*"))):
+                raise ValueError(f"log_dir {log_dir} already contains simulation logs")
         # if forecast_horizon_start < 0:
         #     raise ValueError("forecast_horizon_start must be >= 0")
         # if forecast_horizon_end < 0:
@@ -116,6 +156,17 @@ class Simulation:
         #     raise ValueError("forecast_horizon_start must larger than forecast_horizon_end")
         
         self._sim_cpp = Simulation_cpp()
+        # number of records of each log table already returned by get_new_logs, and whether it was called
+        self._log_cursor = [0] * 7
+        self._log_polled = False
+        # directory the logs are spilled to after every day, the number of records of each log table already
+        # written there (independent of get_new_logs), and the number of days spilled so far
+        self._log_dir = log_dir
+        self._spill_cursor = [0] * 7
+        self._log_part = 0
+        # number of records of each log table dropped from the engine (see _drain_logs); cursors and the index of
+        # the log tables count records from the start of the simulation
+        self._log_base = [0] * 7
 
         self._sim_cpp.params.storageMax = storage_max
         self._sim_cpp.params.linDegCost = lin_deg_cost
@@ -167,52 +218,137 @@ class Simulation:
         self._sim_cpp.params.tradingStartHour = trading_start_date.hour
         self._sim_cpp.params.tradingStartMinute = trading_start_date.minute
 
-    def add_bin_to_orderqueue(self, bin_data: str):
+    def _filter_ms(self, start_date: pd.Timestamp, end_date: pd.Timestamp, valid_from: pd.Timestamp):
+        """
+        Convert the order filters of add_bin_to_orderqueue and add_store_to_orderqueue to epoch milliseconds, with
+        start_date rounded down to the hour of its product.
+        """
+        for timestamp in [start_date, end_date, valid_from]:
+            if timestamp is not None and timestamp.tzinfo is None:
+                raise ValueError("start_date, end_date and valid_from must be timezone aware")
+        return (None if start_date is None else start_date.floor("h").value // 1_000_000,
+                None if end_date is None else end_date.value // 1_000_000,
+                None if valid_from is None else valid_from.value // 1_000_000)
+
+    def add_bin_to_orderqueue(self, bin_data: str, start_date: pd.Timestamp = None, end_date: pd.Timestamp = None,
+                              valid_from: pd.Timestamp = None):
         """
         Add an order binary file to the simulation's order queue.
 
+        Both the engine's binary format and the compressed format (Data.create_bins_from_csv with bin_format=2)
+        are accepted, the format is detected from the file. Orders of compressed binaries can be filtered before
+        they are added, so orders outside the simulated window are never allocated in the order queue. The engine's
+        binaries are loaded by the engine itself and always added in full, the filters do not apply to them.
+
         Args:
             bin_data (str): The path to the order binary file.
+            start_date (pd.Timestamp, optional): If given, only add products with a delivery start at or after the hour of start_date. Must be timezone aware.
+            end_date (pd.Timestamp, optional): If given, only add products with a delivery start at or before end_date. Must be timezone aware.
+            valid_from (pd.Timestamp, optional): If given, only add orders that are still valid at this time (e.g. the trading start). Must be timezone aware.
+        """
+        filters = self._filter_ms(start_date, end_date, valid_from)
+        if _bin_version(bin_data) == 2:
+            self._sim_cpp.addOrderQueueFromArrays(*_filter_orders(_read_bin_v2(bin_data), *filters))
+        else:
+            self._sim_cpp.addOrderQueueFromBin(bin_data)
+
+    def add_store_to_orderqueue(self, store: str, date: pd.Timestamp, start_date: pd.Timestamp = None,
+                                end_date: pd.Timestamp = None, valid_from: pd.Timestamp = None):
         """
-        self._sim_cpp.addOrderQueueFromBin(bin_data)
+        Add one day of an order store (see Data.create_order_store) to the simulation's order queue.
+
+        Args:
+            store (str or _OrderStore): The path to the order store, or an opened store.
+            date (pd.Timestamp): The (Berlin) day to add.
+            start_date (pd.Timestamp, optional): If given, only add products with a delivery start at or after the hour of start_date. Must be timezone aware.
+            end_date (pd.Timestamp, optional): If given, only add products with a delivery start at or before end_date. Must be timezone aware.
+            valid_from (pd.Timestamp, optional): If given, only add orders that are still valid at this time (e.g. the trading start). Must be timezone aware.
+        """
+        if isinstance(store, str):
+            store = _OrderStore(store)
+        day = np.datetime64(date.strftime("%Y-%m-%d"), "D")
+        self._sim_cpp.addOrderQueueFromArrays(*store.read(day, *self._filter_ms(start_date, end_date, valid_from)))
     
+    def replay_to(self, bin_data: str, time: pd.Timestamp, previous_bins: list = (), start_date: pd.Timestamp = None,
+                  end_date: pd.Timestamp = None, verbose: bool = False):
+        """
+        Rebuild the order book at a time of a day from its checkpoints, and run the simulation up to that time.
+
+        The binary must be compressed and written with order book checkpoints (Data.create_bins_from_csv with
+        bin_format=2 and checkpoint_minutes). Only the last checkpoint before time and the rest of the file are
+        decoded, and of the orders placed up to time, only the ones still resting in the book at time (valid after
+        time, for products delivered after time) are added to the order queue, together with all later orders. The replay therefore only covers the book at time instead
+        of the whole day, and get_limit_order_book_state can be queried once the simulation stopped. Orders of
+        earlier days still resting at time are added from previous_bins (compressed binaries, e.g. the carry-over
+        slice of the day before).
+
+        As the orders that left the book before time are not replayed, the trading of the storage is not
+        simulated before time: the method is meant for order book analyses (e.g. with only_traverse_lob).
+
+        Args:
+            bin_data (str): The path to the compressed order binary file of the day, with checkpoints.
+            time (pd.Timestamp): The time to replay to. Must be timezone aware.
+            previous_bins (list, optional): Paths to compressed order binaries of earlier days, in order. Defaults to none.
+            start_date (pd.Timestamp, optional): If given, only add products with a delivery start at or after the hour of start_date. Must be timezone aware.
+            end_date (pd.Timestamp, optional): If given, only add products with a delivery start at or before end_date. Must be timezone aware.
+            verbose (bool, optional): Whether to print a message when the simulation stops. Default is False.
+
+        Returns:
+            pd.Timestamp: The time of the checkpoint the book was rebuilt from (NaT if time is before the first checkpoint).
+        """
+        if time.tzinfo is None:
+            raise ValueError("time must be timezone aware")
+        start_ms, end_ms, _ = self._filter_ms(start_date, end_date, None)
+        time_ms = time.value // 1_000_000
+        checkpoint_ms, resting, tail = _Checkpoints(bin_data).seek(time_ms)
+
+        parts = []
+        for path in previous_bins:
+            if _bin_version(path) != 2:
+                raise ValueError("previous_bins must be compressed binaries (bin_format=2)")
+            parts.append(_resting_orders(_read_bin_v2(path), time_ms))
+        # orders placed up to time only matter if they are still resting at time
+        placed = np.searchsorted(tail[4], time_ms, side="right")
+        parts.append(_resting_orders(_concat_order_arrays([resting, tuple(column[:placed] for column in tail)]),
+                                     time_ms))
+        parts.append(tuple(column[placed:] for column in tail))
+
+        self._sim_cpp.addOrderQueueFromArrays(*_filter_orders(_concat_order_arrays(parts), start_ms, end_ms))
+        self.set_stop_time(time, verbose)
+        self.run_one_day(False)
+        return pd.NaT if checkpoint_ms is None else pd.Timestamp(checkpoint_ms, unit="ms", tz="UTC")
+
     def add_df_to_orderqueue(self, df: pd.DataFrame):
         """
         Add a DataFrame of orders to the simulation's order queue.
 
         The DataFrame must have the same columns as the saved CSV files, with timestamps in UTC
-        (seconds and milliseconds).
+        (seconds and milliseconds). Frames loaded from the Parquet order book files (pd.read_parquet), whose
+        timestamp columns are integer milliseconds since epoch (UTC), are accepted directly, and are put back in
+        the row order of the file by their sequence column.
 
         Args:
             df (pd.DataFrame): A DataFrame containing the orders to be added.
 
         Processing Steps:
+            - Restore the row order of Parquet order book frames (sequence column).
+            - Interpret integer timestamp columns as UTC milliseconds since epoch.
             - Validate that the timestamp columns ('start', 'transaction', 'validity') are timezone aware.
             - Ensure that all timestamps are in the same timezone.
-            - Convert all timestamps to UTC and format them in ISO 8601.
+            - Convert all timestamps to UTC milliseconds since epoch and pass the columns to the C++ extension as arrays.
+              The extension formats the timestamps for the engine, which still parses them as strings.
         """
+        if "sequence" in df.columns:
+            df = df.iloc[np.argsort(df["sequence"].to_numpy(dtype=np.int64), kind="stable")]
+        for col in ["start", "transaction", "validity"]:
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], unit="ms", utc=True)
         if (df["start"].dt.tz is None and df["transaction"].dt.tz is None and df["validity"].dt.tz is None):
             raise ValueError("All timestamps of input df must be timezone aware")
         if not (df["start"].dt.tz == df["transaction"].dt.tz and df["start"].dt.tz == df["validity"].dt.tz):
             raise ValueError("All timestamps of input df must be in the same timezone")
-        
-        df["start"] = df["start"].dt.tz_convert("UTC")
-        df["transaction"] = df["transaction"].dt.tz_convert("UTC")
-        df["validity"] = df["validity"].dt.tz_convert("UTC")
-        df["start"] = df["start"].dt.tz_localize(None).dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        df["transaction"] = df["transaction"].dt.tz_localize(None).dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-        df["validity"] = df["validity"].dt.tz_localize(None).dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-
-        ids = df['id'].to_numpy(dtype=np.int64).tolist()
-        initials = df['initial'].to_numpy(dtype=np.int64).tolist()
-        sides = df['side'].to_numpy(dtype='str').tolist()
-        starts = df['start'].to_numpy(dtype='str').tolist()
-        transactions = df['transaction'].to_numpy(dtype='str').tolist()
-        validities = df['validity'].to_numpy(dtype='str').tolist()
-        prices = df['price'].to_numpy(dtype=np.float64).tolist()
-        quantities = df['quantity'].to_numpy(dtype=np.float64).tolist()
-
-        self._sim_cpp.addOrderQueueFromPandas(ids, initials, sides, starts, transactions, validities, prices, quantities)
+
+        self._sim_cpp.addOrderQueueFromArrays(*_order_arrays(df))
 
     # def add_forecast_from_df(self, df: pd.DataFrame):
     #     """
@@ -262,70 +398,171 @@ class Simulation:
         Returns:
             list: A list of file paths for each day's binary order book file.
         """
+        base_path = os.path.join(base_path, '')
+        base_path += "orderbook_"
+
+        # Generate paths for each day within the date range
+        return [f"{base_path}{day.strftime('%Y-%m-%d')}.bin" for day in self._get_days(start_date, end_date)]
+
+    def _get_days(self, start_date: pd.Timestamp, end_date: pd.Timestamp):
+        """
+        Generate the list of (Berlin) days whose order book data is needed to simulate a date range.
+        """
         # convert dates to utc time
         start_date_berlin = start_date.tz_convert('Europe/Berlin') # convert to tz in which the lob files are segemented
         end_date_berlin = end_date.tz_convert('Europe/Berlin') # convert to tz in which the lob files are segemented
 
         # round up to midnight
         end_date_berlin_round_up = end_date_berlin.replace(hour=23, minute=59, second=59)
-        
-        base_path = os.path.join(base_path, '')
-        base_path += "orderbook_"
 
-        # Generate paths for each day within the date range
-        paths = []
-        
+        days = []
         current_date = start_date_berlin - timedelta(days=1) # include the day before the start date to ensure that all orders submitted with delivery on first day are included
         while current_date < end_date_berlin_round_up:
-            path = f"{base_path}{current_date.strftime('%Y-%m-%d')}.bin"
-            paths.append(path)
+            days.append(current_date)
             current_date += timedelta(days=1)
-        
-        return paths
+
+        return days
     
-    def run(self, data_path: str, verbose: bool = True):
+    def _simulation_dates(self):
+        """Return the start, end and trading start dates of the simulation (in UTC)."""
+        params = self._sim_cpp.params
+        start_date = pd.Timestamp(year=params.startYear, month=params.startMonth, day=params.startDay,
+                                  hour=params.startHour, minute=params.startMinute, tz="UTC")
+        end_date = pd.Timestamp(year=params.endYear, month=params.endMonth, day=params.endDay,
+                                hour=params.endHour, minute=params.endMinute, tz="UTC")
+        trading_start_date = pd.Timestamp(year=params.tradingStartYear, month=params.tradingStartMonth,
+                                          day=params.tradingStartDay, hour=params.tradingStartHour,
+                                          minute=params.tradingStartMinute, tz="UTC")
+        return start_date, end_date, trading_start_date
+
+    def _plan(self, data_path: str):
         """
-        Execute the simulation using binary data files.
+        Plan the data of a run: for every day, the binary file to load, or the order store (if there is one for
+        the year of the day).
+        """
+        start_date, end_date, _ = self._simulation_dates()
+        days = self._get_days(start_date, end_date)
+        lob_paths = self.get_data_bins_for_each_day(data_path, start_date, end_date)
+        # the day before the start date is only needed for the orders of the simulated products
+        carry_path = _carry_path(lob_paths[0])
+        if os.path.exists(carry_path):
+            lob_paths[0] = carry_path
+        stores = {}
+        for day in days:
+            store_path = os.path.join(data_path, f"orderbook_{day.year}.store")
+            if day.year not in stores and os.path.exists(store_path):
+                stores[day.year] = _OrderStore(store_path)
+        return [(day, path, stores.get(day.year)) for day, path in zip(days, lob_paths)]
+
+    def preflight(self, data_path: str, verbose: bool = True, checksum: bool = False):
+        """
+        Check the data of a run before it starts, and report the expected work per day.
 
-        The files must be named as: orderbook_YYYY-MM-DD.bin.
+        Binary files are checked against the catalog of data_path (see Data.catalog): they must exist, and must not
+        have changed since they were written. By default, only their size and mtime are compared with the catalog,
+        and no file is read. With checksum, files whose size or mtime changed are verified against their SHA-256
+        checksum instead, and new files are scanned and added to the catalog. Days read from an order store must
+        be in the store.
+
+        Args:
+            data_path (str): The directory containing the binary data files.
+            verbose (bool, optional): If True, print the report. Default is True.
+            checksum (bool, optional): If True, hash new and changed files instead of comparing size and mtime only. Default is False.
+
+        Returns:
+            pd.DataFrame: One row per simulated day, with the file (or order store) to load, its number of orders, first and last transaction time, number of delivery products, and status.
+
+        Raises:
+            FileNotFoundError: If files of the run are missing.
+            ValueError: If files of the run were modified or cannot be read, or days are missing from an order store.
+        """
+        start_date, end_date, _ = self._simulation_dates()
+        catalog = _Catalog(data_path)
+        rows = []
+        for day, path, store in self._plan(data_path):
+            if store is not None:
+                index = store.index[store.index["day"] == np.datetime64(day.strftime("%Y-%m-%d"), "D").astype(np.int64)]
+                rows.append({"day": day.date(), "file": os.path.basename(store.path),
+                             "orders": int(index["count"].sum()), "products": len(index),
+                             "status": "ok" if len(index) else "missing from store"})
+                continue
+            entry = catalog.entry(path, checksum)
+            rows.append({"day": day.date(), "file": os.path.basename(path),
+                         **{key: entry.get(key) for key in ["orders", "first_transaction", "last_transaction",
+                                                            "products"]},
+                         "status": entry["status"]})
+        if checksum:
+            try:
+                catalog.save()
+            except OSError:
+                pass  # read-only data directory, the catalog is only a cache
+        report = pd.DataFrame(rows, columns=["day", "file", "orders", "first_transaction", "last_transaction",
+                                             "products", "status"])
+        for col in ["first_transaction", "last_transaction"]:
+            report[col] = pd.to_datetime(report[col], unit="ms", utc=True)
+        if verbose:
+            print(report.drop(columns=["first_transaction", "last_transaction"]).to_string(index=False))
+
+        problems = report[report["status"] != "ok"]
+        if not problems.empty:
+            message = "Preflight failed for: " + ", ".join(
+                f"{f} for {d} ({s})" for d, f, s in zip(problems["day"], problems["file"], problems["status"]))
+            if (problems["status"] == "missing").all():
+                raise FileNotFoundError(message)
+            if (problems["status"] == "changed").any():
+                message += ". Files marked as changed differ in size or mtime from the catalog, verify their " \
+                           "content with preflight(data_path, checksum=True)"
+            raise ValueError(message)
+        return report
+
+    def run(self, data_path: str, verbose: bool = True, filter_orders: bool = True, preflight: bool = True):
+        """
+        Execute the simulation using binary data files or order stores.
+
+        The files must be named as: orderbook_YYYY-MM-DD.bin, or orderbook_YYYY.store for the order stores written by
+        Data.create_order_store. Days of a year with an order store are read from the store, and only the products
+        with delivery start in the simulation period are added. For the day before the start date, only the
+        carry-over slice orderbook_YYYY-MM-DD.carry.bin is loaded if it exists (see Data.create_bins_from_csv).
+
+        With filter_orders, orders from order stores and compressed binaries are filtered before they are added:
+        only products with delivery start in the simulation period, and only orders still valid at the trading start.
 
         Args:
             data_path (str): The directory containing the binary data files.
             verbose (bool, optional): If True, display progress logs. Default is True.
+            filter_orders (bool, optional): If True, filter the orders of order stores and compressed binaries to the simulated window. Default is True.
+            preflight (bool, optional): If True, check all files of the run against the catalog by size and mtime before it starts (see preflight). Default is True.
 
         Processing Steps:
-            - Retrieve the list of binary file paths for the simulation period.
-            - Iterate through each day's data, add the file to the order queue, and run the simulation for that day.
+            - Retrieve the list of binary file paths for the simulation period, and check them.
+            - Iterate through each day's data, add the file (or the day of the order store) to the order queue, and run the simulation for that day.
 
         Returns:
-            pd.DataFrame: A DataFrame containing the transactions if log_transactions is True, otherwise None.
-
-        """
-        start_date = pd.Timestamp(year=self._sim_cpp.params.startYear,
-                                  month=self._sim_cpp.params.startMonth,
-                                  day=self._sim_cpp.params.startDay,
-                                  hour=self._sim_cpp.params.startHour,
-                                  minute=self._sim_cpp.params.startMinute,
-                                  tz="UTC")
-        end_date = pd.Timestamp(year=self._sim_cpp.params.endYear,
-                                month=self._sim_cpp.params.endMonth,
-                                day=self._sim_cpp.params.endDay,
-                                hour=self._sim_cpp.params.endHour,
-                                minute=self._sim_cpp.params.endMinute,
-                                tz="UTC")
-        lob_paths = self.get_data_bins_for_each_day(data_path, start_date, end_date)
+            pd.DataFrame: A DataFrame containing the transactions if log_transactions is True, otherwise None. With log_dir, the transactions are written to log_dir/transactions instead, and None is returned.
+
+        """
+        start_date, end_date, trading_start_date = self._simulation_dates()
+        filters = (start_date, end_date, trading_start_date) if filter_orders else (None, None, None)
+        if preflight:
+            report = self.preflight(data_path, verbose=False)
+            if verbose: print("Preflight passed for", len(report), "days.")
+        plan = self._plan(data_path)
 
         transactions = pd.DataFrame()
 
-        num_days = len(lob_paths)
+        num_days = len(plan)
         if verbose: print("The simulation will iterate over", num_days, "files.")
 
         with tqdm(total=num_days, desc="Simulated Days", unit="%", ncols=120, disable=not verbose) as pbar:
-            for i, path in enumerate(lob_paths):
-                pbar.set_description(f"Currently simulating {path.split('/')[-1]} ... ")
-                self.add_bin_to_orderqueue(path)
-                self.run_one_day(i == len(lob_paths) - 1)
-                if self._sim_cpp.params.logTransactions:
+            for i, (day, path, store) in enumerate(plan):
+                if store is not None:
+                    pbar.set_description(f"Currently simulating {day.strftime('%Y-%m-%d')} of orderbook_{day.year}.store ... ")
+                    self.add_store_to_orderqueue(store, day, *filters)
+                else:
+                    pbar.set_description(f"Currently simulating {path.split('/')[-1]} ... ")
+                    self.add_bin_to_orderqueue(path, *filters)
+                self.run_one_day(i == num_days - 1)
+                if self._sim_cpp.params.logTransactions and self._log_dir is None:
                     transactions = pd.concat([transactions, self.group_transactions(self.get_transactions())])
                 pbar.update(1)
 
@@ -334,6 +571,68 @@ class Simulation:
         if self._sim_cpp.params.logTransactions and not transactions.empty:
             return transactions
 
+    def run_from_raw(self, marketdatapath: str, market_type: str, verbose: bool = True, filter_orders: bool = True,
+                     savepath: str = None, output_format: str = "csv"):
+        """
+        Execute the simulation directly on raw EPEX or NordPool market data, without intermediate files.
+
+        The raw days of the simulation period are parsed day by day (see Data.stream_market_data), and the orders of
+        every day are added to the order queue from memory before the day is simulated. The orders are the same as
+        in run on the files written by Data.parse_market_data and Data.create_bins_from_csv: of the day before the
+        start date, only the orders for products delivered from the start day on are added.
+
+        Args:
+            marketdatapath (str): Path to market data folder with yearly/monthly subfolders (see Data.parse_market_data).
+            market_type (str): "EPEX" or "NordPool"
+            verbose (bool, optional): If True, display progress logs. Default is True.
+            filter_orders (bool, optional): If True, only add products with delivery start in the simulation period, and only orders still valid at the trading start. Default is True.
+            savepath (str, optional): If given, the processed days are also saved there, as by Data.parse_market_data. Default is None.
+            output_format (str, optional): "csv" (zipped CSV) or "parquet", the format of the saved days. Default is "csv".
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the transactions if log_transactions is True, otherwise None. With log_dir, the transactions are written to log_dir/transactions instead, and None is returned.
+        """
+        start_date, end_date, trading_start_date = self._simulation_dates()
+        filters = self._filter_ms(start_date, end_date, trading_start_date) if filter_orders else None
+        days = self._get_days(start_date, end_date)
+        first_day, last_day = (pd.Timestamp(day.strftime("%Y-%m-%d")) for day in (days[0], days[-1]))
+
+        data = Data()
+        # the raw data of the day after the last day completes its transactions, if it is there
+        try:
+            data._raw_day_files(last_day + pd.Timedelta(days=1), marketdatapath, market_type)
+            stream_end = last_day + pd.Timedelta(days=1)
+        except FileNotFoundError:
+            stream_end = last_day
+        stream = data.stream_market_data(str(first_day.date()), str(stream_end.date()), marketdatapath, market_type,
+                                         savepath, output_format)
+
+        transactions = pd.DataFrame()
+
+        num_days = len(days)
+        if verbose: print("The simulation will iterate over", num_days, "days.")
+
+        with tqdm(total=num_days, desc="Simulated Days", unit="%", ncols=120, disable=not verbose) as pbar:
+            for i, (day, arrays) in zip(range(num_days), stream):
+                pbar.set_description(f"Currently simulating {day.strftime('%Y-%m-%d')} ... ")
+                if i == 0:
+                    carry = _carry_over_mask(day, arrays[3])
+                    arrays = tuple(column[carry] for column in arrays)
+                if filters is not None:
+                    arrays = _filter_orders(arrays, *filters)
+                self._sim_cpp.addOrderQueueFromArrays(*arrays)
+                del arrays
+                self.run_one_day(i == num_days - 1)
+                if self._sim_cpp.params.logTransactions and self._log_dir is None:
+                    transactions = pd.concat([transactions, self.group_transactions(self.get_transactions())])
+                pbar.update(1)
+        stream.close()
+
+        if verbose: print("Simulation finished.")
+
+        if self._sim_cpp.params.logTransactions and not transactions.empty:
+            return transactions
+
     def group_transactions(self, transactions: pd.DataFrame):
         """
         Group transactions by timestamp and delivery hour, calculating volume-weighted average prices.
@@ -396,8 +695,46 @@ class Simulation:
 
         Processing Steps:
             - Execute the simulation for the provided day's data.
+            - With log_dir, write the new log records of the day and the grouped transactions (with log_transactions) to log_dir.
         """
         self._sim_cpp.run(is_last)
+        if self._log_dir is not None:
+            self._spill_logs()
+
+    def _spill_logs(self):
+        """
+        Write the log records appended since the previous call, and the grouped transactions, to one Parquet part
+        per table in log_dir/<table>/. Parts are numbered by simulated day, so the parts of a table read in order
+        give the full table. Tables without new records get no part, except on the first day, which keeps the
+        columns of empty tables. The records written on the previous day are dropped from the engine afterwards
+        (see _drain_logs), the ones of the day are kept until the next day for get_new_logs.
+        """
+        written = list(self._spill_cursor)
+        tables = self._new_logs(self._spill_cursor)
+        if self._sim_cpp.params.logTransactions:
+            transactions = self.get_transactions()
+            tables["transactions"] = self.group_transactions(transactions) if not transactions.empty else transactions
+        for name, table in tables.items():
+            if table.empty and self._log_part > 0:
+                continue
+            os.makedirs(os.path.join(self._log_dir, name), exist_ok=True)
+            table.to_parquet(os.path.join(self._log_dir, name, _LOG_PART.format(f"{self._log_part:05d}")), index=False)
+        self._log_part += 1
+        self._drain_logs(written)
+
+    def _logs(self, offsets=()):
+        """
+        Retrieve the log tables of the engine, from the given record offsets on (one per table, in the order of
+        Simulation_cpp.getLogsColumnar). Returns all seven tables as DataFrames, indexed by record number. Records
+        dropped from the engine are skipped.
+        """
+        offsets = [max(offset, base) for offset, base in zip(list(offsets) or [0] * 7, self._log_base)]
+        engine_offsets = [offset - base for offset, base in zip(offsets, self._log_base)]
+        tables = [_log_frame(columns) for columns in self._sim_cpp.getLogsColumnar(engine_offsets)]
+        for table, offset in zip(tables, offsets):
+            table.index = pd.RangeIndex(offset, offset + len(table))
+        tables[0]["cycles"] = np.round(tables[0]["cycles"], 2)
+        return tables
 
     def get_logs(self):
         """
@@ -410,55 +747,79 @@ class Simulation:
                 - accepted_orders: Limit orders accepted by the RI.
                 - executed_orders: Orders sent to the exchange by the RI.
                 - killed_orders: Orders that were missed at the exchange.
+            Timestamps are UTC (datetime64[ms]) and the order types are categorical ('Buy'/'Sell'). Records are
+            indexed by their number since the start of the simulation; records dropped from the engine (see
+            get_new_logs) are not returned.
         """
         # - forecast_orders: Orders virtually traded against the forecast.
         # - balancing_orders: Orders that would have incurred payments to the TSO.
-        decision_record, price_record, accepted_orders, executed_orders, forecast_orders, killed_orders, balancing_orders = self._sim_cpp.getLogs()
-        decision_record = pd.DataFrame(decision_record)
-        price_record = pd.DataFrame(price_record)
-        accepted_orders = pd.DataFrame(accepted_orders)
-        executed_orders = pd.DataFrame(executed_orders)
-        forecast_orders = pd.DataFrame(forecast_orders)
-        killed_orders = pd.DataFrame(killed_orders)
-        balancing_orders = pd.DataFrame(balancing_orders)
-
-        if not decision_record.empty:
-            decision_record["hour"] = pd.to_datetime(decision_record["hour"], utc=True)
-            decision_record["cycles"] = np.round(decision_record["cycles"].astype(float), 2)
-        if not price_record.empty:
-            price_record["hour"] = pd.to_datetime(price_record["hour"], utc=True)
-        if not accepted_orders.empty:
-            accepted_orders["time"] = pd.to_datetime(accepted_orders["time"], utc=True)
-            accepted_orders["start"] = pd.to_datetime(accepted_orders["start"], utc=True)
-            accepted_orders["cancel"] = pd.to_datetime(accepted_orders["cancel"], utc=True)
-            accepted_orders["delivery"] = pd.to_datetime(accepted_orders["delivery"], utc=True)
-        if not executed_orders.empty:
-            executed_orders["time"] = pd.to_datetime(executed_orders["time"], utc=True)
-            executed_orders["last_solve_time"] = pd.to_datetime(executed_orders["last_solve_time"], utc=True)
-            executed_orders["hour"] = pd.to_datetime(executed_orders["hour"], utc=True)
-        if not forecast_orders.empty:
-            forecast_orders["time"] = pd.to_datetime(forecast_orders["time"], utc=True)
-            forecast_orders["last_solve_time"] = pd.to_datetime(forecast_orders["last_solve_time"], utc=True)
-            forecast_orders["hour"] = pd.to_datetime(forecast_orders["hour"], utc=True)
-        if not killed_orders.empty:
-            killed_orders["time"] = pd.to_datetime(killed_orders["time"], utc=True)
-            killed_orders["last_solve_time"] = pd.to_datetime(killed_orders["last_solve_time"], utc=True)
-            killed_orders["hour"] = pd.to_datetime(killed_orders["hour"], utc=True)
-        if not balancing_orders.empty:
-            balancing_orders["time"] = pd.to_datetime(balancing_orders["time"], utc=True)
-            balancing_orders["hour"] = pd.to_datetime(balancing_orders["hour"], utc=True)
+        decision_record, price_record, accepted_orders, executed_orders, forecast_orders, killed_orders, balancing_orders = self._logs()
 
         logs = {
-            "decision_record": pd.DataFrame(decision_record, index=None),
-            "price_record": pd.DataFrame(price_record, index=None),
-            "accepted_orders": pd.DataFrame(accepted_orders, index=None),
-            "executed_orders": pd.DataFrame(executed_orders, index=None),
-            # "forecast_orders": pd.DataFrame(forecast_orders, index=None), # removed for later versions of the code
-            "killed_orders": pd.DataFrame(killed_orders, index=None),
-            # "balancing_orders": pd.DataFrame(balancing_orders, index=None), # removed for later versions of the code
+            "decision_record": decision_record,
+            "price_record": price_record,
+            "accepted_orders": accepted_orders,
+            "executed_orders": executed_orders,
+            # "forecast_orders": forecast_orders, # removed for later versions of the code
+            "killed_orders": killed_orders,
+            # "balancing_orders": balancing_orders, # removed for later versions of the code
         }
         return logs
 
+    def get_new_logs(self, drain: bool = False):
+        """
+        Retrieve only the log records appended since the previous call (or since the start of the simulation).
+
+        The logs are returned as by get_logs, but every call only converts the new records, so polling the logs
+        after every day of a long run stays linear in the total number of records. The records are indexed by their
+        position in the full log, as returned by get_logs, so consecutive results can be concatenated.
+
+        With drain, the returned records are dropped from the engine afterwards (with log_dir, only once they are
+        also written there), so the memory of the engine stays bounded in long runs. get_logs then only returns the
+        records not dropped yet.
+
+        Args:
+            drain (bool, optional): If True, drop the returned records from the engine. Default is False.
+
+        Returns:
+            dict: A dictionary with the new records of the log tables of get_logs.
+        """
+        self._log_polled = True
+        logs = self._new_logs(self._log_cursor)
+        if drain:
+            self._drain_logs(self._log_cursor)
+        return logs
+
+    def _new_logs(self, cursor):
+        """
+        Retrieve the log tables of get_logs from the record offsets in cursor (one per table, see _logs) on, and
+        advance cursor past the returned records. get_new_logs and the log_dir spill keep separate cursors.
+        """
+        tables = self._logs(cursor)
+        cursor[:] = [table.index.stop for table in tables]
+        decision_record, price_record, accepted_orders, executed_orders, _, killed_orders, _ = tables
+        return {
+            "decision_record": decision_record,
+            "price_record": price_record,
+            "accepted_orders": accepted_orders,
+            "executed_orders": executed_orders,
+            "killed_orders": killed_orders,
+        }
+
+    def _drain_logs(self, offsets):
+        """
+        Drop the log records before offsets (one per table, see _logs) from the engine, except the ones not written
+        to log_dir yet (with log_dir) and, once get_new_logs was called, the ones it has not returned yet. Engines
+        whose logs cannot be drained (see Simulation_cpp.clearLogsBefore) keep all records.
+        """
+        cursors = [offsets] + ([self._spill_cursor] if self._log_dir is not None else [])
+        if self._log_polled:
+            cursors.append(self._log_cursor)
+        offsets = [max(min(limits), base) for limits, base in zip(zip(*cursors), self._log_base)]
+        if offsets != self._log_base and self._sim_cpp.clearLogsBefore(
+                [offset - base for offset, base in zip(offsets, self._log_base)]):
+            self._log_base = offsets
+
     def get_transactions(self):
         """
         Retrieve all transactions that have occurred since the last call and clear the internal transaction log.
@@ -626,11 +987,6 @@ class Simulation:
         if df["volume"].le(0).any():
             raise ValueError("volume must be > 0")
         
-        # Convert to UTC
-        df = df.copy()
-        df["transaction_time"] = df["transaction_time"].dt.tz_convert("UTC")
-        df["delivery_time"] = df["delivery_time"].dt.tz_convert("UTC")
-        
         # Validate side column
         valid_sides = {'buy', 'sell', 'Buy', 'Sell', 'BUY', 'SELL'}
         invalid_sides = df["side"].unique()
@@ -638,22 +994,15 @@ class Simulation:
         if invalid_sides:
             raise ValueError(f"Invalid side values: {invalid_sides}. Must be one of: {valid_sides}")
         
-        # Normalize side values to 'Buy'/'Sell'
-        df["side"] = df["side"].str.capitalize()
-        
-        # Convert timestamps to ISO format
-        df["transaction_time"] = df["transaction_time"].dt.tz_localize(None).dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
-        df["delivery_time"] = df["delivery_time"].dt.tz_localize(None).dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        # Prepare data for C++ function
-        transaction_times = df["transaction_time"].to_numpy(dtype='str').tolist()
-        prices = df["price"].to_numpy(dtype=np.float64).tolist()
-        volumes = df["volume"].to_numpy(dtype=np.float64).tolist()
-        sides = df["side"].to_numpy(dtype='str').tolist()
-        delivery_times = df["delivery_time"].to_numpy(dtype='str').tolist()
+        # Prepare data for C++ function, timestamps as UTC milliseconds since epoch
+        transaction_times = _epoch_ms(df["transaction_time"])
+        prices = df["price"].to_numpy(dtype=np.float64)
+        volumes = df["volume"].to_numpy(dtype=np.float64)
+        sides = _side_codes(df["side"])
+        delivery_times = _epoch_ms(df["delivery_time"])
         
         # Call C++ function to submit limit orders (no return value)
-        self._sim_cpp.submitLimitOrdersAndGetMatches(transaction_times, prices, volumes, sides, delivery_times)
+        self._sim_cpp.submitLimitOrdersFromArrays(transaction_times, prices, volumes, sides, delivery_times)
     
     def get_limit_order_matches(self):
         """
@@ -917,11 +1266,11 @@ class Simulation:
         pd.DataFrame or dict
             A DataFrame containing the limit orders with the following columns:
                 - delivery_time: The delivery time of the product (UTC timestamp)
-                - side: 'sell' or 'buy' (sell orders are where you can buy from, buy orders are where you can sell to)
+                - side: 'sell' or 'buy', categorical (sell orders are where you can buy from, buy orders are where you can sell to)
                 - order_id: The unique order ID
                 - initial_id: The initial order ID (for tracking order modifications)
                 - start_time: When the order was placed (UTC timestamp)
-                - cancel_time: When the order expires (UTC timestamp)
+                - cancel_time: When the order expires (UTC timestamp, NaT for orders without expiry)
                 - price: The limit order price in EUR/MWh
                 - volume: The order volume in MWh
                 - is_forecast: Whether this is a forecast order (bool)
@@ -935,6 +1284,9 @@ class Simulation:
         - Orders are filtered to exclude expired orders at the query time
         - Cumulative volume stops at max_action (default: inject_max + withdraw_max)
         - Each row represents one limit order in the order book
+        - The frame is built from the flat arrays of the engine. The side is a categorical with the categories
+          'buy' and 'sell' (plain strings before), the timestamps are datetime64[ms, UTC], and an empty order book
+          gives an empty frame with all columns (a frame without columns before)
         
         Example
         -------
@@ -959,76 +1311,31 @@ class Simulation:
                 raise ValueError("max_action must be > 0")
             max_action_value = max_action
         
-        # Call C++ function (uses simulation's current time internally)
-        lob_state_dict = self._sim_cpp.getLimitOrderBookState(max_action_value)
-
         if return_dict:
-            return lob_state_dict
-        
-        # Convert to DataFrame
-        rows = []
-        for delivery_time_ms, data in lob_state_dict.items():
-            delivery_time = pd.Timestamp(delivery_time_ms, unit='ms', tz='UTC')
-            
-            # Process sell orders (where we can buy from)
-            sell_ids = data['sell_ids']
-            sell_initial_ids = data['sell_initial_ids']
-            sell_starts = data['sell_starts']
-            sell_cancels = data['sell_cancels']
-            sell_prices = data['sell_prices']
-            sell_volumes = data['sell_volumes']
-            sell_forecasts = data['sell_forecasts']
-            
-            cumulative_sell_volume = 0.0
-            for order_id, initial_id, start, cancel, price, volume, forecast in zip(
-                sell_ids, sell_initial_ids, sell_starts, sell_cancels, sell_prices, sell_volumes, sell_forecasts
-            ):
-                cumulative_sell_volume += volume
-                # Handle sentinel cancel time values (e.g., max int64) that overflow pandas timestamps
-                cancel_ts = pd.NaT if int(cancel) > pd.Timestamp.max.value // 1_000_000 else pd.Timestamp(int(cancel), unit='ms', tz='UTC')
-                rows.append({
-                    'delivery_time': delivery_time,
-                    'side': 'sell',
-                    'order_id': int(order_id),
-                    'initial_id': int(initial_id),
-                    'start_time': pd.Timestamp(int(start), unit='ms', tz='UTC'),
-                    'cancel_time': cancel_ts,
-                    'price': price,
-                    'volume': volume,
-                    'is_forecast': bool(forecast),
-                    'cumulative_volume': cumulative_sell_volume
-                })
-            
-            # Process buy orders (where we can sell to)
-            buy_ids = data['buy_ids']
-            buy_initial_ids = data['buy_initial_ids']
-            buy_starts = data['buy_starts']
-            buy_cancels = data['buy_cancels']
-            buy_prices = data['buy_prices']
-            buy_volumes = data['buy_volumes']
-            buy_forecasts = data['buy_forecasts']
-            
-            cumulative_buy_volume = 0.0
-            for order_id, initial_id, start, cancel, price, volume, forecast in zip(
-                buy_ids, buy_initial_ids, buy_starts, buy_cancels, buy_prices, buy_volumes, buy_forecasts
-            ):
-                cumulative_buy_volume += volume
-                # Handle sentinel cancel time values (e.g., max int64) that overflow pandas timestamps
-                cancel_ts = pd.NaT if int(cancel) > pd.Timestamp.max.value // 1_000_000 else pd.Timestamp(int(cancel), unit='ms', tz='UTC')
-                rows.append({
-                    'delivery_time': delivery_time,
-                    'side': 'buy',
-                    'order_id': int(order_id),
-                    'initial_id': int(initial_id),
-                    'start_time': pd.Timestamp(int(start), unit='ms', tz='UTC'),
-                    'cancel_time': cancel_ts,
-                    'price': price,
-                    'volume': volume,
-                    'is_forecast': bool(forecast),
-                    'cumulative_volume': cumulative_buy_volume
-                })
-        
-        df = pd.DataFrame(rows)
+            # Call C++ function (uses simulation's current time internally)
+            return self._sim_cpp.getLimitOrderBookState(max_action_value)
+
+        # Flat arrays of the orders of all products, with the cumulative volumes computed in C++
+        state = self._sim_cpp.getLimitOrderBookStateArrays(max_action_value)
+
+        def utc(ms):
+            return pd.DatetimeIndex(ms.astype("datetime64[ms]")).tz_localize("UTC")
+
+        # Sentinel cancel times (e.g., max int64) that overflow pandas timestamps become NaT (int64 min)
+        cancel = state["cancel"]
+        cancel = np.where(cancel > pd.Timestamp.max.value // 1_000_000, np.iinfo(np.int64).min, cancel)
+        df = pd.DataFrame({
+            'delivery_time': utc(state["products"][state["product"]]),
+            'side': pd.Categorical.from_codes(state["side"], ["buy", "sell"]),
+            'order_id': state["order_id"],
+            'initial_id': state["initial_id"],
+            'start_time': utc(state["start"]),
+            'cancel_time': utc(cancel),
+            'price': state["price"],
+            'volume': state["volume"],
+            'is_forecast': state["is_forecast"],
+            'cumulative_volume': state["cumulative_volume"],
+        })
         return df
 
     def reached_end_of_day(self, is_last: bool) -> bool:
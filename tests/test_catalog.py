@@ -0,0 +1,58 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+The catalog checks of Simulation.preflight: by size and mtime only, unless checksums are asked for.
+"""
+
+import os
+
+import pytest
+
+from bitepy.data import _Catalog, _Manifest
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "orderbook_2022-01-02.bin"
+    path.write_bytes(b"\0" * 64)
+    catalog = _Catalog(str(tmp_path))
+    catalog.record(str(path), {"orders": 1})
+    return catalog, str(path)
+
+
+def no_checksum(path):
+    raise AssertionError(f"{path} was hashed")
+
+
+def test_stat_only_does_not_read_files(tmp_path, catalog, monkeypatch):
+    catalog, path = catalog
+    new_path = tmp_path / "orderbook_2022-01-03.bin"
+    new_path.write_bytes(b"\0" * 64)
+    monkeypatch.setattr(_Manifest, "_checksum", staticmethod(no_checksum))
+
+    assert catalog.entry(path, checksum=False)["status"] == "ok"
+    entry = catalog.entry(str(new_path), checksum=False)
+    assert entry["status"] == "ok" and "orders" not in entry
+    assert new_path.name not in catalog.entries
+
+    os.utime(path, ns=(0, 0))
+    assert catalog.entry(path, checksum=False)["status"] == "changed"
+
+
+def test_checksum_verifies_changed_files(catalog):
+    catalog, path = catalog
+    os.utime(path, ns=(0, 0))
+    assert catalog.entry(path, checksum=True)["status"] == "ok"
+
+    with open(path, "r+b") as f:
+        f.write(b"\1")
+    os.utime(path, ns=(1, 1))
+    assert catalog.entry(path, checksum=True)["status"] == "modified"
@@ -0,0 +1,88 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+The order book checkpoints of compressed binaries (_Checkpoints) and Simulation.replay_to, against a brute-force
+filter of the full day: the orders placed up to a time, still valid after it, for products delivered after it.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitepy import Data, Simulation
+from bitepy.data import _Checkpoints, _order_arrays, _write_bin_v2
+
+HOUR = 3_600_000
+
+
+@pytest.fixture(scope="module")
+def day(tmp_path_factory):
+    pytest.importorskip("pyarrow")
+    df = Data().generate_synthetic_orders("2022-01-02", orders_per_second=0.2, seed=0)
+    arrays = _order_arrays(df.rename_axis("id").reset_index())
+    path = str(tmp_path_factory.mktemp("bin") / "orderbook_2022-01-02.bin")
+    # small blocks, so that checkpoints fall within blocks
+    _write_bin_v2(path, arrays, block_size=1000)
+    _Checkpoints.write(path, arrays, HOUR)
+    return path, arrays
+
+
+def resting(arrays, time_ms):
+    """Brute force: the orders placed up to time_ms that rest in the book at time_ms."""
+    ids, initials, sides, starts, transactions, validities, prices, quantities = arrays
+    return (transactions <= time_ms) & (validities > time_ms) & (starts > time_ms)
+
+
+def assert_same_orders(result, expected):
+    for column, expected_column in zip(result, expected):
+        np.testing.assert_array_equal(column, expected_column)
+
+
+def test_checkpoints_hold_the_resting_orders(day):
+    path, arrays = day
+    checkpoints = _Checkpoints(path)
+    first_ms = pd.Timestamp("2022-01-02", tz="UTC").value // 1_000_000
+    # every full hour within the transactions of the day
+    assert checkpoints.index["time"].tolist() == (first_ms + np.arange(1, 24) * HOUR).tolist()
+    for time_ms in [first_ms + 5 * HOUR, first_ms + 12 * HOUR + 1234, first_ms + 23 * HOUR + HOUR - 1]:
+        checkpoint_ms, rest, tail = checkpoints.seek(time_ms)
+        assert checkpoint_ms == time_ms // HOUR * HOUR
+        assert_same_orders(rest, tuple(column[resting(arrays, checkpoint_ms)] for column in arrays))
+        later = arrays[4] > checkpoint_ms
+        assert_same_orders(tail, tuple(column[later] for column in arrays))
+        # orders of delivered products are not kept
+        assert (rest[3] > checkpoint_ms).all() and len(rest[0]) < (arrays[4] <= checkpoint_ms).sum()
+
+
+def test_seek_before_the_first_checkpoint_reads_the_day(day):
+    path, arrays = day
+    checkpoint_ms, rest, tail = _Checkpoints(path).seek(int(arrays[4][0]) - 1)
+    assert checkpoint_ms is None and len(rest[0]) == 0
+    assert_same_orders(tail, arrays)
+
+
+def test_replay_queues_the_book_and_later_orders(day, monkeypatch):
+    path, arrays = day
+    time = pd.Timestamp("2022-01-02 14:20:31", tz="UTC")
+    time_ms = time.value // 1_000_000
+    queued = []
+    sim = Simulation(time.tz_convert("Europe/Berlin").normalize(), time + pd.Timedelta(hours=8), time)
+    with monkeypatch.context() as patch:
+        patch.setattr(sim, "_sim_cpp", type("Engine", (), {
+            "addOrderQueueFromArrays": lambda self, *columns: queued.append(columns)})())
+        patch.setattr(Simulation, "set_stop_time", lambda self, time, verbose=False: None)
+        patch.setattr(Simulation, "run_one_day", lambda self, last=False: None)
+        checkpoint = sim.replay_to(path, time)
+
+    assert checkpoint == pd.Timestamp("2022-01-02 14:00", tz="UTC")
+    assert len(queued) == 1
+    keep = resting(arrays, time_ms) | (arrays[4] > time_ms)
+    assert_same_orders(queued[0], tuple(column[keep] for column in arrays))
@@ -0,0 +1,204 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+The order helpers of bitepy.data on hand-built inputs.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitepy import Data
+from bitepy.data import (_NO_EXPIRY_MS, _bin_version, _compact_orders, _encode_order_ids,
+                         _filter_orders, _read_bin_v2, _unzigzag,
+                         _varint_decode, _varint_encode, _write_bin_v2, _zigzag)
+
+HOUR = 3_600_000
+
+
+def order_arrays(sides, starts, transactions, validities, prices, quantities):
+    """Order arrays as returned by _order_arrays, with ids numbering the orders."""
+    ids = np.arange(len(sides), dtype=np.int64)
+    return (ids, ids.copy(), np.array(sides, dtype=np.int8), np.array(starts, dtype=np.int64),
+            np.array(transactions, dtype=np.int64), np.array(validities, dtype=np.int64),
+            np.array(prices, dtype=np.float64), np.array(quantities, dtype=np.float64))
+
+
+def test_numeric_order_ids_keep_their_value():
+    ids = ["0", "7", "123456789012345678", "999999999999999999"]
+    np.testing.assert_array_equal(_encode_order_ids(ids), [0, 7, 123456789012345678, 999999999999999999])
+    np.testing.assert_array_equal(_encode_order_ids(pd.Series([3, 2**40], dtype=np.int64)), [3, 2**40])
+
+
+def test_other_order_ids_are_hashed_above_2_62():
+    # alphanumeric, more than 18 digits, and leading zeros (which would collide with the number without them)
+    ids = ["2024010100001A", "1234567890123456789", "0123", "", "-5"]
+    encoded = _encode_order_ids(ids)
+    assert (encoded >= 2**62).all()
+    assert len(set(encoded.tolist())) == len(ids)
+    assert 123 not in encoded
+
+
+def test_order_id_encoding_is_stable_across_calls_and_days():
+    day1 = ["20240101000001A", "20240101000002A", "42"]
+    day2 = ["20240102000009A", "20240101000002A", "42", "20240101000001A"]
+    first, second = _encode_order_ids(day1), _encode_order_ids(day2)
+    np.testing.assert_array_equal(_encode_order_ids(day1), first)
+    assert second[1] == first[1] and second[3] == first[0] and second[2] == first[2] == 42
+    # repeated ids within a day get the same code
+    np.testing.assert_array_equal(_encode_order_ids(day1 + day1), np.r_[first, first])
+
+
+def test_varint_zigzag_round_trip():
+    values = np.array([0, 1, -1, 63, -64, 64, 2**31, -2**31, 2**62, np.iinfo(np.int64).max, np.iinfo(np.int64).min])
+    coded = _zigzag(values)
+    assert coded[:5].tolist() == [0, 2, 1, 126, 127]
+    np.testing.assert_array_equal(_unzigzag(_varint_decode(_varint_encode(coded), len(values))), values)
+    # one byte per 7 bits, ten bytes for the full 64 bits
+    assert len(_varint_encode(np.array([127, 128, 2**64 - 1], dtype=np.uint64))) == 1 + 2 + 10
+
+
+def test_bin_v2_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(0)
+    n = 1000
+    transactions = 1_640_995_200_000 + np.sort(rng.integers(0, 86_400_000, n))
+    validities = transactions + rng.integers(0, 7_200_000, n)
+    validities[rng.random(n) < 0.2] = _NO_EXPIRY_MS
+    ids = rng.permutation(n).astype(np.int64) + 2**62  # out of order, and as large as hashed ids
+    arrays = (
+        ids,
+        np.where(rng.random(n) < 0.5, ids, ids - rng.integers(1, 1000, n)),
+        rng.integers(0, 2, n).astype(np.int8),
+        (transactions // 3_600_000 + rng.integers(1, 30, n)) * 3_600_000,
+        transactions,
+        validities,
+        rng.integers(-50_000, 400_000, n) / 100,  # cents, negative prices included
+        rng.integers(1, 5000, n) / 10,  # tenths
+    )
+    path = str(tmp_path / "orderbook_2022-01-01.bin")
+    # several blocks, the last one partial
+    _write_bin_v2(path, arrays, block_size=300)
+
+    assert _bin_version(path) == 2
+    decoded = _read_bin_v2(path)
+    for column, expected in zip(decoded, arrays):
+        assert column.dtype == expected.dtype
+        np.testing.assert_array_equal(column, expected)
+
+    empty = str(tmp_path / "empty.bin")
+    _write_bin_v2(empty, tuple(column[:0] for column in arrays))
+    assert all(len(column) == 0 for column in _read_bin_v2(empty))
+
+    v1 = tmp_path / "orderbook_2022-01-02.bin"
+    v1.write_bytes(b"\0" * 64)
+    assert _bin_version(str(v1)) == 1
+    with pytest.raises(ValueError):
+        _read_bin_v2(str(v1))
+
+
+def test_filter_orders_window_edges():
+    arrays = order_arrays(
+        sides=[0, 1, 0, 1, 0, 1],
+        starts=[9 * HOUR, 10 * HOUR, 10 * HOUR, 12 * HOUR, 12 * HOUR, 13 * HOUR],
+        transactions=[0, 0, 0, 0, 0, 0],
+        validities=[HOUR, HOUR - 1, _NO_EXPIRY_MS, HOUR + 1, HOUR, HOUR + 1],
+        prices=[50.0] * 6,
+        quantities=[1.0] * 6,
+    )
+    # delivery starts at both ends of the window are kept
+    assert _filter_orders(arrays, 10 * HOUR, 12 * HOUR)[0].tolist() == [1, 2, 3, 4]
+    # an order expiring at valid_from is dropped, orders without expiry are kept
+    assert _filter_orders(arrays, valid_from_ms=HOUR)[0].tolist() == [2, 3, 5]
+    assert _filter_orders(arrays, 10 * HOUR, 12 * HOUR, HOUR)[0].tolist() == [2, 3]
+    assert _filter_orders(arrays, start_ms=12 * HOUR)[0].tolist() == [3, 4, 5]
+    assert _filter_orders(arrays, end_ms=9 * HOUR)[0].tolist() == [0]
+    # no filter returns the arrays themselves
+    assert _filter_orders(arrays) is arrays
+    filtered = _filter_orders(arrays, 10 * HOUR, 12 * HOUR, HOUR)
+    assert [column.dtype for column in filtered] == [column.dtype for column in arrays]
+
+
+def test_create_bins_reports_filtered_orders(tmp_path):
+    pytest.importorskip("pyarrow")
+    files = Data().write_synthetic_days("2022-01-01", "2022-01-02", str(tmp_path / "csv"), verbose=False, seed=0,
+                                        orders_per_second=0.05)
+    delivery_start = pd.Timestamp("2022-01-02 10:00", tz="Europe/Berlin")
+    delivery_end = pd.Timestamp("2022-01-02 14:00", tz="Europe/Berlin")
+    valid_from = pd.Timestamp("2022-01-02 06:00", tz="Europe/Berlin")
+    report = Data().create_bins_from_csv(files, str(tmp_path / "bin"), verbose=False, bin_format=2,
+                                         carry_over=False, delivery_start=delivery_start,
+                                         delivery_end=delivery_end, valid_from=valid_from)
+
+    assert len(report) == len(files)
+    filters = [t.value // 1_000_000 for t in (delivery_start, delivery_end, valid_from)]
+    for csv_file, (_, row) in zip(sorted(files), report.iterrows()):
+        arrays = Data()._load_orderbook(csv_file)
+        kept = _filter_orders(arrays, *filters)
+        assert row["orders"] == len(arrays[0])
+        assert row["dropped"] == len(arrays[0]) - len(kept[0])
+        assert len(_read_bin_v2(row["file"])[0]) == len(kept[0])
+    assert report["dropped"].sum() > 0
+
+
+@pytest.fixture
+def book():
+    """Two products; buys at 50, 45, 40 and, after the 50 expired, 30 in the first, sells at 60 and 62."""
+    return order_arrays(
+        sides=[0, 0, 0, 0, 1, 1, 0],
+        starts=[10 * HOUR] * 6 + [11 * HOUR],
+        transactions=[0, 10, 20, 2000, 5, 6, 30],
+        validities=[1000] + [_NO_EXPIRY_MS] * 6,
+        prices=[50.0, 45.0, 40.0, 30.0, 60.0, 62.0, 10.0],
+        quantities=[1.0, 2.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+    )
+
+
+@pytest.mark.parametrize("price_band, max_depth, kept", [
+    (None, None, [0, 1, 2, 3, 4, 5, 6]),
+    # behind the touch by 0, 5, 10, 15 (the 50 has expired), 0, 2 and 0 (own product)
+    (5, None, [0, 1, 4, 5, 6]),
+    (2, None, [0, 4, 5, 6]),
+    # behind 0, 1, 3, 3, 0, 1 and 0 MWh of better priced volume on their side
+    (None, 1, [0, 1, 4, 5, 6]),
+    (None, 0.5, [0, 4, 6]),
+    (5, 0.5, [0, 4, 6]),
+])
+def test_compaction_drops_orders_behind_the_touch(book, price_band, max_depth, kept):
+    compacted, dropped = _compact_orders(book, price_band, max_depth)
+    assert compacted[0].tolist() == kept
+    assert dropped == len(book[0]) - len(kept)
+    np.testing.assert_array_equal(compacted[6], book[6][kept])
+
+
+def test_compaction_rounds_prices_away_from_the_spread():
+    arrays = order_arrays(sides=[0, 1, 0, 1, 0, 1], starts=[10 * HOUR] * 6, transactions=[0] * 6,
+                          validities=[_NO_EXPIRY_MS] * 6, prices=[50.37, 50.37, 50.25, 50.25, -0.1, -0.1],
+                          quantities=[1.0] * 6)
+    compacted, dropped = _compact_orders(arrays, price_tick=0.25)
+    assert dropped == 0
+    # buys down, sells up, prices on the tick stay
+    assert compacted[6].tolist() == [50.25, 50.5, 50.25, 50.25, -0.25, 0.0]
+
+
+def test_create_bins_reports_compacted_orders(tmp_path):
+    pytest.importorskip("pyarrow")
+    files = Data().write_synthetic_days("2022-01-01", "2022-01-02", str(tmp_path / "csv"), verbose=False, seed=0,
+                                        orders_per_second=0.05)
+    report = Data().create_bins_from_csv(files, str(tmp_path / "bin"), verbose=False, bin_format=2,
+                                         carry_over=False, price_band=5, max_depth=20)
+
+    for csv_file, (_, row) in zip(sorted(files), report.iterrows()):
+        arrays = Data()._load_orderbook(csv_file)
+        compacted, dropped = _compact_orders(arrays, 5, 20)
+        assert (row["orders"], row["dropped"]) == (len(arrays[0]), dropped)
+        assert len(_read_bin_v2(row["file"])[0]) == len(compacted[0])
+    assert report["dropped"].sum() > 0
@@ -0,0 +1,64 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Round trips of the processed order book formats: the orders must come back in exactly the row order they were
+written in, which is the order the engine processes them in. Also the paths of the files written next to binaries.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitepy import Data
+from bitepy.data import _carry_path, _order_arrays, _OrderStore
+
+DATE = pd.Timestamp("2022-01-02")
+
+
+@pytest.fixture
+def orders():
+    """A synthetic day with many orders per millisecond, across products."""
+    df = Data().generate_synthetic_orders(DATE, orders_per_second=2.0, seed=0)
+    # map the transaction times to whole seconds, so most transactions tie with orders of other products
+    transaction = df["transaction"].to_numpy(dtype=np.int64) // 1000 * 1000
+    return df.assign(transaction=pd.array(transaction, dtype="Int64"))
+
+
+def assert_same_orders(arrays, expected):
+    for column, expected_column in zip(arrays, expected):
+        np.testing.assert_array_equal(column, expected_column)
+
+
+def test_parquet_keeps_row_order(tmp_path, orders):
+    pytest.importorskip("pyarrow")
+    data = Data()
+    path = data._save_day(orders, pd.DataFrame(), DATE.date(), str(tmp_path) + "/", "parquet")
+    expected = data._processed_day(orders, pd.DataFrame(), DATE.date()).rename_axis("id").reset_index()
+    assert_same_orders(data._load_parquet(path), _order_arrays(expected))
+
+
+def test_order_store_keeps_row_order(tmp_path, orders):
+    expected = Data()._processed_day(orders, pd.DataFrame(), DATE.date()).rename_axis("id").reset_index()
+    arrays = _order_arrays(expected)
+    path = str(tmp_path / "orderbook_2022.store")
+    _OrderStore.write(path, [(np.datetime64(DATE.date(), "D"), arrays)])
+    store = _OrderStore(path)
+    assert_same_orders(store.read(DATE.date()), arrays)
+
+    # a window of products comes back in the order of the day as well
+    start_ms, end_ms = np.quantile(arrays[3], [0.25, 0.75]).astype(np.int64)
+    keep = (arrays[3] >= start_ms) & (arrays[3] <= end_ms)
+    assert_same_orders(store.read(DATE.date(), start_ms, end_ms), [column[keep] for column in arrays])
+
+
+def test_carry_path_only_replaces_the_suffix():
+    assert _carry_path("/data/bins/orderbook_2022-01-02.bin") == "/data/bins/orderbook_2022-01-02.carry.bin"
+    assert _carry_path("/data/x.bin.d/orderbook_2022-01-02.bin") == "/data/x.bin.d/orderbook_2022-01-02.carry.bin"
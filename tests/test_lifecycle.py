@@ -0,0 +1,111 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Equivalence of the vectorized order lifecycle reconstruction (Data._reconstruct_lifecycle) with the loop over
+modification chains it replaced, on the synthetic raw fixtures of benchmarks/bench_ingestion.py.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+from bitepy import Data
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+from bench_ingestion import write_epex, write_nordpool  # noqa: E402
+
+ORDERS = 3000
+
+
+def _resolve(df, messages):
+    """End the last version of every order with a message in messages at the transaction time of that message."""
+    not_added = messages[~(messages["order"].isin(df.loc[df["action"] == "A", "order"]))]
+    messages = messages[~(messages["order"].isin(not_added["order"]))]
+    indexer = df[(df["order"].isin(messages["order"])) & (df["action"] == "A")] \
+        .sort_values("transaction").groupby("order").tail(1).index
+    df["df_index_copy"] = df.index
+    merged = pd.merge(messages, df.loc[indexer], on="order")
+    df.loc[merged["df_index_copy"].to_numpy(), "validity"] = merged["transaction_x"].to_numpy()
+    return df.drop("df_index_copy", axis=1), messages
+
+
+def old_lifecycle(df, terminal_actions=("D",)):
+    """The lifecycle reconstruction of the readers before it was vectorized, one pass per change in a chain."""
+    df = df.copy()
+    change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
+    df, change_messages = _resolve(df, change_messages)
+    while change_messages.shape[0] > 0:
+        # the processed changes become the new versions, redo for the remaining change messages
+        df.loc[df.index.isin(change_messages.index), "action"] = "A"
+        change_messages = df[df["action"] == "C"].drop_duplicates(subset=["order"], keep="first")
+        df, change_messages = _resolve(df, change_messages)
+    for terminal in terminal_actions:
+        df, _ = _resolve(df, df[df["action"] == terminal])
+        df = df.loc[lambda x: ~(x["action"] == terminal)]
+    return df
+
+
+def old_reconstruct_lifecycle(self, df, terminal_actions=("D",), carry=False):
+    """Drop-in for Data._reconstruct_lifecycle with the old loop. With carry, all orders are finished in one chunk."""
+    done = old_lifecycle(df, terminal_actions)
+    return (done, df.iloc[:0]) if carry else done
+
+
+@pytest.mark.parametrize("date", ["2020-06-01", "2021-06-01"])
+def test_epex_lifecycle_matches_loop(tmp_path, monkeypatch, date):
+    write_epex(str(tmp_path), date, ORDERS, seed=1)
+    read = Data._read_id_table_2020 if date.startswith("2020") else Data._read_id_table_2021
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Data, "_reconstruct_lifecycle", old_reconstruct_lifecycle)
+        expected = read(Data(), pd.Timestamp(date), str(tmp_path))
+    result = read(Data(), pd.Timestamp(date), str(tmp_path))
+
+    assert len(result) > ORDERS
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_nordpool_lifecycle_matches_loop(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    date = "2024-01-01"
+    write_nordpool(str(tmp_path), date, ORDERS, seed=1)
+    read_hours = Data._read_nordpool_hours
+
+    def read_day_at_once(self, parquet_files, max_workers=4):
+        # the old reader resolved the messages of the whole day at once
+        yield pd.concat(list(read_hours(self, parquet_files, max_workers)))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Data, "_reconstruct_lifecycle", old_reconstruct_lifecycle)
+        patch.setattr(Data, "_read_nordpool_hours", read_day_at_once)
+        expected = Data()._read_nordpool_table(pd.Timestamp(date), str(tmp_path))
+    result = Data()._read_nordpool_table(pd.Timestamp(date), str(tmp_path))
+
+    assert len(result) > ORDERS
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_nordpool_ids_are_raw_row_positions(tmp_path):
+    # the ids of the processed orders are the positions of their messages in the day's files, before filtering
+    pytest.importorskip("pyarrow")
+    date = "2024-01-01"
+    write_nordpool(str(tmp_path), date, ORDERS, seed=1)
+    files = sorted((tmp_path / "20240101").glob("NordPool_*.parquet"))
+    raw = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+
+    result = Data()._read_nordpool_table(pd.Timestamp(date), str(tmp_path))
+    assert result.index.max() >= len(result)
+    messages = raw.loc[result.index]
+    assert messages["contractName"].str.startswith("PH").all()
+    assert (messages["price"].to_numpy() == result["price"].to_numpy()).all()
+    assert (messages["volume"].to_numpy() == result["quantity"].to_numpy()).all()
@@ -0,0 +1,89 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Simulation.get_limit_order_book_state built from the flat arrays of Simulation_cpp.getLimitOrderBookStateArrays,
+given by a stand-in for the engine.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bitepy import Simulation
+
+START = pd.Timestamp("2022-01-02", tz="Europe/Berlin")
+HOUR = 3_600_000
+T0 = START.value // 1_000_000
+COLUMNS = ["delivery_time", "side", "order_id", "initial_id", "start_time", "cancel_time", "price", "volume",
+           "is_forecast", "cumulative_volume"]
+
+
+class BookEngine:
+    """Returns the given order book state arrays."""
+
+    def __init__(self, **state):
+        self.state = state
+        self.max_action = None
+
+    def getLimitOrderBookStateArrays(self, max_action):
+        self.max_action = max_action
+        return self.state
+
+
+def book_state(**state):
+    sim = Simulation(START, START + pd.Timedelta(hours=23), START)
+    sim._sim_cpp = BookEngine(**state)
+    return sim.get_limit_order_book_state(max_action=7.5), sim._sim_cpp.max_action
+
+
+def test_book_state_frame():
+    no_expiry = np.iinfo(np.int64).max
+    # two sells and a buy of the first product, a buy without expiry of the second
+    df, max_action = book_state(
+        products=np.array([T0 + HOUR, T0 + 2 * HOUR], dtype=np.int64),
+        product=np.array([0, 0, 0, 1], dtype=np.int64),
+        side=np.array([1, 1, 0, 0], dtype=np.int8),
+        order_id=np.array([11, 12, 13, 14], dtype=np.int64),
+        initial_id=np.array([10, 12, 13, 14], dtype=np.int64),
+        start=np.array([T0 - 5000, T0 - 4000, T0 - 3000, T0 - 2000], dtype=np.int64),
+        cancel=np.array([T0 + 1000, T0 + 2000, T0 + 3000, no_expiry], dtype=np.int64),
+        price=np.array([50.5, 51.0, 49.0, 40.25]),
+        volume=np.array([1.0, 2.5, 3.0, 0.5]),
+        is_forecast=np.array([False, True, False, False]),
+        cumulative_volume=np.array([1.0, 3.5, 3.0, 0.5]),
+    )
+
+    assert max_action == 7.5
+    assert df.columns.tolist() == COLUMNS
+    assert df["delivery_time"].tolist() == [pd.Timestamp(T0 + HOUR, unit="ms", tz="UTC")] * 3 + \
+        [pd.Timestamp(T0 + 2 * HOUR, unit="ms", tz="UTC")]
+    assert isinstance(df["side"].dtype, pd.CategoricalDtype)
+    assert df["side"].cat.categories.tolist() == ["buy", "sell"]
+    assert df["side"].tolist() == ["sell", "sell", "buy", "buy"]
+    assert df["order_id"].tolist() == [11, 12, 13, 14] and df["initial_id"].tolist() == [10, 12, 13, 14]
+    assert df["start_time"].iloc[0] == pd.Timestamp(T0 - 5000, unit="ms", tz="UTC")
+    assert df["cancel_time"].iloc[2] == pd.Timestamp(T0 + 3000, unit="ms", tz="UTC")
+    assert df["cancel_time"].isna().tolist() == [False, False, False, True]
+    assert str(df["start_time"].dtype) == str(df["cancel_time"].dtype) == "datetime64[ms, UTC]"
+    assert df["is_forecast"].tolist() == [False, True, False, False]
+    assert df["cumulative_volume"].tolist() == [1.0, 3.5, 3.0, 0.5]
+
+
+def test_empty_book_state_has_all_columns():
+    empty = {name: np.empty(0, dtype=dtype) for name, dtype in [
+        ("products", np.int64), ("product", np.int64), ("side", np.int8), ("order_id", np.int64),
+        ("initial_id", np.int64), ("start", np.int64), ("cancel", np.int64), ("price", np.float64),
+        ("volume", np.float64), ("is_forecast", bool), ("cumulative_volume", np.float64)]}
+    df, _ = book_state(**empty)
+
+    assert len(df) == 0
+    assert df.columns.tolist() == COLUMNS
+    assert isinstance(df["side"].dtype, pd.CategoricalDtype)
+    assert str(df["delivery_time"].dtype) == "datetime64[ms, UTC]"
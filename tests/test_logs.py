@@ -0,0 +1,177 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+The columnar logs of Simulation.get_logs against the string records of Simulation_cpp.getLogs they replaced: the
+timestamps must be the same instants, and sentinel timestamps (orders without expiry) must be NaT. Also the log_dir
+spill, which must hold all records even when the logs are polled during the run, and the record offsets of
+get_new_logs against a stand-in for the engine's logs.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitepy import Data, Results, Simulation
+from bitepy.simulation import _LOG_TABLES, _LOG_TIMESTAMPS
+
+START = pd.Timestamp("2022-01-02", tz="Europe/Berlin")
+
+
+@pytest.fixture(scope="module")
+def data_path(tmp_path_factory):
+    data_path = str(tmp_path_factory.mktemp("data"))
+    Data().write_synthetic_days("2022-01-01", "2022-01-02", data_path, output_format="bin", verbose=False, seed=0,
+                                orders_per_second=0.2)
+    return data_path
+
+
+@pytest.fixture(scope="module")
+def sim(data_path):
+    sim = Simulation(START, START + pd.Timedelta(hours=23), START)
+    sim.run(data_path, verbose=False)
+    return sim
+
+
+def epoch_ms(series):
+    return ((series - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)).to_numpy(dtype=np.int64)
+
+
+def test_log_timestamps_match_string_logs(sim):
+    logs = sim.get_logs()
+    raw = dict(zip(_LOG_TABLES, sim._sim_cpp.getLogsColumnar([])))
+    records = dict(zip(_LOG_TABLES, sim._sim_cpp.getLogs()))
+    assert len(logs["accepted_orders"]) > 0
+
+    for name, table in logs.items():
+        strings = pd.DataFrame(records[name])
+        assert len(table) == len(strings)
+        for column in sorted(_LOG_TIMESTAMPS & set(table.columns)):
+            sentinel = np.asarray(raw[name][column]) > pd.Timestamp.max.value // 1_000_000
+            assert table[column].isna().to_numpy().tolist() == sentinel.tolist()
+            expected = pd.to_datetime(strings[column], utc=True)[~sentinel]
+            np.testing.assert_array_equal(epoch_ms(table[column][~sentinel]), epoch_ms(expected))
+
+
+def test_log_dir_keeps_records_polled_by_get_new_logs(tmp_path, data_path):
+    pytest.importorskip("pyarrow")
+    log_dir = str(tmp_path / "logs")
+    sim = Simulation(START, START + pd.Timedelta(hours=23), START, log_dir=log_dir)
+    polled = []
+    for i, (_, path, _) in enumerate(sim._plan(data_path)):
+        sim.add_bin_to_orderqueue(path)
+        sim.run_one_day(i == 1)
+        polled.append(sim.get_new_logs())
+
+    spilled = Results(log_dir).logs
+    for name, table in sim.get_logs().items():
+        # the records written and polled before the last day were dropped from the engine
+        pd.testing.assert_frame_equal(table, polled[-1][name])
+        assert sum(len(logs[name]) for logs in polled) == len(spilled[name])
+    assert len(spilled["accepted_orders"]) > 0
+
+
+class LogEngine:
+    """Stands in for the logs of the engine: every record holds its number since the start of the simulation."""
+
+    def __init__(self):
+        self.records = [[] for _ in _LOG_TABLES]
+        self.appended = [0] * len(_LOG_TABLES)
+
+    def append(self, counts):
+        for i, count in enumerate(counts):
+            self.records[i].extend(range(self.appended[i], self.appended[i] + count))
+            self.appended[i] += count
+
+    def getLogsColumnar(self, offsets):
+        offsets = offsets or [0] * len(_LOG_TABLES)
+        logs = []
+        for records, offset in zip(self.records, offsets):
+            number = np.array(records[offset:], dtype=np.int64)
+            logs.append({"number": number, "cycles": number.astype(float)})
+        return tuple(logs)
+
+    def clearLogsBefore(self, offsets):
+        for records, offset in zip(self.records, offsets):
+            del records[:offset]
+        return True
+
+    def getLogSizes(self):
+        return [len(records) for records in self.records]
+
+
+def assert_numbered(logs):
+    for table in logs.values():
+        assert table.index.tolist() == table["number"].tolist()
+
+
+def test_new_logs_offsets():
+    sim = Simulation(START, START + pd.Timedelta(hours=23), START)
+    sim._sim_cpp = engine = LogEngine()
+    engine.append([2, 1, 3, 0, 0, 1, 0])
+    first = sim.get_new_logs()
+    assert_numbered(first)
+    assert [len(table) for table in first.values()] == [2, 1, 3, 0, 1]
+
+    engine.append([1, 0, 2, 4, 0, 0, 0])
+    second = sim.get_new_logs()
+    assert_numbered(second)
+    assert second["accepted_orders"].index.tolist() == [3, 4]
+    assert second["executed_orders"].index.tolist() == [0, 1, 2, 3]
+    assert all(len(table) == 0 for table in sim.get_new_logs().values())
+    for name, table in sim.get_logs().items():
+        pd.testing.assert_frame_equal(pd.concat([first[name], second[name]]), table, check_index_type=False)
+
+
+def test_new_logs_drain_the_engine():
+    sim = Simulation(START, START + pd.Timedelta(hours=23), START)
+    sim._sim_cpp = engine = LogEngine()
+    polled = []
+    for day in range(5):
+        engine.append([24, 24, 10 + day, 5, 0, 2, 0])
+        polled.append(sim.get_new_logs(drain=True))
+        assert_numbered(polled[-1])
+        # only the records of the day were held
+        assert engine.getLogSizes() == [0] * len(_LOG_TABLES)
+    accepted = pd.concat([logs["accepted_orders"] for logs in polled])
+    assert accepted.index.tolist() == list(range(10 * 5 + 10))
+
+    # records not polled yet are kept, and numbered after the dropped ones
+    engine.append([1, 0, 3, 0, 0, 0, 0])
+    logs = sim.get_logs()
+    assert_numbered(logs)
+    assert logs["accepted_orders"].index.tolist() == [60, 61, 62]
+    assert sim._logs([0] * len(_LOG_TABLES))[2].index.tolist() == [60, 61, 62]
+
+
+def test_log_dir_bounds_the_engine_logs(tmp_path):
+    pytest.importorskip("pyarrow")
+    log_dir = str(tmp_path / "logs")
+    sim = Simulation(START, START + pd.Timedelta(hours=23), START, log_dir=log_dir)
+    held, daily, appended = [], [], [0] * len(_LOG_TABLES)
+    for day in range(7):
+        sizes = sim._sim_cpp.getLogSizes()
+        sim._sim_cpp.run(False)
+        new = [after - before for before, after in zip(sizes, sim._sim_cpp.getLogSizes())]
+        appended = [total + count for total, count in zip(appended, new)]
+        daily.append(sum(new))
+        sim._spill_logs()
+        held.append(sum(sim._sim_cpp.getLogSizes()))
+        # polled from the third day on, but not on the fifth
+        if day >= 2 and day != 4:
+            sim.get_new_logs()
+    assert daily[0] > 0
+    # the engine holds the records of the last day, and of the days get_new_logs has not returned yet
+    assert held[:5] == daily[:5]
+    assert held[5] == daily[4] + daily[5] and held[6] == daily[6]
+
+    spilled = Results(log_dir).logs
+    for name, table in spilled.items():
+        assert len(table) == appended[_LOG_TABLES.index(name)]
@@ -0,0 +1,51 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+The pipelined conversion of Data.parse_market_data with workers > 1 against the sequential one, on the synthetic raw
+fixtures of benchmarks/bench_ingestion.py. The daily files are compared as decoded frames.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+from bitepy import Data
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+from bench_ingestion import write_epex  # noqa: E402
+
+DATES = ["2021-06-01", "2021-06-02", "2021-06-03"]
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_parallel_days_match_sequential(tmp_path, output_format):
+    if output_format == "parquet":
+        pytest.importorskip("pyarrow")
+    raw_path = str(tmp_path / "raw")
+    for i, date in enumerate(DATES):
+        write_epex(raw_path, date, 1000, seed=i)
+
+    frames = {}
+    for workers in (1, 2):
+        savepath = os.path.join(str(tmp_path / f"workers_{workers}"), "")
+        Data().parse_market_data(DATES[0], DATES[-1], raw_path, savepath, "EPEX", verbose=False, workers=workers,
+                                 output_format=output_format)
+        files = sorted(f for f in os.listdir(savepath) if f.startswith("orderbook_"))
+        read = pd.read_parquet if output_format == "parquet" else pd.read_csv
+        frames[workers] = {f: read(os.path.join(savepath, f)) for f in files}
+
+    assert list(frames[2]) == list(frames[1])
+    assert len(frames[1]) == len(DATES)
+    for name, expected in frames[1].items():
+        assert len(expected) > 0
+        pd.testing.assert_frame_equal(frames[2][name], expected)
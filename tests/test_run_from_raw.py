@@ -0,0 +1,85 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+Simulation.run_from_raw against the file-based path (Data.parse_market_data, Data.create_bins_from_csv and
+Simulation.run) on the synthetic raw fixtures of benchmarks/bench_ingestion.py: both must queue the same orders on
+every day, including the carry-over of the day before the start date. The days are not simulated.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitepy import Data, Simulation
+from bitepy.data import _carry_over_mask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+from bench_ingestion import write_epex  # noqa: E402
+
+DATES = ["2021-06-01", "2021-06-02", "2021-06-03"]
+START = pd.Timestamp("2021-06-02", tz="Europe/Berlin")
+
+
+class Recorder:
+    """Wraps the engine and records the order arrays queued with addOrderQueueFromArrays."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.queued = []
+
+    def __getattr__(self, name):
+        return getattr(self.engine, name)
+
+    def addOrderQueueFromArrays(self, *arrays):
+        self.queued.append(tuple(np.array(column) for column in arrays))
+
+
+def queued_orders(run, monkeypatch):
+    """The order arrays queued on every day by run(sim), with the days not simulated."""
+    sim = Simulation(START, START + pd.Timedelta(hours=23), START)
+    sim._sim_cpp = Recorder(sim._sim_cpp)
+    with monkeypatch.context() as patch:
+        patch.setattr(Simulation, "run_one_day", lambda self, last=False: None)
+        run(sim)
+    return sim._sim_cpp.queued
+
+
+@pytest.mark.parametrize("filter_orders", [True, False])
+def test_run_from_raw_queues_the_orders_of_run(tmp_path, monkeypatch, filter_orders):
+    pytest.importorskip("pyarrow")
+    raw_path = str(tmp_path / "raw")
+    for i, date in enumerate(DATES):
+        write_epex(raw_path, date, 2000, seed=i)
+    processed_path = os.path.join(str(tmp_path / "processed"), "")
+    Data().parse_market_data(DATES[0], DATES[-1], raw_path, processed_path, "EPEX", verbose=False)
+    files = sorted(processed_path + f for f in os.listdir(processed_path) if f.endswith(".csv.zip"))
+    # compressed binaries, so that run queues the orders as arrays too
+    Data().create_bins_from_csv(files, str(tmp_path / "bin"), verbose=False, bin_format=2)
+
+    expected = queued_orders(lambda sim: sim.run(str(tmp_path / "bin"), verbose=False,
+                                                 filter_orders=filter_orders), monkeypatch)
+    result = queued_orders(lambda sim: sim.run_from_raw(raw_path, "EPEX", verbose=False,
+                                                        filter_orders=filter_orders), monkeypatch)
+
+    assert len(result) == len(expected) == 2
+    for day_result, day_expected in zip(result, expected):
+        assert len(day_expected[0]) > 0
+        for column, expected_column in zip(day_result, day_expected):
+            np.testing.assert_array_equal(column, expected_column)
+    # of the day before the start date, only the carry-over is queued
+    day0 = Data()._load_orderbook(files[0])
+    carry = _carry_over_mask(pd.Timestamp(DATES[0]).date(), day0[3])
+    assert 0 < len(expected[0][0]) <= carry.sum() < len(carry)
+    if not filter_orders:
+        np.testing.assert_array_equal(expected[0][0], day0[0][carry])
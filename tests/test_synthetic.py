@@ -0,0 +1,48 @@
+######################################################################
+# Copyright (C) 2026 ETH Zurich
+# BitePy: A Python Battery Intraday Trading Engine
+# Bits to Energy Lab - Chair of Information Management - ETH Zurich
+#
+# Author: David Schaurecker
+#
+# Licensed under MIT License, see https://opensource.org/license/mit
+######################################################################
+
+"""
+The synthetic order flow of Data.generate_synthetic_orders: reproducible from its seed, and a valid order book day.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bitepy import Data
+
+DATE = pd.Timestamp("2022-01-02")
+
+
+def test_same_seed_gives_identical_orders():
+    first = Data().generate_synthetic_orders(DATE, orders_per_second=0.5, seed=3)
+    pd.testing.assert_frame_equal(Data().generate_synthetic_orders(DATE, orders_per_second=0.5, seed=3), first)
+    other = Data().generate_synthetic_orders(DATE, orders_per_second=0.5, seed=4)
+    assert len(other) != len(first) or not other["price"].equals(first["price"])
+
+
+def test_synthetic_orders_are_a_valid_day():
+    df = Data().generate_synthetic_orders(DATE, orders_per_second=0.5, gate_closure_minutes=5, cancel_ratio=0.7,
+                                          seed=0)
+    day_ms = DATE.tz_localize("UTC").value // 1_000_000
+    transaction = df["transaction"].to_numpy(dtype=np.int64)
+    start = df["start"].to_numpy(dtype=np.int64)
+    validity = df["validity"]
+
+    assert len(df) > 10_000
+    assert df.index.is_unique and (df["initial"].to_numpy() == df.index.to_numpy()).all()
+    assert (np.diff(transaction) >= 0).all()
+    assert (transaction >= day_ms).all() and (transaction < day_ms + 86_400_000).all()
+    # traded until gate closure only
+    assert (transaction <= start - 5 * 60_000).all()
+    cancelled = validity.notna().to_numpy()
+    assert (validity[cancelled].to_numpy(dtype=np.int64) > transaction[cancelled]).all()
+    assert 0.65 < cancelled.mean() < 0.75
+    assert set(df["side"].astype(str)) == {"BUY", "SELL"}
+    assert (df["quantity"] >= 0.1).all() and (df["price"] == df["price"].round(2)).all()